@@ -228,6 +228,56 @@ class Config:
         except KeyError:
             return 15  # 15 seconds by default
 
+    @property
+    def launch_workers(self):
+        try:
+            if "SMARTSIM_LAUNCH_WORKERS" in os.environ:
+                num_workers = int(os.environ["SMARTSIM_LAUNCH_WORKERS"])
+            else:
+                num_workers = int(self.conf["smartsim"]["launch_workers"])
+        except KeyError:
+            return 8  # 8 steps launched at once by default
+        if num_workers < 1:
+            raise SSConfigError(f"launch_workers must be at least 1, not {num_workers}")
+        return num_workers
+
+    @property
+    def gen_workers(self):
+        try:
+            if "SMARTSIM_GEN_WORKERS" in os.environ:
+                num_workers = int(os.environ["SMARTSIM_GEN_WORKERS"])
+            else:
+                num_workers = int(self.conf["smartsim"]["gen_workers"])
+        except KeyError:
+            return 8  # 8 entity directories generated at once by default
+        if num_workers < 1:
+            raise SSConfigError(f"gen_workers must be at least 1, not {num_workers}")
+        return num_workers
+
+    @property
+    def wlm_submit_rate(self):
+        try:
+            if "SMARTSIM_WLM_SUBMIT_RATE" in os.environ:
+                return float(os.environ["SMARTSIM_WLM_SUBMIT_RATE"])
+            else:
+                rate = self.conf["smartsim"]["wlm_submit_rate"]
+                return float(rate)
+        except KeyError:
+            return 5.0  # 5 submissions per second by default
+
+    @property
+    def pilot_agents(self):
+        try:
+            if "SMARTSIM_PILOT_AGENTS" in os.environ:
+                num_agents = int(os.environ["SMARTSIM_PILOT_AGENTS"])
+            else:
+                num_agents = int(self.conf["smartsim"]["pilot_agents"])
+        except KeyError:
+            return 1  # 1 pilot agent outside of an allocation by default
+        if num_agents < 1:
+            raise SSConfigError(f"pilot_agents must be at least 1, not {num_agents}")
+        return num_agents
+
     @property
     def test_account(self):
         try:
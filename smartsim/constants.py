@@ -35,9 +35,37 @@ ONNX_VERSION = "1.6.0"
 # Interval for Job Manager
 LOCAL_JM_INTERVAL = 2
 
+# Bounds (in seconds) for the backoff between database readiness probes
+DB_PROBE_MIN_INTERVAL = 0.1
+DB_PROBE_MAX_INTERVAL = 2
+
+# Time (in seconds) allowed for database shards to write their addresses
+# multi-host database nodes are given longer on busy systems
+DB_HOST_TIMEOUT = 5
+DB_HOSTS_TIMEOUT = 25
+
+# Time (in seconds) allowed for database shards to form a cluster
+DB_CLUSTER_TIMEOUT = 120
+
 # Task Manager Interval
 TM_INTERVAL = 1
 
+# Max number of bytes of stdout/stderr kept for each PIPE task
+TM_OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+# Bounds (in seconds) for the per-step WLM polling intervals
+# running steps are polled at most every CONFIG.jm_interval
+WLM_POLL_MIN_INTERVAL = 2
+WLM_POLL_MAX_INTERVAL = 120
+WLM_POLL_BACKOFF = 2
+# WLM queries slower than this are treated as a congested controller
+WLM_SLOW_QUERY = 10
+
+# Time (in seconds) allowed for pilot agents to connect to the launcher
+PILOT_AGENT_TIMEOUT = 60
+# Time (in seconds) allowed for a pilot agent to start a task
+PILOT_START_TIMEOUT = 30
+
 # Statuses that are applied to jobs
 STATUS_RUNNING = "Running"
 STATUS_COMPLETED = "Completed"
@@ -24,13 +24,21 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import os
 import os.path as osp
 import pickle
 import threading
 import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 
 from ..config import CONFIG
-from ..constants import STATUS_RUNNING, TERMINAL_STATUSES
+from ..constants import (
+    DB_PROBE_MAX_INTERVAL,
+    DB_PROBE_MIN_INTERVAL,
+    STATUS_CANCELLED,
+    STATUS_FAILED,
+    TERMINAL_STATUSES,
+)
 from ..database import Orchestrator
 from ..entity import DBNode, EntityList, SmartSimEntity
 from ..error import LauncherError, SmartSimError, SSConfigError, SSUnsupportedError
@@ -39,10 +47,14 @@ from ..launcher import (
     LocalLauncher,
     LSFLauncher,
     PBSLauncher,
+    PilotLauncher,
     SlurmLauncher,
 )
+from ..launcher.slurm.slurm import get_allocation_nodes
+from ..settings import SrunSettings
 from ..utils import get_logger
 from .jobmanager import JobManager
+from .scheduler import LaunchScheduler
 
 logger = get_logger(__name__)
 
@@ -63,9 +75,15 @@ class Controller:
         :type launcher: str
         """
         self._jobs = JobManager(JM_LOCK)
+        self._jobs.on_job_completed(self._release_resources)
+        self._scheduler = LaunchScheduler()
+        self._queued_steps = {}  # entity name: job step created when queued
+        self._stopped_queued = set()  # names stopped while being launched
         self.init_launcher(launcher)
 
-    def start(self, manifest, block=True):
+    def start(
+        self, manifest, block=True, pack=False, max_concurrency=None, priority=None
+    ):
         """Start the passed SmartSim entities
 
         This function should not be called directly, but rather
@@ -73,9 +91,16 @@ class Controller:
 
         The controller will start the job-manager thread upon
         execution of all jobs.
+
+        If ``pack`` or ``max_concurrency`` are set, models and the
+        members of ensembles that are not launched as a batch are
+        queued and released as running entities complete (see
+        ``LaunchScheduler``).
         """
         self._sanity_check_launch(manifest)
-        self._launch(manifest)
+        self._launch(
+            manifest, pack=pack, max_concurrency=max_concurrency, priority=priority
+        )
 
         # start the job manager thread if not already started
         if not self._jobs.actively_monitoring:
@@ -104,18 +129,25 @@ class Controller:
         :type verbose: bool
         """
         to_monitor = self._jobs.jobs
+        next_report = time.time() + interval
         while len(to_monitor) > 0:
-            time.sleep(interval)
-
-            # acquire lock to avoid "dictionary changed during iteration" error
-            # without having to copy dictionary each time.
-            if verbose:
+            # return as soon as the last job completes instead of
+            # waiting out the full interval
+            self._jobs.wait_for_completion(max(next_report - time.time(), 0))
+            if time.time() < next_report:
+                continue
+            next_report += interval
+
+            # copy under the lock to avoid "dictionary changed during
+            # iteration" errors, but log without holding it
+            if verbose and len(to_monitor) > 0:
                 JM_LOCK.acquire()
                 try:
-                    for job in to_monitor.values():
-                        logger.info(job)
+                    jobs = list(to_monitor.values())
                 finally:
                     JM_LOCK.release()
+                for job in jobs:
+                    logger.info(job)
 
     def finished(self, entity):
         """Return a boolean indicating wether a job has finished or not
@@ -146,13 +178,24 @@ class Controller:
         This function will also update the status of the job in
         the jobmanager so that the job appears as "cancelled".
 
+        Queued entities that are already being launched are stopped
+        by the dispatcher once their launch completes.
+
         :param entity: entity to be stopped
         :type entity: SmartSimEntity
         """
         JM_LOCK.acquire()
         try:
             job = self._jobs[entity.name]
-            if job.status not in TERMINAL_STATUSES:
+            if job.pending:
+                # queued entities have no job step to stop
+                if self._scheduler.remove(entity.name):
+                    self._queued_steps.pop(entity.name, None)
+                    job.set_status(STATUS_CANCELLED, "", None)
+                    self._jobs.move_to_completed(job)
+                else:
+                    self._stopped_queued.add(entity.name)
+            elif job.status not in TERMINAL_STATUSES:
                 logger.info(
                     " ".join(
                         ("Stopping model", entity.name, "with job name", str(job.name))
@@ -177,7 +220,7 @@ class Controller:
         :param entity_list: entity list to be stopped
         :type entity_list: EntityList
         """
-        if entity_list.batch:
+        if entity_list.batch and not entity_list.array:
             self.stop_entity(entity_list)
         else:
             for entity in entity_list.entities:
@@ -210,7 +253,7 @@ class Controller:
         """
         if not isinstance(entity_list, EntityList):
             raise TypeError(f"Argument was of type {type(entity_list)} not EntityList")
-        if entity_list.batch:
+        if entity_list.batch and not entity_list.array:
             return [self.get_entity_status(entity_list)]
         statuses = []
         for entity in entity_list.entities:
@@ -221,7 +264,7 @@ class Controller:
         """Initialize the controller with a specific type of launcher.
 
         SmartSim currently supports slurm, pbs(pro), cobalt, lsf,
-        and local launching
+        local, and pilot launching
 
         Since the JobManager and the controller share a launcher
         instance, set the JobManager launcher if we create a new
@@ -253,12 +296,16 @@ class Controller:
             elif launcher == "lsf":
                 self._launcher = LSFLauncher()
                 self._jobs.set_launcher(self._launcher)
+            # Run tasks through pilot agents inside an allocation
+            elif launcher == "pilot":
+                self._launcher = PilotLauncher()
+                self._jobs.set_launcher(self._launcher)
             else:
                 raise SSUnsupportedError("Launcher type not supported: " + launcher)
         else:
             raise SSConfigError("Must provide a 'launcher' argument")
 
-    def _launch(self, manifest):
+    def _launch(self, manifest, pack=False, max_concurrency=None, priority=None):
         """Main launching function of the controller
 
         Orchestrators are always launched first so that the
@@ -266,6 +313,15 @@ class Controller:
 
         :param manifest: Manifest of deploayables to launch
         :type manifest: Manifest
+        :param pack: pack entities onto the nodes of their allocation,
+                     defaults to False
+        :type pack: bool, optional
+        :param max_concurrency: max number of entities running at once,
+                                defaults to no limit
+        :type max_concurrency: int, optional
+        :param priority: function of an entity, entities with lower
+                         values are launched first, defaults to None
+        :type priority: callable, optional
         """
         orchestrator = manifest.db
         if orchestrator:
@@ -277,23 +333,223 @@ class Controller:
 
         # create all steps prior to launch
         steps = []
+        queued = []
+        queue = pack or max_concurrency is not None
 
         for elist in manifest.ensembles:
-            if elist.batch:
+            if elist.array:
+                array_step = self._create_array_job_step(elist)
+                steps.append((array_step, elist))
+            elif elist.batch:
                 batch_step = self._create_batch_job_step(elist)
                 steps.append((batch_step, elist))
+            elif queue:
+                queued.extend(elist.entities)
             else:
                 # if ensemble is to be run as seperate job steps, aka not in a batch
                 job_steps = [(self._create_job_step(e), e) for e in elist.entities]
                 steps.extend(job_steps)
 
         # models themselves cannot be batch steps
-        job_steps = [(self._create_job_step(e), e) for e in manifest.models]
-        steps.extend(job_steps)
+        if queue:
+            queued.extend(manifest.models)
+        else:
+            job_steps = [(self._create_job_step(e), e) for e in manifest.models]
+            steps.extend(job_steps)
+
+        # check queued entities before launching anything
+        if queued:
+            queued_steps = self._prepare_queue(queued, pack, max_concurrency)
 
         # launch steps
-        for job_step in steps:
-            self._launch_step(*job_step)
+        self._launch_steps(steps)
+        if queued:
+            self._queue(queued, queued_steps, pack, max_concurrency, priority)
+
+    def _prepare_queue(self, entities, pack, max_concurrency):
+        """Check entities before they are queued
+
+        The job steps of entities that are not packed are created
+        here, so that errors in their settings are raised to the
+        caller as they are for entities launched at once. Packed
+        entities are checked against their allocation, whose nodes
+        are found when entities are first packed.
+
+        :param entities: entities to queue
+        :type entities: list[SmartSimEntity]
+        :param pack: pack entities onto the nodes of their allocation
+        :type pack: bool
+        :param max_concurrency: max number of entities running at once
+        :type max_concurrency: int
+        :raises SSUnsupportedError: if the launcher or run settings
+                                    do not support packing
+        :raises SSConfigError: if max_concurrency is below 1, or the
+                               allocation is not found, differs
+                               between entities or has no node to fit
+                               an entity
+        :return: job steps of the entities not packed, by entity name
+        :rtype: dict[str, Step]
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise SSConfigError("max_concurrency must be at least 1")
+        if pack:
+            self._check_pack(entities)
+            return {}
+        return {entity.name: self._create_job_step(entity) for entity in entities}
+
+    def _queue(self, entities, steps, pack, max_concurrency, priority):
+        """Queue entities to be launched by the scheduler
+
+        Entities are launched by a dispatcher thread as the
+        ``LaunchScheduler`` releases them, and until then have a
+        pending job with the status New.
+
+        :param entities: entities checked with ``_prepare_queue``
+        :type entities: list[SmartSimEntity]
+        :param steps: job steps returned by ``_prepare_queue``
+        :type steps: dict[str, Step]
+        :param pack: pack entities onto the nodes of their allocation
+        :type pack: bool
+        :param max_concurrency: max number of entities running at once
+        :type max_concurrency: int
+        :param priority: function of an entity, entities with lower
+                         values are launched first
+        :type priority: callable
+        """
+        JM_LOCK.acquire()
+        try:
+            self._queued_steps.update(steps)
+        finally:
+            JM_LOCK.release()
+        for entity in entities:
+            self._jobs.add_pending_job(entity)
+        if self._scheduler.add(entities, max_concurrency, priority, pack):
+            dispatcher = threading.Thread(
+                name="Dispatcher", daemon=True, target=self._dispatch
+            )
+            dispatcher.start()
+
+    def _check_pack(self, entities):
+        """Check that entities can be packed onto their allocation
+
+        :param entities: entities to pack
+        :type entities: list[SmartSimEntity]
+        :raises SSUnsupportedError: if the launcher or run settings
+                                    do not support packing
+        :raises SSConfigError: if the allocation is not found, differs
+                               between entities or has no node to fit
+                               an entity
+        """
+        if not isinstance(self._launcher, SlurmLauncher):
+            raise SSUnsupportedError("Packing entities requires the Slurm launcher")
+        allocs = set()
+        for entity in entities:
+            if not isinstance(entity.run_settings, SrunSettings):
+                raise SSUnsupportedError(
+                    f"Packing {entity.name} requires SrunSettings, "
+                    f"not {type(entity.run_settings).__name__}"
+                )
+            allocs.add(entity.run_settings.alloc or os.environ.get("SLURM_JOB_ID"))
+        if None in allocs:
+            raise SSConfigError("No allocation specified or found to pack entities")
+        if self._scheduler.alloc is not None:
+            allocs.add(self._scheduler.alloc)
+        if len(allocs) > 1:
+            raise SSConfigError("Packed entities must all run in the same allocation")
+
+        if self._scheduler.alloc is None:
+            alloc = allocs.pop()
+            nodes = get_allocation_nodes(alloc)
+            logger.debug(f"Packing entities onto {len(nodes)} nodes of {alloc}")
+            self._scheduler.set_nodes(alloc, nodes)
+        self._scheduler.check(entities)
+
+    def _dispatch(self):
+        """Launch queued entities as the scheduler releases them
+
+        Runs in a thread that exits once no entities are queued.
+        """
+        try:
+            with ThreadPoolExecutor(
+                max_workers=CONFIG.launch_workers, thread_name_prefix="Launch"
+            ) as executor:
+                while True:
+                    placements = self._scheduler.wait_for_placements()
+                    if not placements:
+                        return
+                    entities, hosts = zip(*placements)
+                    list(executor.map(self._launch_queued, entities, hosts))
+        except BaseException:
+            # let the next call to _queue start a new dispatcher
+            self._scheduler.end_dispatch()
+            raise
+
+    def _launch_queued(self, entity, host):
+        """Launch an entity released by the scheduler
+
+        The step of an entity that is not packed was created when
+        it was queued. The step of a packed entity is created from a
+        copy of its run settings, bound to the host it is placed on.
+        Steps are given dedicated CPUs and their tasks are bound to
+        cores. If the launch fails for any reason, the resources are
+        freed and the job of the entity fails. Entities stopped while
+        being launched are cancelled before their step is launched,
+        or stopped right after.
+
+        :param entity: entity to launch
+        :type entity: SmartSimEntity
+        :param host: host the entity is packed on, or None
+        :type host: str
+        """
+        try:
+            JM_LOCK.acquire()
+            try:
+                step = self._queued_steps.pop(entity.name, None)
+                if entity.name in self._stopped_queued:
+                    self._stopped_queued.discard(entity.name)
+                    job = self._jobs[entity.name]
+                    job.set_status(STATUS_CANCELLED, "", None)
+                    self._jobs.move_to_completed(job)
+                    return
+            finally:
+                JM_LOCK.release()
+            if host is not None:
+                self._prep_entity_client_env(entity)
+                run_settings = entity.run_settings._share()
+                run_settings.set_hostlist(host)
+                run_settings.set_nodes(1)
+                run_settings.run_args["exclusive"] = None
+                run_settings.run_args["cpu-bind"] = "cores"
+                step = self._launcher.create_step(
+                    entity.name, entity.path, run_settings
+                )
+            self._launch_step(step, entity)
+            JM_LOCK.acquire()
+            try:
+                if entity.name in self._stopped_queued:
+                    self._stopped_queued.discard(entity.name)
+                    self.stop_entity(entity)
+            finally:
+                JM_LOCK.release()
+        except Exception as e:
+            logger.error(e)
+            self._scheduler.release(entity.name)
+            JM_LOCK.acquire()
+            try:
+                self._stopped_queued.discard(entity.name)
+                job = self._jobs[entity.name]
+                job.set_status(STATUS_FAILED, "", None, error=str(e))
+                self._jobs.move_to_completed(job)
+            finally:
+                JM_LOCK.release()
+
+    def _release_resources(self, job):
+        """Free the resources of a queued entity once its job completes
+
+        :param job: completed job
+        :type job: Job
+        """
+        self._scheduler.release(job.ename)
 
     def _launch_orchestrator(self, orchestrator):
         """Launch an Orchestrator instance
@@ -315,8 +571,7 @@ class Controller:
         # if orchestrator was run on existing allocation, locally, or in allocation
         else:
             db_steps = [(self._create_job_step(db), db) for db in orchestrator]
-            for db_step in db_steps:
-                self._launch_step(*db_step)
+            self._launch_steps(db_steps)
 
         # wait for orchestrator to spin up
         self._orchestrator_launch_wait(orchestrator)
@@ -327,24 +582,43 @@ class Controller:
 
         # create the database cluster
         if orchestrator.num_shards > 2:
-            num_trials = 5
-            cluster_created = False
-            while not cluster_created:
-                try:
-                    orchestrator.create_cluster()
-                    cluster_created = True
-                except SmartSimError:
-                    if num_trials > 0:
-                        logger.debug(
-                            "Cluster creation failed, attempting again in five seconds..."
-                        )
-                        num_trials -= 1
-                        time.sleep(5)
-                    else:
-                        raise
+            orchestrator.create_cluster()
         self._save_orchestrator(orchestrator)
         logger.debug(f"Orchestrator launched on nodes: {orchestrator.hosts}")
 
+    def _launch_steps(self, job_steps):
+        """Launch job steps concurrently
+
+        Up to ``CONFIG.launch_workers`` steps are submitted at once.
+        The rate of submissions to the workload manager is limited
+        by the launcher. If a step fails to launch, steps that have
+        not been submitted yet are cancelled and the error of the
+        first failed step is raised.
+
+        :param job_steps: (job step, entity) tuples to launch
+        :type job_steps: list[tuple[Step, SmartSimEntity]]
+        :raises SmartSimError: if a step fails to launch
+        """
+        num_workers = min(CONFIG.launch_workers, len(job_steps))
+        if num_workers <= 1:
+            for job_step in job_steps:
+                self._launch_step(*job_step)
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="Launch"
+        ) as executor:
+            futures = [
+                executor.submit(self._launch_step, *job_step) for job_step in job_steps
+            ]
+            _, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+
+        for future in futures:
+            if not future.cancelled() and future.exception():
+                raise future.exception()
+
     def _launch_step(self, job_step, entity):
         """Use the launcher to launch a job stop
 
@@ -364,12 +638,43 @@ class Controller:
             logger.error(msg)
             raise SmartSimError(f"Job step {entity.name} failed to launch") from e
 
+        if isinstance(entity, EntityList) and entity.array:
+            self._add_array_jobs(job_step, job_id, entity)
+        else:
+            self._add_job(job_step.name, job_id, entity)
+
+    def _add_job(self, step_name, job_id, entity):
+        """Track a launched job step in the job manager
+
+        :param step_name: name of the launched step
+        :type step_name: str
+        :param job_id: id of the launched step
+        :type job_id: str
+        :param entity: entity instance
+        :type entity: SmartSimEntity
+        """
         if self._jobs.query_restart(entity.name):
             logger.debug(f"Restarting {entity.name}")
-            self._jobs.restart_job(job_step.name, job_id, entity.name)
+            self._jobs.restart_job(step_name, job_id, entity.name)
         else:
             logger.debug(f"Launching {entity.name}")
-            self._jobs.add_job(job_step.name, job_id, entity)
+            self._jobs.add_job(step_name, job_id, entity)
+
+    def _add_array_jobs(self, array_step, job_id, entity_list):
+        """Track each member of a launched job array as its own job
+
+        The status of every member is then collected per array task.
+
+        :param array_step: launched job array step
+        :type array_step: Step
+        :param job_id: id of the job array
+        :type job_id: str
+        :param entity_list: entity list launched as the job array
+        :type entity_list: EntityList
+        """
+        members = self._launcher.add_array_members(array_step, job_id)
+        for (step_name, step_id), entity in zip(members, entity_list.entities):
+            self._add_job(step_name, step_id, entity)
 
     def _create_batch_job_step(self, entity_list):
         """Use launcher to create batch job step
@@ -389,6 +694,26 @@ class Controller:
             batch_step.add_to_batch(step)
         return batch_step
 
+    def _create_array_job_step(self, entity_list):
+        """Use launcher to create a job array step
+
+        Each entity is launched as one task of the array.
+
+        :param entity_list: EntityList to launch as a job array
+        :type entity_list: EntityList
+        :return: job array step instance
+        :rtype: Step
+        """
+        array_step = self._launcher.create_array_step(
+            entity_list.name, entity_list.path, entity_list.batch_settings
+        )
+        for entity in entity_list.entities:
+            # tells step creation not to look for an allocation
+            entity.run_settings.in_batch = True
+            step = self._create_job_step(entity)
+            array_step.add_to_batch(step)
+        return array_step
+
     def _create_job_step(self, entity):
         """Create job steps for all entities with the launcher
 
@@ -481,6 +806,11 @@ class Controller:
         queue before proceeding so new launched entities can
         be launched with SSDB address
 
+        Each database node is probed in parallel as soon as the
+        address of its shards is known and is ready once all of
+        its shards answer PING. Probes back off from
+        ``DB_PROBE_MIN_INTERVAL`` to ``DB_PROBE_MAX_INTERVAL`` seconds.
+
         :param orchestrator: orchestrator instance
         :type orchestrator: Orchestrator
         :raises SmartSimError: if launch fails or manually stopped by user
@@ -490,32 +820,40 @@ class Controller:
             logger.info("While queued, SmartSim will wait for Orchestrator to run")
             logger.info("CTRL+C interrupt to abort and cancel launch")
 
-        ready = False
-        while not ready:
-            try:
-                time.sleep(CONFIG.jm_interval)
-                # manually trigger job update if JM not running
-                if not self._jobs.actively_monitoring:
-                    self._jobs.check_jobs()
-
-                # _jobs.get_status aquires JM lock for main thread, no need for locking
-                statuses = self.get_entity_list_status(orchestrator)
-                if all([stat == STATUS_RUNNING for stat in statuses]):
-                    ready = True
-                    # TODO remove in favor of by node status check
-                    time.sleep(CONFIG.jm_interval)
-                elif any([stat in TERMINAL_STATUSES for stat in statuses]):
+        not_ready = list(orchestrator.entities)
+        interval = DB_PROBE_MIN_INTERVAL
+        with ThreadPoolExecutor(
+            max_workers=min(len(not_ready), CONFIG.launch_workers),
+            thread_name_prefix="DBProbe",
+        ) as executor:
+            while not_ready:
+                try:
+                    # manually trigger job update if JM not running
+                    if not self._jobs.actively_monitoring:
+                        self._jobs.check_jobs()
+
+                    statuses = self.get_entity_list_status(orchestrator)
+                    if any([stat in TERMINAL_STATUSES for stat in statuses]):
+                        self.stop_entity_list(orchestrator)
+                        msg = "Orchestrator failed during startup"
+                        msg += f" See {orchestrator.path} for details"
+                        raise SmartSimError(msg)
+
+                    ready = executor.map(lambda dbnode: dbnode.is_ready(), not_ready)
+                    not_ready = [
+                        dbnode
+                        for dbnode, is_ready in zip(not_ready, list(ready))
+                        if not is_ready
+                    ]
+                    if not_ready:
+                        logger.debug("Waiting for orchestrator instances to spin up...")
+                        time.sleep(interval)
+                        interval = min(interval * 2, DB_PROBE_MAX_INTERVAL)
+                except KeyboardInterrupt as e:
+                    logger.info("Orchestrator launch cancelled - requesting to stop")
                     self.stop_entity_list(orchestrator)
-                    msg = "Orchestrator failed during startup"
-                    msg += f" See {orchestrator.path} for details"
-                    raise SmartSimError(msg)
-                else:
-                    logger.debug("Waiting for orchestrator instances to spin up...")
-            except KeyboardInterrupt as e:
-                logger.info("Orchestrator launch cancelled - requesting to stop")
-                self.stop_entity_list(orchestrator)
-                raise SmartSimError("Orchestrator launch manually stopped") from e
-                # TODO stop all running jobs here?
+                    raise SmartSimError("Orchestrator launch manually stopped") from e
+                    # TODO stop all running jobs here?
 
     def reload_saved_db(self, checkpoint_file):
         JM_LOCK.acquire()
@@ -559,7 +897,7 @@ class Controller:
             job_steps = zip(db_config["db_jobs"].values(), db_config["steps"])
             try:
                 for db_job, step in job_steps:
-                    self._jobs.db_jobs[db_job.ename] = db_job
+                    self._jobs.add_db_job(db_job)
                     self._launcher.step_mapping[db_job.name] = step
                     if step.task_id:
                         self._launcher.task_manager.add_existing(int(step.task_id))
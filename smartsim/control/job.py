@@ -25,9 +25,15 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import time
+from collections import namedtuple
 
 from ..constants import STATUS_NEW
 
+# change in the status of the job of an entity
+StatusUpdate = namedtuple(
+    "StatusUpdate", ["entity", "old_status", "status", "returncode"]
+)
+
 
 class Job:
     """Keep track of various information for the controller.
@@ -63,6 +69,23 @@ class Job:
         """Return the name of the entity this job was created from"""
         return self.entity.name
 
+    @property
+    def pending(self):
+        """Return True if the entity is queued and not launched yet"""
+        return self.name is None
+
+    def set_step(self, job_name, job_id):
+        """Set the job step of a pending job once it is launched
+
+        :param job_name: name of the job step
+        :type job_name: str
+        :param job_id: id of the job step
+        :type job_id: str
+        """
+        self.name = job_name
+        self.jid = job_id
+        self.start_time = time.time()
+
     def set_status(self, new_status, raw_status, returncode, error=None, output=None):
         """Set the status  of a job.
 
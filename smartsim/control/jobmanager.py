@@ -25,18 +25,18 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import itertools
-import time
-from threading import Thread
+from fnmatch import fnmatchcase
+from threading import Condition, Event, Thread
 
 from ..config import CONFIG
 from ..constants import LOCAL_JM_INTERVAL, TERMINAL_STATUSES
 from ..database import Orchestrator
-from ..database.orchestrator import get_ip_from_host
-from ..entity import DBNode
+from ..database.orchestrator import resolve_hosts
+from ..entity import DBNode, EntityList, SmartSimEntity
 from ..error import SmartSimError
 from ..launcher import LocalLauncher
 from ..utils import get_logger
-from .job import Job
+from .job import Job, StatusUpdate
 
 logger = get_logger(__name__)
 
@@ -47,7 +47,9 @@ class JobManager:
     holds jobs according to entity type.
 
     The JobManager is threaded and runs during the course of an experiment
-    to update the statuses of Jobs.
+    to update the statuses of Jobs. Status checks are triggered either
+    by the exit of a task held by the launcher's TaskManager, or, as a
+    fallback for jobs managed by a workload manager, on a fixed interval.
 
     The JobManager and Controller share a single instance of a launcher
     object that allows both the Controller and launcher access to the
@@ -63,6 +65,7 @@ class JobManager:
         # active jobs
         self.jobs = {}
         self.db_jobs = {}
+        self._db_addresses = None  # resolved "ip:port" of database shards
 
         # completed jobs
         self.completed = {}
@@ -70,9 +73,15 @@ class JobManager:
         self.actively_monitoring = False  # on/off flag
         self._launcher = launcher  # reference to launcher
         self._lock = lock  # thread lock
+        self._wakeup = Event()  # set to trigger an immediate status check
+        self._job_update = Condition(lock)  # notified when jobs complete
+        self._completed_callbacks = []
+        self._status_listeners = []
+        self._reported_status = {}  # entity name: last status reported
 
     def start(self):
         """Start a thread for the job manager"""
+        self._wakeup.clear()
         self.monitor = Thread(name="JobManager", daemon=True, target=self.run)
         self.monitor.start()
 
@@ -82,9 +91,11 @@ class JobManager:
         by the user will be responsible for returning statuses
         that progress the state of the job.
 
-        The interval of the checks is controlled by
-        smartsim.constats.TM_INTERVAL and should be set to values
-        above 20 for congested, multi-user systems
+        Checks are run as soon as a task launched through the
+        launcher exits (see ``JobManager.notify``). Otherwise, the
+        interval of the checks is controlled by ``CONFIG.jm_interval``
+        and should be set to values above 20 for congested,
+        multi-user systems
 
         The job manager thread will exit when no jobs are left
         or when the main thread dies
@@ -130,8 +141,168 @@ class JobManager:
             # remove from actively monitored jobs
             if job.ename in self.db_jobs.keys():
                 del self.db_jobs[job.ename]
+                self._db_addresses = None
             elif job.ename in self.jobs.keys():
                 del self.jobs[job.ename]
+            # the final status is recorded in the job
+            self._launcher.forget_step(job.name)
+            self._job_update.notify_all()
+            changed = self._status_changed(job)
+        finally:
+            self._lock.release()
+        for callback in self._completed_callbacks:
+            callback(job)
+        self._report_status(changed)
+
+    def add_status_listener(self, callback):
+        """Register a function to be called when the status of a job changes
+
+        Listeners are called with the job and its previous status,
+        None for new jobs. Jobs are reported New when added or
+        restarted, with every other non-terminal status as it is
+        found by the monitor thread, and with their final status
+        once they are moved to the completed jobs.
+
+        Listeners are called from the thread that changed the
+        status, outside of the lock of the job manager unless that
+        thread holds it already, e.g. when stopping an entity.
+
+        :param callback: function taking a Job and a status
+        :type callback: callable
+        """
+        self._lock.acquire()
+        try:
+            self._status_listeners.append(callback)
+        finally:
+            self._lock.release()
+
+    def remove_status_listener(self, callback):
+        """Stop calling a function registered with ``add_status_listener``
+
+        :param callback: function to remove
+        :type callback: callable
+        """
+        self._lock.acquire()
+        try:
+            if callback in self._status_listeners:
+                self._status_listeners.remove(callback)
+        finally:
+            self._lock.release()
+
+    def on_status_change(self, target, callback, statuses=None):
+        """Subscribe to the changes of status of the jobs of entities
+
+        The target is either an entity, whose job, or the jobs of
+        its members for an ``EntityList``, are followed, or the name
+        of an entity, which may be a shell-style pattern matched
+        against the names of all jobs, e.g. ``"sim_*"``.
+
+        Callbacks are called with a ``StatusUpdate`` of the entity of
+        the job, its previous and new status, and its returncode.
+        Changes are reported as described in ``add_status_listener``,
+        so the final status of a job is reported from the monitor
+        thread, or from the thread stopping its entity. Callbacks
+        should return quickly. To launch downstream work from a
+        callback, start it with ``block=False``.
+
+        :param target: entity, entity name, or pattern of names
+        :type target: SmartSimEntity | EntityList | str
+        :param callback: function taking a StatusUpdate
+        :type callback: callable
+        :param statuses: only report changes to these statuses,
+                         defaults to all statuses
+        :type statuses: list[str], optional
+        :raises TypeError: if target is not an entity or a str
+        :return: subscription to pass to ``remove_status_listener``
+        :rtype: callable
+        """
+        match = _get_name_matcher(target)
+        if statuses is not None:
+            statuses = set(statuses)
+
+        def listener(job, old_status):
+            if statuses is not None and job.status not in statuses:
+                return
+            if match(job.ename):
+                callback(
+                    StatusUpdate(job.entity, old_status, job.status, job.returncode)
+                )
+
+        self.add_status_listener(listener)
+        return listener
+
+    def _status_changed(self, job):
+        """Record the status of a job if it changed since last reported
+
+        Should be called with the lock held.
+
+        :param job: job to check
+        :type job: Job
+        :return: (job, previous status) if the status changed
+        :rtype: list[tuple[Job, str]]
+        """
+        old_status = self._reported_status.get(job.ename, None)
+        if old_status == job.status:
+            return []
+        self._reported_status[job.ename] = job.status
+        return [(job, old_status)]
+
+    def _report_status(self, changes):
+        """Call the status listeners for each change of status
+
+        :param changes: (job, previous status) tuples
+        :type changes: list[tuple[Job, str]]
+        """
+        if not changes:
+            return
+        self._lock.acquire()
+        try:
+            listeners = list(self._status_listeners)
+        finally:
+            self._lock.release()
+        for job, old_status in changes:
+            for listener in listeners:
+                try:
+                    listener(job, old_status)
+                except Exception as e:
+                    logger.warning(f"Status listener failed for {job.ename}: {e}")
+
+    def on_job_completed(self, callback):
+        """Register a function to be called when a job completes
+
+        Callbacks are called with the completed job, from the thread
+        that moved it to the completed jobs, and possibly while that
+        thread holds the lock of the job manager. They should return
+        quickly and not wait on other threads.
+
+        :param callback: function taking a Job
+        :type callback: callable
+        """
+        self._completed_callbacks.append(callback)
+
+    def notify(self, *args):
+        """Wake the job manager thread to check job statuses now
+
+        Registered with the TaskManager of the launcher so that
+        the exit of a task is reported without waiting for the
+        next polling interval.
+        """
+        self._wakeup.set()
+
+    def wait_for_completion(self, timeout=None):
+        """Block until no jobs are left to monitor or the timeout expires
+
+        The jobs are checked under the lock before waiting, so jobs
+        completing right before the call are not missed.
+
+        :param timeout: max number of seconds to wait, defaults to None
+        :type timeout: float, optional
+        :return: True if no jobs are left
+        :rtype: bool
+        """
+        self._lock.acquire()
+        try:
+            return self._job_update.wait_for(lambda: not self.jobs, timeout)
         finally:
             self._lock.release()
 
@@ -177,10 +348,43 @@ class JobManager:
         """
         # all operations here should be atomic
         job = Job(job_name, job_id, entity)
-        if isinstance(entity, (DBNode, Orchestrator)):
-            self.db_jobs[entity.name] = job
-        else:
+        self._lock.acquire()
+        try:
+            pending = self.jobs.get(entity.name, None)
+            if pending is not None and pending.pending:
+                pending.set_step(job_name, job_id)
+                job = pending
+            elif isinstance(entity, (DBNode, Orchestrator)):
+                self.add_db_job(job)
+            else:
+                self.jobs[entity.name] = job
+            changed = self._status_changed(job)
+        finally:
+            self._lock.release()
+        self._report_status(changed)
+
+    def add_pending_job(self, entity):
+        """Add a job for an entity that is queued for launch
+
+        The job has no job step until the entity is launched and
+        added with ``add_job``. Until then, the status of the job
+        is New. Entities that were launched before are restarted.
+
+        :param entity: entity queued for launch
+        :type entity: SmartSimEntity
+        """
+        self._lock.acquire()
+        try:
+            if entity.name in self.completed:
+                job = self.completed.pop(entity.name)
+                job.reset(None, None)
+            else:
+                job = Job(None, None, entity)
             self.jobs[entity.name] = job
+            changed = self._status_changed(job)
+        finally:
+            self._lock.release()
+        self._report_status(changed)
 
     def is_finished(self, entity):
         """Detect if a job has completed
@@ -190,15 +394,13 @@ class JobManager:
         :return: True if finished
         :rtype: bool
         """
-        self._lock.acquire()
-        try:
-            job = self[entity.name]  # locked operation
-            if entity.name in self.completed:
-                if job.status in TERMINAL_STATUSES:
-                    return True
-            return False
-        finally:
-            self._lock.release()
+        job = self._find_job(entity.name)
+        if job is None:
+            raise KeyError(entity.name)
+        if entity.name in self.completed:
+            if job.status in TERMINAL_STATUSES:
+                return True
+        return False
 
     def check_jobs(self):
         """Update all jobs in jobmanager
@@ -206,16 +408,31 @@ class JobManager:
         Update all jobs returncode, status, error and output
         through one call to the launcher.
 
+        The launcher is queried without holding the lock so that
+        status queries from the main thread are not blocked behind
+        slow WLM commands. The updates are then applied to all jobs
+        at once.
         """
         self._lock.acquire()
         try:
-            jobs = self().values()
-            job_name_map = dict([(job.name, job.ename) for job in jobs])
+            job_name_map = dict(
+                [(job.name, job.ename) for job in self().values() if not job.pending]
+            )
+        finally:
+            self._lock.release()
+
+        # returns (job step name, StepInfo) tuples
+        statuses = self._launcher.get_step_update(job_name_map.keys())
 
-            # returns (job step name, StepInfo) tuples
-            statuses = self._launcher.get_step_update(job_name_map.keys())
+        changed = []
+        self._lock.acquire()
+        try:
             for job_name, status in statuses:
-                job = self[job_name_map[job_name]]
+                ename = job_name_map[job_name]
+                job = self.jobs.get(ename, None) or self.db_jobs.get(ename, None)
+                # job was stopped or restarted during the query
+                if not job or job.name != job_name:
+                    continue
                 # uses abstract step interface
                 job.set_status(
                     status.status,
@@ -224,8 +441,12 @@ class JobManager:
                     error=status.error,
                     output=status.output,
                 )
+                # final statuses are reported by move_to_completed
+                if job.status not in TERMINAL_STATUSES:
+                    changed.extend(self._status_changed(job))
         finally:
             self._lock.release()
+        self._report_status(changed)
 
     def get_status(self, entity):
         """Return the status of a job.
@@ -234,19 +455,41 @@ class JobManager:
         :type entity: SmartSimEntity | EntityList
         :returns: tuple of status
         """
-        self._lock.acquire()
-        try:
-            if entity.name in self.completed:
-                return self.completed[entity.name].status
-
-            job = self[entity.name]  # locked
-        except KeyError:
+        job = self._find_job(entity.name)
+        if job is None:
             raise SmartSimError(
                 f"Entity by the name of {entity.name} has not been launched by this Controller"
-            ) from None
+            )
+        return job.status
+
+    def _find_job(self, entity_name):
+        """Find the job of an entity, completed jobs first
+
+        Lookups don't take the lock as single dict reads are atomic.
+        Only if a job is not found, which may happen while it moves
+        between active and completed jobs, the lookup is retried
+        under the lock.
+
+        :param entity_name: name of the entity of the job
+        :type entity_name: str
+        :return: the job or None if not found
+        :rtype: Job
+        """
+        job_dicts = (self.completed, self.db_jobs, self.jobs)
+        for jobs in job_dicts:
+            job = jobs.get(entity_name, None)
+            if job:
+                return job
+
+        self._lock.acquire()
+        try:
+            for jobs in job_dicts:
+                job = jobs.get(entity_name, None)
+                if job:
+                    return job
+            return None
         finally:
             self._lock.release()
-        return job.status
 
     def set_launcher(self, launcher):
         """Set the launcher of the job manager to a specific launcher instance
@@ -255,6 +498,7 @@ class JobManager:
         :type launcher: Launcher instance
         """
         self._launcher = launcher
+        self._launcher.task_manager.on_task_exit(self.notify)
 
     def query_restart(self, entity_name):
         """See if the job just started should be restarted or not.
@@ -268,6 +512,23 @@ class JobManager:
             return True
         return False
 
+    def add_db_job(self, job):
+        """Register the job of a database shard
+
+        The cached database addresses are cleared so that entities
+        launched afterwards connect to the shards of this job, e.g.
+        when reconnecting to a running orchestrator.
+
+        :param job: job of a DBNode or Orchestrator
+        :type job: Job
+        """
+        self._lock.acquire()
+        try:
+            self.db_jobs[job.ename] = job
+            self._db_addresses = None
+        finally:
+            self._lock.release()
+
     def restart_job(self, job_name, job_id, entity_name):
         """Function to reset a job to record history and be
         ready to launch again.
@@ -285,23 +546,46 @@ class JobManager:
             del self.completed[entity_name]
             job.reset(job_name, job_id)
             if isinstance(job.entity, (DBNode, Orchestrator)):
-                self.db_jobs[entity_name] = job
+                self.add_db_job(job)
             else:
                 self.jobs[entity_name] = job
+            changed = self._status_changed(job)
         finally:
             self._lock.release()
+        self._report_status(changed)
 
     def get_db_host_addresses(self):
         """Retrieve the list of hosts for the database
 
+        Addresses are resolved once per database launch and
+        cached until the database jobs change.
+
         :return: list of host ip addresses
         :rtype: list[str]
         """
+        self._lock.acquire()
+        try:
+            if self._db_addresses is not None:
+                return list(self._db_addresses)
+            addresses = self._resolve_db_addresses()
+            if self.db_jobs:
+                self._db_addresses = addresses
+            return list(addresses)
+        finally:
+            self._lock.release()
+
+    def _resolve_db_addresses(self):
+        """Resolve the "ip:port" address of every database shard
+
+        :return: list of host ip addresses
+        :rtype: list[str]
+        """
+        db_jobs = list(self.db_jobs.values())
+        ips = resolve_hosts([host for db_job in db_jobs for host in db_job.hosts])
         addresses = []
-        for db_job in self.db_jobs.values():
-            for combine in itertools.product(db_job.hosts, db_job.entity.ports):
-                ip_addr = get_ip_from_host(combine[0])
-                addresses.append(":".join((ip_addr, str(combine[1]))))
+        for db_job in db_jobs:
+            for host, port in itertools.product(db_job.hosts, db_job.entity.ports):
+                addresses.append(":".join((ips[host], str(port))))
         return addresses
 
     def set_db_hosts(self, orchestrator):
@@ -321,18 +605,45 @@ class JobManager:
                         self.db_jobs[dbnode.name].hosts = [dbnode.host]
                     else:
                         self.db_jobs[dbnode.name].hosts = dbnode.hosts
+            self._db_addresses = self._resolve_db_addresses()
         finally:
             self._lock.release()
 
     def _thread_sleep(self):
         """Sleep the job manager for a specific constant
-        set for the launcher type.
+        set for the launcher type, or until woken by ``notify``.
+
+        WLM launchers may shorten the sleep when managed steps
+        are due for a status query sooner (see ``PollScheduler``).
         """
         if isinstance(self._launcher, (LocalLauncher)):
-            time.sleep(LOCAL_JM_INTERVAL)
+            self._wakeup.wait(LOCAL_JM_INTERVAL)
         else:
-            time.sleep(CONFIG.jm_interval)
+            scheduler = self._launcher.poll_scheduler
+            self._wakeup.wait(scheduler.next_poll_delay(CONFIG.jm_interval))
+        self._wakeup.clear()
 
     def __len__(self):
         # number of active jobs
         return len(self.db_jobs) + len(self.jobs)
+
+
+def _get_name_matcher(target):
+    """Create a function matching the names of the jobs of a target
+
+    :param target: entity, entity name, or pattern of names
+    :type target: SmartSimEntity | EntityList | str
+    :raises TypeError: if target is not an entity or a str
+    :return: function taking a job name and returning a bool
+    :rtype: callable
+    """
+    if isinstance(target, str):
+        return lambda name: fnmatchcase(name, target)
+    if isinstance(target, EntityList):
+        # batch entity lists are tracked as one job
+        names = set(entity.name for entity in target.entities)
+        names.add(target.name)
+        return lambda name: name in names
+    if isinstance(target, SmartSimEntity):
+        return lambda name: name == target.name
+    raise TypeError(f"Argument was of type {type(target)} not an entity or a str")
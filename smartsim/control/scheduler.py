@@ -0,0 +1,317 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import deque
+from threading import Condition, RLock
+
+from ..error import SSConfigError, SSUnsupportedError
+from ..launcher.slurm.slurmParser import parse_gres_gpus
+
+
+class LaunchScheduler:
+    """Queue entities and release them for launch as resources free up
+
+    Entities are added in groups, one for each call to
+    ``Experiment.start``. A group can limit how many of its
+    entities run at once and order its entities by priority.
+    Entities are released when the limit of their group allows,
+    and as running entities complete (see ``release``).
+
+    The entities of packed groups are also placed on the nodes of
+    a Slurm allocation. The scheduler keeps track of the free CPUs
+    and GPUs of every node, and places each entity on the first
+    node with enough free resources. Entities that do not fit yet
+    are skipped so that smaller entities backfill the nodes.
+
+    Packed entities are limited to one node and their resources are
+    read from their ``SrunSettings``: ``ntasks`` times ``cpus-per-task``
+    CPUs and the GPUs of ``gpus`` or ``gres``.
+    """
+
+    def __init__(self):
+        """Initialize a launch scheduler without nodes to pack onto"""
+        self.alloc = None
+        self._nodes = {}
+        self._free = {}
+        self._groups = []  # groups with queued entities
+        self._running = {}  # entity name: (group, host, cpus, gpus)
+        self._dispatching = False
+        self._lock = RLock()
+        self._update = Condition(self._lock)
+
+    def set_nodes(self, alloc, nodes):
+        """Set the allocation that entities are packed onto
+
+        :param alloc: id of the allocation
+        :type alloc: str
+        :param nodes: number of CPUs and GPUs keyed by hostname
+        :type nodes: dict[str, tuple[int, int]]
+        """
+        self._lock.acquire()
+        try:
+            self.alloc = alloc
+            self._nodes = dict(nodes)
+            self._free = {host: list(resources) for host, resources in nodes.items()}
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def get_request(run_settings):
+        """Get the CPUs and GPUs requested by run settings
+
+        :param run_settings: run settings of an entity
+        :type run_settings: SrunSettings
+        :raises SSUnsupportedError: if the entity is an MPMD launch
+        :raises SSConfigError: if the entity asks for more than one node
+        :return: number of CPUs and GPUs
+        :rtype: tuple[int, int]
+        """
+        if run_settings.mpmd:
+            raise SSUnsupportedError("MPMD entities can not be packed")
+        run_args = run_settings.run_args
+
+        def get_arg(*names):
+            for name in names:
+                if run_args.get(name, None):
+                    return run_args[name]
+            return None
+
+        if int(get_arg("nodes", "N") or 1) != 1:
+            raise SSConfigError("Only entities running on one node can be packed")
+        tasks = int(get_arg("ntasks", "n") or 1)
+        cpus_per_task = int(get_arg("cpus-per-task", "c") or 1)
+
+        gpus = get_arg("gpus", "G")
+        if gpus:
+            gpus = int(str(gpus).split(":")[-1])
+        else:
+            gpus = parse_gres_gpus(str(get_arg("gres") or ""))
+        return tasks * cpus_per_task, gpus
+
+    def check(self, entities):
+        """Check that entities can be packed onto a node
+
+        :param entities: entities with SrunSettings
+        :type entities: list[SmartSimEntity]
+        :raises SSConfigError: if an entity can never fit on a node
+        """
+        for entity in entities:
+            cpus, gpus = self.get_request(entity.run_settings)
+            if not any(c >= cpus and g >= gpus for c, g in self._nodes.values()):
+                msg = f"{entity.name} requests {cpus} CPUs and {gpus} GPUs, "
+                msg += f"more than any node of allocation {self.alloc}"
+                raise SSConfigError(msg)
+
+    def add(self, entities, max_concurrency=None, priority=None, pack=False):
+        """Queue a group of entities to be released for launch
+
+        Packed entities should be checked with ``check`` first.
+
+        :param entities: entities to queue
+        :type entities: list[SmartSimEntity]
+        :param max_concurrency: max number of entities of the group
+                                running at once, defaults to no limit
+        :type max_concurrency: int, optional
+        :param priority: function of an entity, entities with lower
+                         values are released first, defaults to the
+                         order of the entities
+        :type priority: callable, optional
+        :param pack: place the entities on the nodes set with
+                     ``set_nodes``, defaults to False
+        :type pack: bool, optional
+        :return: True if a thread should start dispatching placements
+        :rtype: bool
+        """
+        if priority is not None:
+            entities = sorted(entities, key=priority)
+        group = _LaunchGroup(max_concurrency, pack)
+        for entity in entities:
+            request = self.get_request(entity.run_settings) if pack else (0, 0)
+            group.queue.append((entity, *request))
+
+        self._lock.acquire()
+        try:
+            self._groups.append(group)
+            self._update.notify_all()
+            start_dispatch = not self._dispatching
+            self._dispatching = True
+            return start_dispatch
+        finally:
+            self._lock.release()
+
+    def end_dispatch(self):
+        """Record that the thread dispatching placements has exited
+
+        Called if the dispatcher exits before the queue is empty, so
+        that the next call to ``add`` starts a new dispatcher.
+        """
+        self._lock.acquire()
+        try:
+            self._dispatching = False
+        finally:
+            self._lock.release()
+
+    def remove(self, entity_name):
+        """Remove an entity that was not released yet from the queue
+
+        :param entity_name: name of the entity
+        :type entity_name: str
+        :return: True if the entity was queued
+        :rtype: bool
+        """
+        self._lock.acquire()
+        try:
+            for group in self._groups:
+                for queued in group.queue:
+                    if queued[0].name == entity_name:
+                        group.queue.remove(queued)
+                        self._update.notify_all()
+                        return True
+            return False
+        finally:
+            self._lock.release()
+
+    def release(self, entity_name):
+        """Free the resources of a running entity
+
+        :param entity_name: name of the entity
+        :type entity_name: str
+        :return: True if resources were freed
+        :rtype: bool
+        """
+        self._lock.acquire()
+        try:
+            running = self._running.pop(entity_name, None)
+            if running is None:
+                return False
+            group, host, cpus, gpus = running
+            group.running -= 1
+            if host is not None:
+                self._free[host][0] += cpus
+                self._free[host][1] += gpus
+            self._update.notify_all()
+            return True
+        finally:
+            self._lock.release()
+
+    def place(self):
+        """Release the queued entities that the free resources allow
+
+        :return: entities and the host each is placed on, or None
+                 for entities of groups that are not packed
+        :rtype: list[tuple[SmartSimEntity, str]]
+        """
+        self._lock.acquire()
+        try:
+            placements = []
+            for group in self._groups:
+                if group.pack:
+                    placements.extend(self._pack(group))
+                else:
+                    while group.queue and group.has_capacity:
+                        entity, _, _ = group.queue.popleft()
+                        self._start(group, entity, None, 0, 0)
+                        placements.append((entity, None))
+            self._groups = [group for group in self._groups if group.queue]
+            return placements
+        finally:
+            self._lock.release()
+
+    def wait_for_placements(self):
+        """Wait until queued entities can be released and place them
+
+        Called by the thread dispatching placements, which should
+        exit once the queue is empty.
+
+        :return: placed entities and their host, or an empty list
+                 if no entities are left in the queue
+        :rtype: list[tuple[SmartSimEntity, str]]
+        """
+        self._lock.acquire()
+        try:
+            while self.queued:
+                placements = self.place()
+                if placements:
+                    return placements
+                self._update.wait()
+            self._dispatching = False
+            return []
+        finally:
+            self._lock.release()
+
+    def _pack(self, group):
+        """Place the entities of a group that fit on the free resources"""
+        placements = []
+        not_placed = deque()
+        max_cpus = self._max_free_cpus()
+        while group.queue and group.has_capacity and max_cpus > 0:
+            entity, cpus, gpus = queued = group.queue.popleft()
+            # skip the search of a host for entities too large
+            host = self._find_host(cpus, gpus) if cpus <= max_cpus else None
+            if host is None:
+                not_placed.append(queued)
+                continue
+            self._start(group, entity, host, cpus, gpus)
+            placements.append((entity, host))
+            max_cpus = self._max_free_cpus()
+        # entities that were skipped keep their place in the queue
+        group.queue.extendleft(reversed(not_placed))
+        return placements
+
+    def _start(self, group, entity, host, cpus, gpus):
+        group.running += 1
+        if host is not None:
+            self._free[host][0] -= cpus
+            self._free[host][1] -= gpus
+        self._running[entity.name] = (group, host, cpus, gpus)
+
+    def _max_free_cpus(self):
+        return max(cpus for cpus, _ in self._free.values())
+
+    def _find_host(self, cpus, gpus):
+        for host, (free_cpus, free_gpus) in self._free.items():
+            if free_cpus >= cpus and free_gpus >= gpus:
+                return host
+        return None
+
+    @property
+    def queued(self):
+        """Return the number of entities waiting to be released"""
+        return sum(len(group.queue) for group in self._groups)
+
+
+class _LaunchGroup:
+    def __init__(self, max_concurrency, pack):
+        self.queue = deque()  # (entity, cpus, gpus)
+        self.max_concurrency = max_concurrency
+        self.pack = pack
+        self.running = 0
+
+    @property
+    def has_capacity(self):
+        if self.max_concurrency is None:
+            return True
+        return self.running < self.max_concurrency
@@ -243,6 +243,7 @@ class CobaltOrchestrator(Orchestrator):
             start_script_args = [
                 start_script,  # redis_starter.py
                 f"+ifname={self._interface}",  # pass interface to start script
+                self._get_endpoint_arg(db_node_name, port),  # endpoint file
                 "+command",  # command flag for argparser
                 redis_exe,  # redis-server
                 db_conf,  # redis6.conf file
@@ -277,6 +277,7 @@ class LSFOrchestrator(Orchestrator):
                 node_exe_args = [
                     start_script,  # redis_starter.py
                     f"+ifname={self._interface}",  # pass interface to start script
+                    self._get_endpoint_arg(db_shard_name, next_port),  # endpoint file
                     "+command",  # command flag for argparser
                     redis_exe,  # redis-server
                     db_conf,  # redis6.conf file
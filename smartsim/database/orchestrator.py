@@ -29,6 +29,7 @@ import logging
 import os
 import socket
 import time
+from concurrent.futures import ThreadPoolExecutor
 from os import getcwd
 from pathlib import Path
 
@@ -40,14 +41,21 @@ from rediscluster.exceptions import ClusterDownError, RedisClusterException
 logging.getLogger("rediscluster").setLevel(logging.WARNING)
 
 from ..config import CONFIG
+from ..constants import (
+    DB_CLUSTER_TIMEOUT,
+    DB_PROBE_MAX_INTERVAL,
+    DB_PROBE_MIN_INTERVAL,
+)
 from ..entity import DBNode, EntityList
 from ..error import SmartSimError
-from ..launcher.util.shell import execute_cmd
 from ..settings.settings import RunSettings
 from ..utils import get_logger
 
 logger = get_logger(__name__)
 
+# Number of hash slots in a Redis cluster
+CLUSTER_SLOTS = 16384
+
 
 class Orchestrator(EntityList):
     """The Orchestrator is an in-memory database that can be launched
@@ -78,6 +86,7 @@ class Orchestrator(EntityList):
         self.ports = []
         self.path = getcwd()
         self._hosts = []
+        self._shard_addresses = []
         self._interface = interface
         self._check_network_interface()
         self.queue_threads = kwargs.get("threads_per_queue", None)
@@ -116,33 +125,44 @@ class Orchestrator(EntityList):
         for dbnode in self.entities:
             dbnode.remove_stale_dbnode_files()
 
-    def create_cluster(self):  # cov-wlm
+    def create_cluster(self, timeout=DB_CLUSTER_TIMEOUT):  # cov-wlm
         """Connect launched cluster instances.
 
+        Slots are assigned and shards are introduced to each other
+        over the Redis protocol, in parallel across all shards.
+
         Should only be used in the case where cluster initialization
         needs to occur manually which is not often.
 
+        :param timeout: seconds to wait for the cluster to form
+        :type timeout: float, optional
         :raises SmartSimError: if cluster creation fails
         """
-        ip_list = []
-        for host in self.hosts:
-            ip = get_ip_from_host(host)
-            for port in self.ports:
-                address = ":".join((ip, str(port) + " "))
-                ip_list.append(address)
-
-        # call cluster command
-        redis_cli = CONFIG.redis_cli
-        cmd = [redis_cli, "--cluster", "create"]
-        cmd += ip_list
-        cmd += ["--cluster-replicas", "0"]
-        returncode, out, err = execute_cmd(cmd, proc_input="yes", shell=False)
-
-        if returncode != 0:
-            logger.error(out)
-            logger.error(err)
-            raise SmartSimError("Database '--cluster create' command failed")
-        logger.debug(out)
+        shards = self._get_shard_addresses()
+        clients = [redis.Redis(host=ip, port=port) for ip, port in shards]
+        slot_ranges = _get_slot_ranges(len(clients))
+        first_ip, first_port = shards[0]
+
+        logger.debug(f"Creating database cluster from {len(clients)} shards")
+        try:
+            workers = min(len(clients), CONFIG.launch_workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                epochs = range(1, len(clients) + 1)
+                list(executor.map(_assign_slots, clients, slot_ranges, epochs))
+                list(
+                    executor.map(
+                        lambda client: client.execute_command(
+                            "CLUSTER MEET", first_ip, first_port
+                        ),
+                        clients[1:],
+                    )
+                )
+            _wait_for_cluster(clients, timeout)
+        except redis.RedisError as e:
+            raise SmartSimError(f"Database cluster creation failed: {e}") from None
+        finally:
+            for client in clients:
+                client.connection_pool.disconnect()
 
         # Ensure cluster has been setup correctly
         self.check_cluster_status()
@@ -150,22 +170,18 @@ class Orchestrator(EntityList):
 
     def check_cluster_status(self, trials=10):  # cov-wlm
         """Check that a cluster is up and running
+
         :param trials: number of attempts to verify cluster status
         :type trials: int, optional
         :raises SmartSimError: If cluster status cannot be verified
         """
-        host_list = []
-        for host in self.hosts:
-            for port in self.ports:
-                host_dict = dict()
-                host_dict["host"] = get_ip_from_host(host)
-                host_dict["port"] = port
-                host_list.append(host_dict)
+        host_list = [
+            {"host": ip, "port": port} for ip, port in self._get_shard_addresses()
+        ]
 
         logger.debug("Beginning database cluster status check...")
-        while trials > 0:
-            # wait for cluster to spin up
-            time.sleep(5)
+        interval = DB_PROBE_MIN_INTERVAL
+        for trial in range(trials):
             try:
                 redis_tester = RedisCluster(startup_nodes=host_list)
                 redis_tester.set("__test__", "__test__")
@@ -174,9 +190,26 @@ class Orchestrator(EntityList):
                 return
             except (ClusterDownError, RedisClusterException, redis.RedisError):
                 logger.debug("Cluster still spinning up...")
-                trials -= 1
-        if trials == 0:
-            raise SmartSimError("Cluster setup could not be verified")
+                if trial < trials - 1:
+                    time.sleep(interval)
+                    interval = min(interval * 2, DB_PROBE_MAX_INTERVAL)
+        raise SmartSimError("Cluster setup could not be verified")
+
+    def _get_shard_addresses(self):
+        """Return the (ip, port) address of every database shard
+
+        Hosts are resolved once, in parallel, and the addresses
+        are cached for the lifetime of the launched orchestrator.
+
+        :return: shard addresses
+        :rtype: list[tuple[str, int]]
+        """
+        if not self._shard_addresses:
+            ips = resolve_hosts(self.hosts)
+            self._shard_addresses = [
+                (ips[host], port) for host in self.hosts for port in self.ports
+            ]
+        return self._shard_addresses
 
     def get_address(self):
         """Return database addresses
@@ -260,10 +293,12 @@ class Orchestrator(EntityList):
         redis_exe = CONFIG.redis_exe
         ai_module = self._get_AI_module()
         start_script = self._find_redis_start_script()
+        db_node_name = self.name + "_0"
 
         start_script_args = [
             start_script,  # redis_starter.py
             f"+ifname={self._interface}",  # pass interface to start script
+            self._get_endpoint_arg(db_node_name, port),  # endpoint file
             "+command",  # command flag for argparser
             redis_exe,  # redis-server
             db_conf,  # redis6.conf file
@@ -276,7 +311,6 @@ class Orchestrator(EntityList):
 
         # python is exe because we are using redis_starter.py to start redis
         run_settings = RunSettings("python", exe_args)
-        db_node_name = self.name + "_0"
         node = DBNode(db_node_name, self.path, run_settings, [port])
 
         # add DBNode to Orchestrator
@@ -290,14 +324,20 @@ class Orchestrator(EntityList):
         db_args = ["--cluster-enabled yes", "--cluster-config-file", cluster_conf]
         return db_args
 
+    @staticmethod
+    def _get_endpoint_arg(name, port):
+        """Create the argument for the endpoint file of a shard"""
+        return "+endpoint=" + DBNode._get_endpoint_filename(name, port)
+
     def _get_db_hosts(self):
-        hosts = []
-        for dbnode in self.entities:
-            if not dbnode._multihost:
-                hosts.append(dbnode.host)
-            else:
-                hosts.extend(dbnode.hosts)
-        return hosts
+        def get_node_hosts(dbnode):
+            return [dbnode.host] if not dbnode._multihost else dbnode.hosts
+
+        # nodes wait for their output files, so discover them in parallel
+        workers = max(min(len(self.entities), CONFIG.launch_workers), 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            node_hosts = list(executor.map(get_node_hosts, self.entities))
+        return [host for hosts in node_hosts for host in hosts]
 
     @staticmethod
     def _find_redis_start_script():
@@ -326,3 +366,95 @@ def get_ip_from_host(host):
     """
     ip_address = socket.gethostbyname(host)
     return ip_address
+
+
+def resolve_hosts(hosts):
+    """Resolve the IP addresses of many hosts in parallel
+
+    Each distinct host is only looked up once.
+
+    :param hosts: hostnames of the compute nodes
+    :type hosts: list[str]
+    :returns: ip of each host
+    :rtype: dict[str, str]
+    """
+    unique_hosts = list(dict.fromkeys(hosts))
+    if not unique_hosts:
+        return {}
+    workers = min(len(unique_hosts), CONFIG.launch_workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        ips = executor.map(get_ip_from_host, unique_hosts)
+        return dict(zip(unique_hosts, ips))
+
+
+def _get_slot_ranges(num_shards):
+    """Split the cluster hash slots evenly between shards
+
+    :param num_shards: number of shards in the cluster
+    :type num_shards: int
+    :return: first and last slot (inclusive) owned by each shard
+    :rtype: list[tuple[int, int]]
+    """
+    ranges = []
+    for i in range(num_shards):
+        first = round(i * CLUSTER_SLOTS / num_shards)
+        last = round((i + 1) * CLUSTER_SLOTS / num_shards) - 1
+        ranges.append((first, last))
+    return ranges
+
+
+def _assign_slots(client, slot_range, epoch):
+    """Assign a range of hash slots and a config epoch to a shard
+
+    Slots that are already owned by the shard, e.g. when cluster
+    creation is retried, are not treated as an error.
+
+    :param client: connection to the shard
+    :type client: redis.Redis
+    :param slot_range: first and last slot (inclusive) to assign
+    :type slot_range: tuple[int, int]
+    :param epoch: unique config epoch of the shard
+    :type epoch: int
+    """
+    first, last = slot_range
+    try:
+        client.execute_command("CLUSTER ADDSLOTS", *range(first, last + 1))
+    except redis.ResponseError as e:
+        if "busy" not in str(e):
+            raise
+    try:
+        client.execute_command("CLUSTER SET-CONFIG-EPOCH", epoch)
+    except redis.ResponseError:
+        # epoch was already set or the shard already met the cluster
+        pass
+
+
+def _wait_for_cluster(clients, timeout):
+    """Wait until every shard reports a healthy cluster
+
+    :param clients: connections to all shards of the cluster
+    :type clients: list[redis.Redis]
+    :param timeout: seconds to wait for the cluster to form
+    :type timeout: float
+    :raises SmartSimError: if the cluster does not form in time
+    """
+    pending = list(clients)
+    num_shards = str(len(clients))
+    interval = DB_PROBE_MIN_INTERVAL
+    deadline = time.time() + timeout
+    while True:
+        for client in list(pending):
+            info = client.execute_command("CLUSTER INFO")
+            if (
+                info.get("cluster_state") == "ok"
+                and info.get("cluster_known_nodes") == num_shards
+            ):
+                pending.remove(client)
+        if not pending:
+            return
+        if time.time() + interval > deadline:
+            raise SmartSimError(
+                f"Database cluster did not form within {timeout} seconds"
+            )
+        time.sleep(interval)
+        interval = min(interval * 2, DB_PROBE_MAX_INTERVAL)
@@ -1,6 +1,8 @@
 import argparse
+import json
 import os
 import socket
+import time
 from subprocess import PIPE, STDOUT, Popen
 
 import psutil
@@ -46,10 +48,43 @@ parser = argparse.ArgumentParser(
     prefix_chars="+", description="SmartSim Process Launcher"
 )
 parser.add_argument("+ifname", type=str, help="Network Interface name", default="lo")
+parser.add_argument(
+    "+endpoint", type=str, help="File to write the shard endpoint to", default=None
+)
 parser.add_argument("+command", nargs="+", help="Command to run")
 args = parser.parse_args()
 
 
+def get_port(command):
+    """Get the port the database is started on
+
+    :param command: database launch command
+    :type command: list[str]
+    :return: port number
+    :rtype: int
+    """
+    if "--port" in command:
+        return int(command[command.index("--port") + 1])
+    return 6379
+
+
+def write_endpoint(filepath, endpoint):
+    """Atomically write the endpoint of the shard as JSON
+
+    The file is written under a temporary name and moved into
+    place, so readers never observe a partially written file.
+
+    :param filepath: path of the endpoint file
+    :type filepath: str
+    :param endpoint: ip, port, pid and start time of the shard
+    :type endpoint: dict
+    """
+    tmp_filepath = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_filepath, "w") as f:
+        json.dump(endpoint, f)
+    os.replace(tmp_filepath, filepath)
+
+
 def current_ip(interface="lo"):
     if interface == "lo":
         loopback = get_lb_interface_name()
@@ -71,5 +106,16 @@ print("-" * 10, "  Output  ", "-" * 10, "\n\n")
 
 p = Popen(COMMAND, stdout=PIPE, stderr=STDOUT)
 
+if args.endpoint:
+    write_endpoint(
+        args.endpoint,
+        {
+            "ip": IP_ADDRESS,
+            "port": get_port(args.command),
+            "pid": p.pid,
+            "start_time": time.time(),
+        },
+    )
+
 for line in iter(p.stdout.readline, b""):
     print(line.decode("utf-8").rstrip(), flush=True)
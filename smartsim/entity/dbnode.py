@@ -24,10 +24,20 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import itertools
+import json
 import os
 import os.path as osp
 import time
 
+import redis
+
+from ..constants import (
+    DB_HOST_TIMEOUT,
+    DB_HOSTS_TIMEOUT,
+    DB_PROBE_MAX_INTERVAL,
+    DB_PROBE_MIN_INTERVAL,
+)
 from ..error import SmartSimError
 from ..utils import get_logger
 from .entity import SmartSimEntity
@@ -91,6 +101,10 @@ class DBNode(SmartSimEntity):
                     if osp.exists(conf_file):
                         os.remove(conf_file)
 
+        for endpoint_file in self._get_endpoint_files():
+            if osp.exists(endpoint_file):
+                os.remove(endpoint_file)
+
         for file_ending in [".err", ".out", ".mpmd"]:
             file_name = osp.join(self.path, self.name + file_ending)
             if osp.exists(file_name):
@@ -130,87 +144,168 @@ class DBNode(SmartSimEntity):
         ]
 
     def _parse_db_host(self):
-        """Parse the database host/IP from the output file
+        """Parse the database host/IP from the shard endpoint files
 
         :raises SmartSimError: if host/ip could not be found
         :return: ip address | hostname
         :rtype: str
         """
-        filepath = osp.join(self.path, self.name + ".out")
-        trials = 5
-        ip = None
-
-        # try a few times to give the database files time to
-        # populate on busy systems.
-        while not ip and trials > 0:
-            try:
-                with open(filepath, "r") as f:
-                    lines = f.readlines()
-                    for line in lines:
-                        content = line.split()
-                        if "IPADDRESS:" in content:
-                            ip = content[-1]
-            # suppress error
-            except FileNotFoundError:
-                pass
-
-            logger.debug("Waiting for Redis output files to populate...")
-            if not ip:
-                time.sleep(1)
-                trials -= 1
-
-        if not ip:
-            logger.error("Redis IP address lookup strategy failed.")
-            raise SmartSimError("Failed to obtain database hostname")
-
-        return ip
+        endpoints = self._wait_for_endpoints(DB_HOST_TIMEOUT)
+        return endpoints[0]["ip"]
 
     def _parse_db_hosts(self):  # cov-lsf
-        """Parse the database hosts/IPs from the output files
+        """Parse the database hosts/IPs from the shard endpoint files
 
-        this uses the RedisIP module that is built as a dependency
-        The IP address is preferred, but if hostname is only present
-        then a lookup to /etc/hosts is done through the socket library.
+        The IP address is written by each shard once it has started.
         This function must be called only if ``_multihost==True``.
 
         :raises SmartSimError: if host/ip could not be found
         :return: ip addresses | hostnames
         :rtype: list[str]
         """
-        ips = []
-
-        for shard_id in self._shard_ids:
-            trials = 5
-            ip = None
-            filepath = osp.join(self.path, self.name + f"_{shard_id}.out")
-            # try a few times to give the database files time to
-            # populate on busy systems.
-            while not ip and trials > 0:
-                try:
-                    with open(filepath, "r") as f:
-                        lines = f.readlines()
-                        for line in lines:
-                            content = line.split()
-                            if "IPADDRESS:" in content:
-                                ip = content[-1]
-
-                # suppress error
-                except FileNotFoundError:
-                    pass
-
-                logger.debug("Waiting for RedisIP files to populate...")
-                if not ip:
-                    # Larger sleep time, as this seems to be needed for
-                    # multihost setups
-                    time.sleep(5)
-                    trials -= 1
-
-            if not ip:
-                logger.error("RedisIP address lookup strategy failed.")
-                raise SmartSimError("Failed to obtain database hostname")
-
-            ips.append(ip)
-
-        ips = list(dict.fromkeys(ips))
-
-        return ips
+        endpoints = self._wait_for_endpoints(DB_HOSTS_TIMEOUT)
+        return list(dict.fromkeys(endpoint["ip"] for endpoint in endpoints))
+
+    def _wait_for_endpoints(self, timeout):
+        """Wait for every shard of this node to write its endpoint file
+
+        Endpoint files are written atomically, so each file only
+        needs to be read once it exists.
+
+        :param timeout: seconds to wait for the endpoint files
+        :type timeout: float
+        :raises SmartSimError: if not all endpoints were written in time
+        :return: endpoint of each shard
+        :rtype: list[dict]
+        """
+        endpoints = dict.fromkeys(self._get_endpoint_files())
+        interval = DB_PROBE_MIN_INTERVAL
+        deadline = time.time() + timeout
+        while True:
+            for filepath, endpoint in endpoints.items():
+                if not endpoint and osp.exists(filepath):
+                    endpoints[filepath] = self._read_endpoint(filepath)
+            if all(endpoints.values()) or time.time() > deadline:
+                break
+            logger.debug("Waiting for database endpoint files to populate...")
+            time.sleep(interval)
+            interval = min(interval * 2, DB_PROBE_MAX_INTERVAL)
+
+        if not all(endpoints.values()):
+            logger.error("Database endpoint lookup strategy failed.")
+            raise SmartSimError("Failed to obtain database hostname")
+        return list(endpoints.values())
+
+    def _get_endpoint_files(self):
+        """Return the paths of the endpoint files of every shard
+
+        :return: endpoint file paths
+        :rtype: list[str]
+        """
+        if not self._multihost:
+            filenames = [
+                self._get_endpoint_filename(self.name, port) for port in self.ports
+            ]
+        else:  # cov-lsf
+            # shards cycle through the ports of the node
+            filenames = [
+                self._get_endpoint_filename(
+                    self.name + f"_{shard_id}",
+                    self.ports[shard_id % len(self.ports)],
+                )
+                for shard_id in self._shard_ids
+            ]
+        return [osp.join(self.path, filename) for filename in filenames]
+
+    @staticmethod
+    def _get_endpoint_filename(name, port):
+        """Returns the endpoint file name of a shard
+
+        :param name: name of the shard
+        :type name: str
+        :param port: port number
+        :type port: int
+        :return: the shard endpoint file name
+        :rtype: str
+        """
+        return "".join((name, "-", str(port), ".endpoint.json"))
+
+    @staticmethod
+    def _read_endpoint(filepath):
+        """Read the endpoint of a shard once
+
+        :param filepath: path to the endpoint file of a shard
+        :type filepath: str
+        :return: ip, port, pid and start time of the shard
+                 or None if not written yet
+        :rtype: dict
+        """
+        try:
+            with open(filepath, "r") as f:
+                return json.load(f)
+        # suppress error
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _get_known_hosts(self):
+        """Return the hosts of this node without waiting for them
+
+        :return: hosts or None if not all hosts have been written yet
+        :rtype: list[str]
+        """
+        hosts = self._hosts if self._multihost else self._host
+        if not hosts:
+            ips = []
+            for filepath in self._get_endpoint_files():
+                endpoint = self._read_endpoint(filepath)
+                if not endpoint:
+                    return None
+                ips.append(endpoint["ip"])
+            if not self._multihost:
+                self._host = ips[0]
+            else:  # cov-lsf
+                self._hosts = list(dict.fromkeys(ips))
+        return self._hosts if self._multihost else [self._host]
+
+    def is_ready(self, timeout=1):
+        """Check if every shard of this node accepts connections
+
+        Shards are probed as soon as their address is written
+        by the database and ready once they answer PING.
+
+        :param timeout: seconds to wait for each shard to respond
+        :type timeout: float, optional
+        :return: True if all shards answered PING
+        :rtype: bool
+        """
+        hosts = self._get_known_hosts()
+        if not hosts:
+            return False
+        for host, port in itertools.product(hosts, self.ports):
+            if not ping_shard(host, port, timeout=timeout):
+                return False
+        return True
+
+
+def ping_shard(host, port, timeout=1):
+    """Send PING to a database shard
+
+    :param host: hostname or IP of the shard
+    :type host: str
+    :param port: port of the shard
+    :type port: int
+    :param timeout: seconds to wait for a connection and reply
+    :type timeout: float, optional
+    :return: True if the shard answered
+    :rtype: bool
+    """
+    client = redis.Redis(
+        host=host, port=port, socket_connect_timeout=timeout, socket_timeout=timeout
+    )
+    try:
+        return bool(client.ping())
+    except redis.RedisError:
+        # not listening yet, or still loading
+        return False
+    finally:
+        client.connection_pool.disconnect()
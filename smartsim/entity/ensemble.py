@@ -24,7 +24,7 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from copy import deepcopy
+import copy
 from os import getcwd
 
 from smartsim.error.errors import SmartSimError
@@ -35,7 +35,14 @@ from ..utils import get_logger
 from ..utils.helpers import init_default
 from .entityList import EntityList
 from .model import Model
-from .strategies import create_all_permutations, random_permutations, step_values
+from .strategies import (
+    create_all_permutations,
+    get_permutation,
+    num_permutations,
+    random_permutations,
+    sample_permutations,
+    step_values,
+)
 
 logger = get_logger(__name__)
 
@@ -52,6 +59,8 @@ class Ensemble(EntityList):
         batch_settings=None,
         run_settings=None,
         perm_strat="all_perm",
+        lazy=False,
+        array=False,
         **kwargs,
     ):
         """Initialize an Ensemble of Model instances.
@@ -65,7 +74,8 @@ class Ensemble(EntityList):
         :type params: dict[str, Any]
         :param batch_settings: describes settings for ``Ensemble`` as batch workload
         :type batch_settings: BatchSettings, optional
-        :param run_settings: describes how each ``Model`` should be executed
+        :param run_settings: describes how each ``Model`` should be executed,
+                             later changes do not reach the models
         :type run_settings: RunSettings, optional
         :param replicas: number of ``Model`` replicas to create - a keyword argument of kwargs
         :type replicas: int, optional
@@ -74,6 +84,13 @@ class Ensemble(EntityList):
                              options are "all_perm", "stepped", "random"
                              or a callable function. Defaults to "all_perm".
         :type perm_strategy: str
+        :param lazy: only create ``Model`` members when they are accessed,
+                     defaults to False
+        :type lazy: bool, optional
+        :param array: launch the members as one job array where the
+                      batch settings apply to each member, defaults to False
+        :type array: bool, optional
+        :raises SmartSimError: if launched as a job array without batch settings
         :return: ``Ensemble`` instance
         :rtype: ``Ensemble``
         """
@@ -81,7 +98,25 @@ class Ensemble(EntityList):
         self._key_prefixing_enabled = True
         self.batch_settings = init_default({}, batch_settings, BatchSettings)
         self.run_settings = init_default({}, run_settings, RunSettings)
-        super().__init__(name, getcwd(), perm_strat=perm_strat, **kwargs)
+        # members share a private snapshot of the run settings, so that
+        # changes made to them after the ensemble is created, e.g. to
+        # reuse them for another ensemble, do not reach the members
+        self._member_settings = copy.deepcopy(self.run_settings)
+        if array and not self.batch_settings:
+            raise SmartSimError(
+                "Ensembles launched as job arrays must be provided batch settings"
+            )
+        self._array = array
+        super().__init__(name, getcwd(), perm_strat=perm_strat, lazy=lazy, **kwargs)
+
+    @property
+    def array(self):
+        """Whether the members are launched as one job array
+
+        :return: True if launched as a job array
+        :rtype: bool
+        """
+        return self._array
 
     @property
     def models(self):
@@ -96,11 +131,22 @@ class Ensemble(EntityList):
         """
         strategy = self._set_strategy(kwargs.pop("perm_strat"))
         replicas = kwargs.pop("replicas", None)
+        lazy = kwargs.pop("lazy", False)
         # if a ensemble has parameters and run settings, create
         # the ensemble and copy run_settings to each member
         if self.params:
             if self.run_settings:
                 names, params = self._read_model_parameters()
+                if lazy:
+                    lazy_params = self._get_lazy_parameters(
+                        strategy, names, params, **kwargs
+                    )
+                    if lazy_params:
+                        self.entities = _LazyModels(self, *lazy_params)
+                        return
+                    logger.warning(
+                        "Ensemble members of user strategies cannot be created lazily"
+                    )
                 all_model_params = strategy(names, params, **kwargs)
                 if not isinstance(all_model_params, list):
                     raise UserStrategyError(strategy)
@@ -108,16 +154,7 @@ class Ensemble(EntityList):
                 for i, param_set in enumerate(all_model_params):
                     if not isinstance(param_set, dict):
                         raise UserStrategyError(strategy)
-
-                    model_name = "_".join((self.name, str(i)))
-                    model = Model(
-                        model_name,
-                        param_set,
-                        self.path,
-                        run_settings=deepcopy(self.run_settings),
-                    )
-                    model.enable_key_prefixing()
-                    self.add_model(model)
+                    self.add_model(self._create_model(i, param_set))
             # cannot generate models without run settings
             else:
                 raise SmartSimError(
@@ -126,17 +163,13 @@ class Ensemble(EntityList):
         else:
             if self.run_settings:
                 if replicas:
+                    if lazy:
+                        self.entities = _LazyModels(self, replicas, lambda i: {})
+                        return
                     for i in range(replicas):
-                        model_name = "_".join((self.name, str(i)))
-                        model = Model(
-                            model_name,
-                            {},
-                            self.path,
-                            run_settings=deepcopy(self.run_settings),
-                        )
-                        model.enable_key_prefixing()
+                        model = self._create_model(i, {})
                         logger.debug(
-                            f"Created ensemble member: {model_name} in {self.name}"
+                            f"Created ensemble member: {model.name} in {self.name}"
                         )
                         self.add_model(model)
                 else:
@@ -152,6 +185,91 @@ class Ensemble(EntityList):
             else:
                 logger.info("Empty ensemble created for batch launch")
 
+    def _create_model(self, index, params):
+        """Create a member of the ensemble
+
+        The run settings of the member share the data of a snapshot
+        of the run settings taken at init, and only store what the
+        member changes.
+
+        :param index: index of the member
+        :type index: int
+        :param params: model parameters
+        :type params: dict
+        :return: ensemble member
+        :rtype: Model
+        """
+        model_name = "_".join((self.name, str(index)))
+        model = Model(
+            model_name,
+            params,
+            self.path,
+            run_settings=self._member_settings._share(),
+        )
+        model.enable_key_prefixing()
+        return model
+
+    def _get_lazy_parameters(self, strategy, param_names, param_values, **kwargs):
+        """Get the parameters of members without expanding all of them
+
+        :param strategy: permutation strategy
+        :type strategy: callable
+        :param param_names: param names for permutation strategy
+        :type param_names: list
+        :param param_values: param values for permutation strategy
+        :type param_values: list
+        :return: number of members and a function returning the
+                 parameters of a member from its index, or None if
+                 the strategy cannot be expanded lazily
+        :rtype: tuple[int, callable]
+        """
+        if strategy is create_all_permutations:
+            num_models = num_permutations(param_values)
+            indices = range(num_models)
+        elif strategy is random_permutations:
+            indices = sample_permutations(param_values, **kwargs)
+            num_models = len(indices)
+        elif strategy is step_values:
+            num_models = min(len(values) for values in param_values)
+
+            def get_params(index):
+                return {
+                    name: values[index]
+                    for name, values in zip(param_names, param_values)
+                }
+
+            return num_models, get_params
+        else:
+            return None
+
+        def get_params(index):
+            return get_permutation(param_names, param_values, indices[index])
+
+        return num_models, get_params
+
+    def _update_models(self, update):
+        """Apply an update to every member of the ensemble
+
+        For lazy ensembles, the update is also applied to
+        members that are created later.
+
+        :param update: function to call on each member
+        :type update: callable
+        """
+        if isinstance(self.entities, _LazyModels):
+            self.entities.apply(update)
+        else:
+            for model in self.entities:
+                update(model)
+
+    def set_path(self, new_path):
+        self.path = new_path
+
+        def update(model):
+            model.path = new_path
+
+        self._update_models(update)
+
     def add_model(self, model):
         """Add a model to this ensemble
 
@@ -183,15 +301,15 @@ class Ensemble(EntityList):
         :param incoming_entity: The entity that data will be received from
         :type incoming_entity: SmartSimEntity
         """
-        for model in self.entities:
-            model.register_incoming_entity(incoming_entity)
+        self._update_models(
+            lambda model: model.register_incoming_entity(incoming_entity)
+        )
 
     def enable_key_prefixing(self):
         """If called, all models within this ensemble will prefix their keys with its
         own model name.
         """
-        for model in self.entities:
-            model.enable_key_prefixing()
+        self._update_models(lambda model: model.enable_key_prefixing())
 
     def query_key_prefixing(self):
         """Inquire as to whether each model within the ensemble will prefix its keys
@@ -199,7 +317,11 @@ class Ensemble(EntityList):
         :returns: True if all models have key prefixing enabled, False otherwise
         :rtype: bool
         """
-        return all([model.query_key_prefixing() for model in self.entities])
+        models = self.entities
+        if isinstance(models, _LazyModels):
+            # members that are not created yet have key prefixing enabled
+            models = models.created
+        return all([model.query_key_prefixing() for model in models])
 
     def attach_generator_files(self, to_copy=None, to_symlink=None, to_configure=None):
         """Attach files to each model within the ensemble for generation
@@ -225,10 +347,11 @@ class Ensemble(EntityList):
         :param to_configure: input files with tagged parameters, defaults to []
         :type to_configure: list, optional
         """
-        for model in self.entities:
-            model.attach_generator_files(
+        self._update_models(
+            lambda model: model.attach_generator_files(
                 to_copy=to_copy, to_symlink=to_symlink, to_configure=to_configure
             )
+        )
 
     def _set_strategy(self, strategy):
         """Set the permutation strategy for generating models within
@@ -279,3 +402,87 @@ class Ensemble(EntityList):
                     + "Must be list, int, or string."
                 )
         return param_names, parameters
+
+
+class _LazyModels:
+    """Sequence of ensemble members that creates each member
+    the first time it is accessed.
+    """
+
+    def __init__(self, ensemble, num_models, get_params):
+        """Initialize the members of a lazy ensemble
+
+        :param ensemble: ensemble the members belong to
+        :type ensemble: Ensemble
+        :param num_models: number of members expanded from parameters
+        :type num_models: int
+        :param get_params: returns the parameters of a member by index
+        :type get_params: callable
+        """
+        self._ensemble = ensemble
+        self._num_models = num_models
+        self._get_params = get_params
+        self._models = {}  # created members by index
+        self._added = []  # members added with Ensemble.add_model
+        self._updates = []  # applied to members when they are created
+
+    @property
+    def created(self):
+        """Return the members that have been created so far
+
+        :return: created members
+        :rtype: list[Model]
+        """
+        return list(self._models.values()) + self._added
+
+    def apply(self, update):
+        """Apply an update to created and future members
+
+        :param update: function to call on each member
+        :type update: callable
+        """
+        for model in self.created:
+            update(model)
+        self._updates.append(update)
+
+    def append(self, model):
+        self._added.append(model)
+
+    def _get_model(self, index):
+        model = self._models.get(index, None)
+        if not model:
+            model = self._ensemble._create_model(index, self._get_params(index))
+            for update in self._updates:
+                update(model)
+            self._models[index] = model
+        return model
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Ensemble member index out of range")
+        if index >= self._num_models:
+            return self._added[index - self._num_models]
+        return self._get_model(index)
+
+    def __contains__(self, model):
+        if model in self._added:
+            return True
+        prefix = self._ensemble.name + "_"
+        index = model.name[len(prefix) :]
+        return (
+            model.name.startswith(prefix)
+            and index.isdigit()
+            and str(int(index)) == index
+            and int(index) < self._num_models
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __len__(self):
+        return self._num_models + len(self._added)
@@ -49,6 +49,11 @@ class EntityList:
         except AttributeError:
             return False
 
+    @property
+    def array(self):
+        """Whether the entities are launched as one job array"""
+        return False
+
     @property
     def type(self):
         """Return the name of the class"""
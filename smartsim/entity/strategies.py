@@ -26,6 +26,7 @@
 
 # Generation Strategies
 
+import random
 from itertools import product
 
 
@@ -48,23 +49,68 @@ def step_values(param_names, param_values):
 
 
 def random_permutations(param_names, param_values, n_models):
-    import random
+    indices = sample_permutations(param_values, n_models)
+    return [get_permutation(param_names, param_values, i) for i in indices]
 
-    # first, check if we've requested more values than possible.
-    perms = list(product(*param_values))
-    if n_models >= len(perms):
-        return create_all_permutations(param_names, param_values)
-    else:
-        permutations = []
-        permutation_strings = set()
-        while len(permutations) < n_models:
-            model_dict = dict(
-                zip(
-                    param_names,
-                    map(lambda x: x[random.randint(0, len(x) - 1)], param_values),
-                )
-            )
-            if str(model_dict) not in permutation_strings:
-                permutation_strings.add(str(model_dict))
-                permutations.append(model_dict)
-        return permutations
+
+def num_permutations(param_values):
+    """Return the number of permutations of all parameters
+
+    :param param_values: values of each parameter
+    :type param_values: list[list]
+    :return: number of permutations
+    :rtype: int
+    """
+    # math.prod requires Python 3.8
+    num_perms = 1
+    for values in param_values:
+        num_perms *= len(values)
+    return num_perms
+
+
+def get_permutation(param_names, param_values, index):
+    """Return a single permutation of all parameters
+
+    Permutations are numbered in the order they are created
+    by ``create_all_permutations``, and the index is decoded
+    as a mixed radix number, so that no other permutation
+    has to be created.
+
+    :param param_names: parameter names
+    :type param_names: list[str]
+    :param param_values: values of each parameter
+    :type param_values: list[list]
+    :param index: index of the permutation
+    :type index: int
+    :return: parameters of the permutation
+    :rtype: dict
+    """
+    value_indices = []
+    for values in reversed(param_values):
+        index, value_index = divmod(index, len(values))
+        value_indices.append(value_index)
+    return {
+        name: values[value_index]
+        for name, values, value_index in zip(
+            param_names, param_values, reversed(value_indices)
+        )
+    }
+
+
+def sample_permutations(param_values, n_models):
+    """Sample the indices of permutations without replacement
+
+    If as many or more models are requested than there are
+    permutations, every permutation is returned in order.
+
+    :param param_values: values of each parameter
+    :type param_values: list[list]
+    :param n_models: number of permutations to sample
+    :type n_models: int
+    :return: indices of the sampled permutations
+    :rtype: Sequence[int]
+    """
+    num_perms = num_permutations(param_values)
+    if n_models >= num_perms:
+        return range(num_perms)
+    return random.sample(range(num_perms), n_models)
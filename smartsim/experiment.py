@@ -24,8 +24,10 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
 import os.path as osp
 import time
+from functools import partial
 from os import getcwd
 from pprint import pformat
 
@@ -34,7 +36,9 @@ from tqdm import trange
 
 from smartsim.control.manifest import Manifest
 
+from .constants import TERMINAL_STATUSES
 from .control import Controller, Manifest
+from .control.job import StatusUpdate
 from .entity import Ensemble, Model
 from .error import SmartSimError
 from .generation import Generator
@@ -66,7 +70,7 @@ class Experiment:
         :param exp_path: path to location of ``Experiment`` directory if generated
         :type exp_path: str, optional
         :param launcher: type of launcher being used, options are "slurm", "pbs",
-                         "cobalt", "lsf", or "local". Defaults to "local"
+                         "cobalt", "lsf", "pilot", or "local". Defaults to "local"
         :type launcher: str, optional
         """
         self.name = name
@@ -79,7 +83,15 @@ class Experiment:
         self.exp_path = init_default(osp.join(getcwd(), name), exp_path, str)
         self._control = Controller(launcher=launcher)
 
-    def start(self, *args, block=True, summary=False):
+    def start(
+        self,
+        *args,
+        block=True,
+        summary=False,
+        pack=False,
+        max_concurrency=None,
+        priority=None,
+    ):
         """Launch instances passed as arguments
 
         Start the ``Experiment`` by turning specified instances into jobs
@@ -95,12 +107,31 @@ class Experiment:
         :param summary: print a launch summary prior to launch,
                         defaults to False
         :type summary: bool, optional
+        :param pack: queue models and ensemble members and pack them
+                     onto the nodes of their Slurm allocation as CPUs
+                     and GPUs free up, defaults to False
+        :type pack: bool, optional
+        :param max_concurrency: queue models and ensemble members and
+                                run at most this many at once, starting
+                                a new one as each completes, defaults
+                                to no limit
+        :type max_concurrency: int, optional
+        :param priority: function of a queued model, models with lower
+                         values are launched first, defaults to the
+                         order of the models
+        :type priority: callable, optional
         """
         start_manifest = Manifest(*args)
         try:
             if summary:
                 self._launch_summary(start_manifest)
-            self._control.start(manifest=start_manifest, block=block)
+            self._control.start(
+                manifest=start_manifest,
+                block=block,
+                pack=pack,
+                max_concurrency=max_concurrency,
+                priority=priority,
+            )
         except SmartSimError as e:
             logger.error(e)
             raise
@@ -127,7 +158,174 @@ class Experiment:
             logger.error(e)
             raise
 
-    def generate(self, *args, tag=None, overwrite=False):
+    async def start_async(self, *args, block=True, **kwargs):
+        """Launch instances without blocking the asyncio event loop
+
+        Coroutine version of ``Experiment.start`` taking the same
+        arguments. Instances are launched in the default executor
+        of the running event loop. If ``block`` is set, the launched
+        models and ensembles are then awaited with ``Experiment.wait``.
+
+        :param block: wait until all non-database jobs are finished,
+                      defaults to True
+        :type block: bool, optional
+        """
+        loop = asyncio.get_running_loop()
+        start = partial(self.start, *args, block=False, **kwargs)
+        await loop.run_in_executor(None, start)
+        if block:
+            manifest = Manifest(*args)
+            entities = manifest.models + manifest.ensembles
+            if entities:
+                await self.wait(*entities)
+
+    async def stop_async(self, *args):
+        """Stop instances without blocking the asyncio event loop
+
+        Coroutine version of ``Experiment.stop``.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self.stop, *args))
+
+    async def wait(self, *args):
+        """Wait until the jobs of all instances passed have finished
+
+        Jobs are not polled, the coroutine is resumed by the job
+        manager as their status changes.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            await exp.start_async(model, block=False)
+            statuses = await exp.wait(model)
+
+        :returns: statuses of the jobs, as ``Experiment.get_status``
+        :rtype: list[str]
+        :raises SmartSimError: if an instance was not launched
+                               by this ``Experiment``
+        """
+        loop = asyncio.get_running_loop()
+        entities = self._get_job_entities(Manifest(*args))
+        remaining = set(entity.name for entity in entities)
+        finished = loop.create_future()
+
+        def update(name, status):
+            if status in TERMINAL_STATUSES:
+                remaining.discard(name)
+            if not remaining and not finished.done():
+                finished.set_result(None)
+
+        def listener(job, old_status):
+            if job.ename in remaining:
+                _call_soon(loop, update, job.ename, job.status)
+
+        # listen first to not miss jobs finishing during the check
+        self._control._jobs.add_status_listener(listener)
+        try:
+            for entity in entities:
+                if self._is_finished(entity):
+                    remaining.discard(entity.name)
+            if remaining:
+                await finished
+        finally:
+            self._control._jobs.remove_status_listener(listener)
+        return self.get_status(*args)
+
+    async def status_stream(self, *args):
+        """Iterate over the changes of status of jobs as they happen
+
+        Each change is a ``StatusUpdate`` of the entity of the job,
+        its previous status (None for new jobs), its new status and
+        its returncode. If instances are passed, only the changes of
+        their jobs are streamed and the stream ends once they have
+        all finished. Otherwise, the changes of every job are
+        streamed until the iteration is stopped.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            async for update in exp.status_stream(ensemble):
+                print(update.entity.name, update.status)
+
+        :returns: asynchronous iterator of status changes
+        :rtype: AsyncIterator[StatusUpdate]
+        :raises SmartSimError: if an instance was not launched
+                               by this ``Experiment``
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        entities = None
+        if args:
+            entities = self._get_job_entities(Manifest(*args))
+        names = None if entities is None else set(e.name for e in entities)
+
+        def listener(job, old_status):
+            if names is None or job.ename in names:
+                update = StatusUpdate(
+                    job.entity, old_status, job.status, job.returncode
+                )
+                _call_soon(loop, queue.put_nowait, update)
+
+        self._control._jobs.add_status_listener(listener)
+        try:
+            remaining = None
+            if entities is not None:
+                remaining = set(e.name for e in entities if not self._is_finished(e))
+            while remaining is None or remaining:
+                update = await queue.get()
+                yield update
+                if remaining is not None and update.status in TERMINAL_STATUSES:
+                    remaining.discard(update.entity.name)
+        finally:
+            self._control._jobs.remove_status_listener(listener)
+
+    def on_status_change(self, entity, callback, statuses=None):
+        """Call a function when the status of the job of an instance changes
+
+        ``entity`` is an instance of ``Model``, ``Ensemble`` or
+        ``Orchestrator``, or an entity name, which may be a
+        shell-style pattern such as ``"sim_*"``. Callbacks are called
+        with a ``StatusUpdate`` of the entity of the job, its previous
+        and new status, and its returncode. Final statuses are
+        reported by the job manager thread as soon as it finds them,
+        so downstream work can be started without polling.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            def analyze(update):
+                exp.start(analysis, block=False)
+
+            exp.on_status_change(producer, analyze,
+                                 statuses=[constants.STATUS_COMPLETED])
+            exp.start(producer, block=False)
+
+        Callbacks should return quickly and must not start
+        instances with ``block=True``.
+
+        :param entity: instance, instance name or pattern of names
+        :type entity: Model | Ensemble | Orchestrator | str
+        :param callback: function taking a StatusUpdate
+        :type callback: callable
+        :param statuses: only report changes to these statuses,
+                         defaults to all statuses
+        :type statuses: list[str], optional
+        :returns: subscription to pass to
+                  ``Experiment.remove_status_callback``
+        :rtype: callable
+        :raises TypeError: if wrong type
+        """
+        return self._control._jobs.on_status_change(entity, callback, statuses)
+
+    def remove_status_callback(self, subscription):
+        """Stop calling a function registered with ``on_status_change``
+
+        :param subscription: value returned by ``on_status_change``
+        :type subscription: callable
+        """
+        self._control._jobs.remove_status_listener(subscription)
+
+    def generate(self, *args, tag=None, overwrite=False, incremental=False):
         """Generate the file structure for an ``Experiment``
 
         ``Experiment.generate`` creates directories for each instance
@@ -146,9 +344,15 @@ class Experiment:
         :param overwrite: overwrite existing folders and contents,
                defaults to False
         :type overwrite: bool, optional
+        :param incremental: only update the files of existing folders
+               that changed since they were last generated,
+               defaults to False
+        :type incremental: bool, optional
         """
         try:
-            generator = Generator(self.exp_path, overwrite=overwrite)
+            generator = Generator(
+                self.exp_path, overwrite=overwrite, incremental=incremental
+            )
             if tag:
                 generator.set_tag(tag)
             generator.generate_experiment(*args)
@@ -228,6 +432,8 @@ class Experiment:
         run_settings=None,
         replicas=None,
         perm_strategy="all_perm",
+        lazy=False,
+        array=False,
         **kwargs,
     ):
         """Create an ``Ensemble`` of ``Model`` instances
@@ -275,6 +481,15 @@ class Experiment:
                               options are "all_perm", "stepped", "random"
                               or a callable function. Default is "all_perm".
         :type perm_strategy: str, optional
+        :param lazy: only create ``Model`` members when they are accessed,
+                     e.g. when they are generated or launched, instead of
+                     expanding all parameters at once. Default is False.
+        :type lazy: bool, optional
+        :param array: launch the members as one job array instead of
+                      one batch, with ``batch_settings`` applied to each
+                      member. Supported by the Slurm, PBSPro and LSF
+                      launchers. Default is False.
+        :type array: bool, optional
         :raises SmartSimError: if initialization fails
         :return: ``Ensemble`` instance
         :rtype: Ensemble
@@ -287,6 +502,8 @@ class Experiment:
                 run_settings=run_settings,
                 perm_strat=perm_strategy,
                 replicas=replicas,
+                lazy=lazy,
+                array=array,
                 **kwargs,
             )
             return new_ensemble
@@ -478,5 +695,53 @@ class Experiment:
         for _ in prog_bar:
             time.sleep(wait / steps)
 
+    def _get_job_entities(self, manifest):
+        """Entities of a manifest that are tracked as one job each
+
+        :param manifest: Manifest of deployables
+        :type manifest: Manifest
+        :return: entities and entity lists with a job
+        :rtype: list[SmartSimEntity | EntityList]
+        """
+        entities = list(manifest.models)
+        entity_lists = list(manifest.ensembles)
+        if manifest.db:
+            entity_lists.append(manifest.db)
+        for entity_list in entity_lists:
+            if entity_list.batch and not entity_list.array:
+                entities.append(entity_list)
+            else:
+                entities.extend(entity_list.entities)
+        return entities
+
+    def _is_finished(self, entity):
+        """Whether the job of an entity has finished
+
+        :param entity: entity with a job
+        :type entity: SmartSimEntity | EntityList
+        :return: True if finished
+        :rtype: bool
+        :raises SmartSimError: if entity has not been launched
+                               by this ``Experiment``
+        """
+        try:
+            return self._control._jobs.is_finished(entity)
+        except KeyError:
+            raise SmartSimError(
+                f"Entity by the name of {entity.name} has not been "
+                "launched by this Experiment"
+            ) from None
+
     def __str__(self):
         return self.name
+
+
+def _call_soon(loop, callback, *args):
+    """Schedule a callback on an event loop from another thread
+
+    Updates for an event loop that is already closed are dropped.
+    """
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass
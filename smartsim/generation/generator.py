@@ -24,11 +24,17 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import errno
+import hashlib
+import json
+import os
 import pathlib
 import shutil
-from distutils import dir_util
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from os import mkdir, path, symlink
 
+from ..config import CONFIG
 from ..control import Manifest
 from ..entity import Model
 from ..error import EntityExistsError
@@ -38,6 +44,9 @@ from .modelwriter import ModelWriter
 logger = get_logger(__name__)
 logger.propagate = False
 
+# file recording what an entity directory was generated from
+GEN_MANIFEST = ".smartsim_generation.json"
+
 
 class Generator:
     """The primary job of the generator is to create the file structure
@@ -45,7 +54,7 @@ class Generator:
     and writing into configuration files as well.
     """
 
-    def __init__(self, gen_path, overwrite=False):
+    def __init__(self, gen_path, overwrite=False, incremental=False):
         """Initialize a generator object
 
         if overwrite is true, replace any existing
@@ -55,12 +64,24 @@ class Generator:
         is false, raises EntityExistsError when there is a name
         collision between entities.
 
+        if incremental is true, existing entity directories are
+        updated instead. Only the attached files whose content
+        changed are copied again, and tagged files are only written
+        again if their content, the tag or the model parameters
+        changed. Entity directories that are up to date are skipped.
+
         :param overwrite: toggle entity replacement, defaults to False
         :type overwrite: bool, optional
+        :param incremental: update existing entity directories,
+                            defaults to False
+        :type incremental: bool, optional
         """
         self._writer = ModelWriter()
         self.gen_path = gen_path
         self.overwrite = overwrite
+        self.incremental = incremental
+        self._hashes = {}  # content hashes of attached files
+        self._hash_lock = threading.Lock()
 
     def generate_experiment(self, *args):
         """Run ensemble and experiment file structure generation
@@ -156,7 +177,9 @@ class Generator:
 
             elist_dir = path.join(self.gen_path, elist.name)
             if path.isdir(elist_dir):
-                if self.overwrite:
+                if self.incremental:
+                    self._remove_stale_entity_dirs(elist_dir, elist.entities)
+                elif self.overwrite:
                     shutil.rmtree(elist_dir)
                     mkdir(elist_dir)
             else:
@@ -168,6 +191,10 @@ class Generator:
     def _gen_entity_dirs(self, entities, entity_list=None):
         """Generate directories for Entity instances
 
+        Up to ``CONFIG.gen_workers`` directories are generated at once.
+        If generation of an entity fails, entities that have not been
+        started yet are cancelled and the first error is raised.
+
         :param entities: list of Entity instances
         :type entities: list
         :param entity_list: EntityList instance, defaults to None
@@ -178,26 +205,210 @@ class Generator:
         if not entities:
             return
 
-        for entity in entities:
-            if entity_list:
-                dst = path.join(self.gen_path, entity_list.name, entity.name)
-            else:
-                dst = path.join(self.gen_path, entity.name)
+        num_workers = min(CONFIG.gen_workers, len(entities))
+        if num_workers <= 1:
+            for entity in entities:
+                self._gen_entity_dir(entity, entity_list)
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="Generate"
+        ) as executor:
+            futures = [
+                executor.submit(self._gen_entity_dir, entity, entity_list)
+                for entity in entities
+            ]
+            _, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+
+        for future in futures:
+            if not future.cancelled() and future.exception():
+                raise future.exception()
+
+    def _gen_entity_dir(self, entity, entity_list=None):
+        """Generate the directory for a single Entity instance
+
+        :param entity: Entity instance
+        :type entity: SmartSimEntity
+        :param entity_list: EntityList instance, defaults to None
+        :type entity_list: EntityList, optional
+        :raises EntityExistsError: if a directory already exists for an
+                                   entity by that name
+        """
+        if entity_list:
+            dst = path.join(self.gen_path, entity_list.name, entity.name)
+        else:
+            dst = path.join(self.gen_path, entity.name)
 
-            if path.isdir(dst):
-                if self.overwrite:
+        previous = None
+        if path.isdir(dst):
+            if self.incremental:
+                previous = _read_gen_manifest(dst)
+                if not previous:
                     shutil.rmtree(dst)
-                else:
-                    error = (
-                        f"Directory for entity {entity.name} "
-                        f"already exists in path {dst}"
-                    )
-                    raise FileExistsError(error)
-            pathlib.Path(dst).mkdir(exist_ok=True)
-            entity.path = dst
+            elif self.overwrite:
+                shutil.rmtree(dst)
+            else:
+                error = (
+                    f"Directory for entity {entity.name} "
+                    f"already exists in path {dst}"
+                )
+                raise FileExistsError(error)
+        pathlib.Path(dst).mkdir(exist_ok=True)
+        entity.path = dst
+
+        if not self.incremental:
             self._copy_entity_files(entity)
             self._link_entity_files(entity)
             self._write_tagged_entity_files(entity)
+            return
+
+        manifest = self._get_gen_manifest(entity, previous)
+        if manifest == previous:
+            logger.debug(f"Directory for entity {entity.name} is up to date")
+            return
+
+        # remove the manifest first, so an interrupted
+        # update is regenerated from scratch next time
+        if previous:
+            os.remove(path.join(dst, GEN_MANIFEST))
+        attached = ("copy", "link", "tagged")
+        if not previous or any(
+            set(previous[files]) != set(manifest[files]) for files in attached
+        ):
+            if previous:
+                shutil.rmtree(dst)
+                pathlib.Path(dst).mkdir()
+            self._copy_entity_files(entity)
+            self._link_entity_files(entity)
+            self._write_tagged_entity_files(entity)
+        else:
+            self._update_entity_files(entity, previous, manifest)
+        _write_gen_manifest(dst, manifest)
+
+    def _update_entity_files(self, entity, previous, manifest):
+        """Copy and write only the attached files of an entity that
+           changed since it was last generated.
+
+        :param entity: SmartSimEntity
+        :type entity: SmartSimEntity
+        :param previous: manifest of the last generation
+        :type previous: dict
+        :param manifest: manifest of this generation
+        :type manifest: dict
+        """
+        for to_copy, entries in manifest["copy"].items():
+            if previous["copy"][to_copy] != entries:
+                self._copy_entity_file(entity, to_copy)
+
+        write_all = any(
+            previous[setting] != manifest[setting]
+            for setting in ("tag", "regex", "params")
+        )
+        for tagged_file, entries in manifest["tagged"].items():
+            if write_all or previous["tagged"][tagged_file] != entries:
+                self._write_tagged_entity_file(entity, tagged_file)
+
+    def _get_gen_manifest(self, entity, previous=None):
+        """Describe what the directory of an entity is generated from
+
+        Attached files are identified by their content hash. Hashes
+        of files that kept their size and modification time since
+        the previous generation are reused.
+
+        :param entity: SmartSimEntity
+        :type entity: SmartSimEntity
+        :param previous: manifest of the last generation, defaults to None
+        :type previous: dict, optional
+        :return: manifest of the entity directory
+        :rtype: dict
+        """
+        files = entity.files
+        params = getattr(entity, "params", {})
+        manifest = {
+            "tag": self._writer.tag,
+            "regex": self._writer.regex,
+            "params": {str(key): str(value) for key, value in params.items()},
+            "copy": {},
+            "link": sorted(files.link) if files else [],
+            "tagged": {},
+        }
+        if files:
+            for attached, sources in (("copy", files.copy), ("tagged", files.tagged)):
+                known = previous[attached] if previous else {}
+                for src in sources:
+                    manifest[attached][src] = self._hash_entries(
+                        src, known.get(src, {})
+                    )
+        return manifest
+
+    def _hash_entries(self, src, known):
+        """Return the size, modification time and content hash
+           of a file or of every file within a directory
+
+        :param src: path to a file or directory
+        :type src: str
+        :param known: entries of the previous generation
+        :type known: dict[str, list]
+        :return: [size, mtime, hash] by file path
+        :rtype: dict[str, list]
+        """
+        if path.isdir(src):
+            file_paths = sorted(
+                path.join(root, filename)
+                for root, _, filenames in os.walk(src)
+                for filename in filenames
+            )
+        else:
+            file_paths = [src]
+
+        entries = {}
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            entry = known.get(file_path, None)
+            if not entry or entry[:2] != [stat.st_size, stat.st_mtime_ns]:
+                entry = [stat.st_size, stat.st_mtime_ns, self._hash_file(file_path)]
+            entries[file_path] = entry
+        return entries
+
+    def _hash_file(self, file_path):
+        """Hash the content of a file once per generation
+
+        :param file_path: path to the file
+        :type file_path: str
+        :return: hex digest of the file content
+        :rtype: str
+        """
+        with self._hash_lock:
+            if file_path in self._hashes:
+                return self._hashes[file_path]
+
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        with self._hash_lock:
+            return self._hashes.setdefault(file_path, digest.hexdigest())
+
+    @staticmethod
+    def _remove_stale_entity_dirs(elist_dir, entities):
+        """Remove generated entity directories of an EntityList
+           that no longer contains the entity.
+
+        Only directories generated by SmartSim are removed.
+
+        :param elist_dir: directory of the EntityList
+        :type elist_dir: str
+        :param entities: entities of the EntityList
+        :type entities: list
+        """
+        names = set(entity.name for entity in entities)
+        for name in os.listdir(elist_dir):
+            entity_dir = path.join(elist_dir, name)
+            if name not in names and path.isfile(path.join(entity_dir, GEN_MANIFEST)):
+                shutil.rmtree(entity_dir)
 
     def _write_tagged_entity_files(self, entity):
         """Read, configure and write the tagged input files for
@@ -209,18 +420,27 @@ class Generator:
         :type entity: SmartSimEntity
         """
         if entity.files:
-            to_write = []
-            for tagged_file in entity.files.tagged:
-                dst_path = path.join(entity.path, path.basename(tagged_file))
-                shutil.copyfile(tagged_file, dst_path)
-                to_write.append(dst_path)
-
-            # write in changes to configurations
             if isinstance(entity, Model):
                 logger.debug(
                     f"Configuring model {entity.name} with params {entity.params}"
                 )
-                self._writer.configure_tagged_model_files(to_write, entity.params)
+            for tagged_file in entity.files.tagged:
+                self._write_tagged_entity_file(entity, tagged_file)
+
+    def _write_tagged_entity_file(self, entity, tagged_file):
+        """Configure and write a single tagged file of an entity
+
+        :param entity: a SmartSimEntity, for now just Models
+        :type entity: SmartSimEntity
+        :param tagged_file: path to the tagged file
+        :type tagged_file: str
+        """
+        dst_path = path.join(entity.path, path.basename(tagged_file))
+        # write in changes to configurations
+        if isinstance(entity, Model):
+            self._writer.write_tagged_file(tagged_file, dst_path, entity.params)
+        else:
+            copy_file(tagged_file, dst_path)
 
     def _copy_entity_files(self, entity):
         """Copy the entity files and directories attached to this entity.
@@ -230,11 +450,22 @@ class Generator:
         """
         if entity.files:
             for to_copy in entity.files.copy:
-                dst_path = path.join(entity.path, path.basename(to_copy))
-                if path.isdir(to_copy):
-                    dir_util.copy_tree(to_copy, entity.path)
-                else:
-                    shutil.copyfile(to_copy, dst_path)
+                self._copy_entity_file(entity, to_copy)
+
+    @staticmethod
+    def _copy_entity_file(entity, to_copy):
+        """Copy a single file or directory attached to this entity.
+
+        :param entity: SmartSimEntity
+        :type entity: SmartSimEntity
+        :param to_copy: path to the file or directory
+        :type to_copy: str
+        """
+        dst_path = path.join(entity.path, path.basename(to_copy))
+        if path.isdir(to_copy):
+            copy_tree(to_copy, entity.path)
+        else:
+            copy_file(to_copy, dst_path)
 
     def _link_entity_files(self, entity):
         """Symlink the entity files attached to this entity.
@@ -246,3 +477,86 @@ class Generator:
             for to_link in entity.files.link:
                 dst_path = path.join(entity.path, path.basename(to_link))
                 symlink(to_link, dst_path)
+
+
+def _read_gen_manifest(entity_dir):
+    """Read the generation manifest of an entity directory
+
+    :param entity_dir: path to the entity directory
+    :type entity_dir: str
+    :return: manifest or None if the directory has none
+    :rtype: dict
+    """
+    try:
+        with open(path.join(entity_dir, GEN_MANIFEST), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_gen_manifest(entity_dir, manifest):
+    """Write the generation manifest of an entity directory
+
+    :param entity_dir: path to the entity directory
+    :type entity_dir: str
+    :param manifest: manifest of the entity directory
+    :type manifest: dict
+    """
+    manifest_path = path.join(entity_dir, GEN_MANIFEST)
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+
+def copy_file(src, dst):
+    """Copy the contents of a file
+
+    ``os.copy_file_range`` is used where available, which lets
+    filesystems that support it share data blocks (reflinks) or
+    copy on the server side instead of streaming the data through
+    this process. Otherwise, the file is copied with ``shutil``.
+
+    :param src: path of the file to copy
+    :type src: str
+    :param dst: path of the copy
+    :type dst: str
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return
+        except OSError as e:
+            # not supported by the kernel or across these filesystems
+            unsupported = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP)
+            if e.errno not in unsupported:
+                raise
+    shutil.copyfile(src, dst)
+
+
+def copy_tree(src, dst):
+    """Copy the contents of a directory into another
+
+    Directories that already exist in ``dst`` are merged and
+    files are overwritten. Files are copied with ``copy_file``
+    and keep their permission bits.
+
+    :param src: path of the directory to copy
+    :type src: str
+    :param dst: path of the directory to copy into
+    :type dst: str
+    """
+    for root, _, files in os.walk(src, followlinks=True):
+        dst_dir = path.join(dst, path.relpath(root, src))
+        os.makedirs(dst_dir, exist_ok=True)
+        for name in files:
+            src_file = path.join(root, name)
+            dst_file = path.join(dst_dir, name)
+            copy_file(src_file, dst_file)
+            shutil.copymode(src_file, dst_file)
@@ -24,7 +24,10 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import io
+import os
 import re
+import threading
 
 from ..error import ParameterWriterError
 from ..utils import get_logger
@@ -35,8 +38,9 @@ logger = get_logger(__name__)
 class ModelWriter:
     def __init__(self):
         self.tag = ";"
-        self.regex = "(;.+;)"
-        self.lines = []
+        self.regex = "(;.+?;)"
+        self._templates = {}  # compiled templates by source file
+        self._lock = threading.Lock()
 
     def set_tag(self, tag, regex=None):
         """Set the tag for the modelwriter to search for within
@@ -46,14 +50,14 @@ class ModelWriter:
                     defaults to semi-colon e.g. ";"
         :type tag: str
         :param regex: full regex for the modelwriter to search for,
-                     defaults to "(;.+;)"
+                     defaults to "(;.+?;)"
         :type regex: str, optional
         """
         if regex:
             self.regex = regex
         else:
             self.tag = tag
-            self.regex = "".join(("(", tag, ".+", tag, ")"))
+            self.regex = "".join(("(", tag, ".+?", tag, ")"))
 
     def configure_tagged_model_files(self, tagged_files, params):
         """Read, write and configure tagged files attached to a Model
@@ -65,76 +69,138 @@ class ModelWriter:
         :type params: dict[str, str]
         """
         for tagged_file in tagged_files:
-            self._set_lines(tagged_file)
-            self._replace_tags(params)
-            self._write_changes(tagged_file)
+            self.write_tagged_file(tagged_file, tagged_file, params)
 
-    def _set_lines(self, file_path):
-        """Set the lines for the modelwrtter to iterate over
+    def write_tagged_file(self, src, dst, params):
+        """Configure a tagged file with model parameters and write it
 
-        :param file_path: path to the newly created and tagged file
+        The tagged file is only read and parsed the first time it is
+        configured, later models render the cached template.
+
+        :param src: path to the tagged file
+        :type src: str
+        :param dst: path to write the configured file to
+        :type dst: str
+        :param params: model parameters
+        :type params: dict[str, str]
+        :raises ParameterWriterError: if the file cannot be read or written
+        """
+        template = self._get_template(src)
+        self._write_changes(dst, self._render(template, params))
+
+    def _get_template(self, file_path):
+        """Return the compiled template of a tagged file
+
+        Templates are cached until the tagged file, tag or
+        regex changes.
+
+        :param file_path: path to the tagged file
         :type file_path: str
-        :raises ParameterWriterError: if the newly created file cannot be read
+        :raises ParameterWriterError: if the tagged file cannot be read
+        :return: literal segments and (tag, line number) slots
+        :rtype: tuple[list[str], list[tuple[str, int]]]
         """
         try:
-            fp = open(file_path, "r+")
-            self.lines = fp.readlines()
-            fp.close()
+            stat = os.stat(file_path)
         except (IOError, OSError) as e:
             raise ParameterWriterError(file_path) from e
 
-    def _write_changes(self, file_path):
+        version = (stat.st_mtime_ns, stat.st_size, self.tag, self.regex)
+        with self._lock:
+            cached_version, template = self._templates.get(file_path, (None, None))
+            if cached_version != version:
+                template = self._compile(self._read_file(file_path))
+                self._templates[file_path] = (version, template)
+        return template
+
+    def _read_file(self, file_path):
+        """Read the content of a tagged file
+
+        :param file_path: path to the tagged file
+        :type file_path: str
+        :raises ParameterWriterError: if the file cannot be read
+        :return: file content
+        :rtype: str
+        """
+        try:
+            with open(file_path, "r") as fp:
+                return fp.read()
+        except (IOError, OSError) as e:
+            raise ParameterWriterError(file_path) from e
+
+    def _write_changes(self, file_path, content):
         """Write the ensemble-specific changes
 
-        :raises ParameterWriterError: if the newly created file cannot be read
+        :param file_path: path to write the configured file to
+        :type file_path: str
+        :param content: configured file content
+        :type content: str
+        :raises ParameterWriterError: if the newly created file cannot be written
         """
         try:
-            fp = open(file_path, "w+")
-            for line in self.lines:
-                fp.write(line)
-            fp.close()
+            with open(file_path, "w") as fp:
+                fp.write(content)
         except (IOError, OSError) as e:
             raise ParameterWriterError(file_path, read=False) from e
 
-    def _replace_tags(self, params):
-        """Replace the tagged within the tagged file attached to this
-           model. The tag defaults to ";"
+    def _compile(self, content):
+        """Split the content of a tagged file into literal segments
+           and tag slots
+
+        There is one more literal segment than there are slots.
+        The regex is matched line by line, so that anchors such as
+        ``^`` and ``$`` in user regexes match at every line.
 
-        :param model: The model instance
-        :type model: Model
+        :param content: content of the tagged file
+        :type content: str
+        :return: literal segments and (tag, line number) slots
+        :rtype: tuple[list[str], list[tuple[str, int]]]
         """
-        edited = []
+        literals = []
+        slots = []
+        start = 0
+        offset = 0
+        for line_number, line in enumerate(io.StringIO(content), 1):
+            for match in re.finditer(self.regex, line):
+                literals.append(content[start : offset + match.start()])
+                slots.append((self._get_prev_value(match.group(0)), line_number))
+                start = offset + match.end()
+            offset += len(line)
+        literals.append(content[start:])
+        return literals, slots
+
+    def _render(self, template, params):
+        """Replace the tags within the template of a tagged file
+           with the model parameters. The tag defaults to ";"
+
+        Tags that are not model parameters are replaced with
+        their tagged value.
+
+        :param template: compiled template of a tagged file
+        :type template: tuple[list[str], list[tuple[str, int]]]
+        :param params: model parameters
+        :type params: dict[str, str]
+        :return: configured file content
+        :rtype: str
+        """
+        literals, slots = template
+        parts = [literals[0]]
         unused_tags = {}
-        for i, line in enumerate(self.lines):
-            search = re.search(self.regex, line)
-            if search:
-                tagged_line = search.group(0)
-                previous_value = self._get_prev_value(tagged_line)
-                if self._is_ensemble_spec(tagged_line, params):
-                    new_val = str(params[previous_value])
-                    new_line = re.sub(self.regex, new_val, line)
-                    edited.append(new_line)
-
-                # if a tag is found but is not in this model's configurations
-                # put in placeholder value
-                else:
-                    tag = tagged_line.split(self.tag)[1]
-                    if tag not in unused_tags:
-                        unused_tags[tag] = []
-                    unused_tags[tag].append(i + 1)
-                    edited.append(re.sub(self.regex, previous_value, line))
+        for literal, (tag, line) in zip(literals[1:], slots):
+            if tag in params:
+                parts.append(str(params[tag]))
+
+            # if a tag is found but is not in this model's configurations
+            # put in placeholder value
             else:
-                edited.append(line)
+                lines = unused_tags.setdefault(tag, [])
+                if line not in lines:
+                    lines.append(line)
+                parts.append(tag)
+            parts.append(literal)
         for tag in unused_tags:
             logger.warning(f"Unused tag {tag} on line(s): {str(unused_tags[tag])}")
-        self.lines = edited
-
-    def _is_ensemble_spec(self, tagged_line, model_params):
-        split_tag = tagged_line.split(self.tag)
-        prev_val = split_tag[1]
-        if prev_val in model_params.keys():
-            return True
-        return False
+        return "".join(parts)
 
     def _get_prev_value(self, tagged_line):
         split_tag = tagged_line.split(self.tag)
@@ -2,5 +2,6 @@ from .cobalt.cobaltLauncher import CobaltLauncher
 from .local.local import LocalLauncher
 from .lsf.lsfLauncher import LSFLauncher
 from .pbs.pbsLauncher import PBSLauncher
+from .pilot.pilotLauncher import PilotLauncher
 from .slurm import slurm
 from .slurm.slurmLauncher import SlurmLauncher
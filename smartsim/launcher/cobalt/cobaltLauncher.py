@@ -24,8 +24,6 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import time
-
 import psutil
 
 from ...constants import STATUS_CANCELLED, STATUS_COMPLETED
@@ -36,7 +34,11 @@ from ..launcher import WLMLauncher
 from ..pbs.pbsCommands import qdel, qstat
 from ..step import AprunStep, CobaltBatchStep, MpirunStep
 from ..stepInfo import CobaltStepInfo
-from .cobaltParser import parse_cobalt_step_id, parse_cobalt_step_status, parse_qsub_out
+from .cobaltParser import (
+    parse_cobalt_step_ids,
+    parse_cobalt_step_statuses,
+    parse_qsub_out,
+)
 
 logger = get_logger(__name__)
 
@@ -101,6 +103,10 @@ class CobaltLauncher(WLMLauncher):
         cmd_list = step.get_launch_cmd()
         step_id = None
         task_id = None
+
+        # limit the rate of submissions when steps are launched concurrently
+        self.submit_limiter.acquire()
+
         if isinstance(step, CobaltBatchStep):
             # wait for batch step to submit successfully
             rc, out, err = self.task_manager.start_and_wait(cmd_list, step.cwd)
@@ -122,7 +128,7 @@ class CobaltLauncher(WLMLauncher):
 
         # if batch submission did not successfully retrieve job ID
         if not step_id and step.managed:
-            step_id = self._get_cobalt_step_id(step)
+            step_id = self.step_id_resolver.resolve(step)
         self.step_mapping.add(step.name, step_id, task_id, step.managed)
         return step_id
 
@@ -136,6 +142,7 @@ class CobaltLauncher(WLMLauncher):
         """
         stepmap = self.step_mapping[step_name]
         if stepmap.managed:
+            self.poll_scheduler.reset(stepmap.step_id, force=True)
             qdel_rc, _, err = qdel([str(stepmap.step_id)])
             if qdel_rc != 0:
                 logger.warning(f"Unable to cancel job step {step_name}\n {err}")
@@ -148,23 +155,18 @@ class CobaltLauncher(WLMLauncher):
         step_info.status = STATUS_CANCELLED  # set status to cancelled instead of failed
         return step_info
 
-    def _get_cobalt_step_id(self, step, interval=4, trials=5):
-        """Get the step_id of a step from qstat (rarely used)
+    def _get_step_ids(self, steps):
+        """Get the step ids of launched steps from one qstat query (rarely used)
 
-        Parses cobalt qstat output by looking for the step name
+        Parses cobalt qstat output by looking for the step names
+
+        :param steps: launched job steps
+        :type steps: list[Step]
+        :return: step ids of the steps found
+        :rtype: dict[str, str]
         """
-        step_id = None
-        while trials > 0:
-            output, _ = qstat(["--header", "JobName:JobId", "-u", self.user])
-            step_id = parse_cobalt_step_id(output, step.name)
-            if step_id:
-                break
-            else:
-                time.sleep(interval)
-                trials -= 1
-        if not step_id:
-            raise LauncherError("Could not find id of launched job step")
-        return step_id
+        output, _ = qstat(["--header", "JobName:JobId", "-u", self.user])
+        return parse_cobalt_step_ids(output, [step.name for step in steps])
 
     def _get_managed_step_update(self, step_ids):
         """Get step updates for WLM managed jobs
@@ -178,9 +180,8 @@ class CobaltLauncher(WLMLauncher):
         args.extend(step_ids)
         qstat_out, _ = qstat(args)
 
-        stats = [
-            parse_cobalt_step_status(qstat_out, str(step_id)) for step_id in step_ids
-        ]
+        statuses = parse_cobalt_step_statuses(qstat_out)
+        stats = [statuses.get(str(step_id), "NOTFOUND") for step_id in step_ids]
         # create CobaltStepInfo objects to return
         updates = []
         for stat, _ in zip(stats, step_ids):
@@ -26,13 +26,32 @@
 
 
 def parse_cobalt_step_status(output, step_id):
-    status = "NOTFOUND"
+    """Parse and return the status of a step from a cobalt qstat command
+
+    :param output: output qstat --header JobId:State
+    :type output: str
+    :param step_id: id of the step to query
+    :type step_id: str
+    :return: status
+    :rtype: str
+    """
+    return parse_cobalt_step_statuses(output).get(step_id, "NOTFOUND")
+
+
+def parse_cobalt_step_statuses(output):
+    """Parse the output of a cobalt qstat command once for all steps
+
+    :param output: output qstat --header JobId:State
+    :type output: str
+    :return: status keyed by exact step id
+    :rtype: dict[str, str]
+    """
+    statuses = {}
     for line in output.split("\n"):
-        if line.strip().startswith(step_id):
-            line = line.split()
-            status = line[1]
-            break
-    return status
+        fields = line.split()
+        if len(fields) >= 2 and fields[0] not in statuses:
+            statuses[fields[0]] = fields[1]
+    return statuses
 
 
 def parse_cobalt_step_id(output, step_name):
@@ -45,13 +64,28 @@ def parse_cobalt_step_id(output, step_name):
     :return: the step_id
     :rtype: str
     """
-    step_id = None
+    return parse_cobalt_step_ids(output, [step_name]).get(step_name, None)
+
+
+def parse_cobalt_step_ids(output, step_names):
+    """Parse and return the ids of many steps from a cobalt qstat command
+
+    :param output: output qstat --header JobName:JobId
+    :type output: str
+    :param step_names: names of the steps to query
+    :type step_names: list[str]
+    :return: step ids of the steps found by name
+    :rtype: dict[str, str]
+    """
+    step_names = set(step_names)
+    step_ids = {}
     for line in output.split("\n"):
-        if line.strip().startswith(step_name):
-            line = line.split()
-            step_id = line[1]
-            break
-    return step_id
+        fields = line.split()
+        if len(fields) >= 2:
+            name = fields[0]
+            if name in step_names and name not in step_ids:
+                step_ids[name] = fields[1]
+    return step_ids
 
 
 def parse_qsub_out(output):
@@ -25,11 +25,19 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import abc
+import time
 
-from ..error import SSUnsupportedError
+from ..config import CONFIG
+from ..error import LauncherError, SSUnsupportedError
+from ..utils import get_logger
+from .pollScheduler import PollScheduler
+from .stepIdResolver import StepIdResolver
 from .stepInfo import UnmanagedStepInfo
 from .stepMapping import StepMapping
 from .taskManager import TaskManager
+from .util.rateLimiter import RateLimiter
+
+logger = get_logger(__name__)
 
 
 class Launcher(abc.ABC):  # pragma: no cover
@@ -64,6 +72,9 @@ class Launcher(abc.ABC):  # pragma: no cover
     def stop(self, step_name):
         raise NotImplementedError
 
+    def create_array_step(self, name, cwd, batch_settings):
+        raise SSUnsupportedError(f"Job arrays not supported for launcher {self}")
+
 
 class WLMLauncher(Launcher):  # cov-wlm
     """The base class for any Launcher that utilizes workload
@@ -75,6 +86,10 @@ class WLMLauncher(Launcher):  # cov-wlm
         super().__init__()
         self.task_manager = TaskManager()
         self.step_mapping = StepMapping()
+        self.poll_scheduler = PollScheduler(CONFIG.jm_interval)
+        self.submit_limiter = RateLimiter(CONFIG.wlm_submit_rate)
+        self.step_id_resolver = StepIdResolver(self._get_step_ids)
+        self.task_manager.on_task_exit(self._expedite_task)
 
     def create_step(self, name, cwd, step_settings):
         raise NotImplementedError
@@ -102,8 +117,8 @@ class WLMLauncher(Launcher):  # cov-wlm
         # this is primarily batch jobs.
         s_names, step_ids = self.step_mapping.get_ids(step_names, managed=True)
         if len(step_ids) > 0:
-            s_statuses = self._get_managed_step_update(step_ids)
-            _updates = [(name, stat) for name, stat in zip(s_names, s_statuses)]
+            s_statuses = self._get_scheduled_step_update(step_ids)
+            _updates = [(name, stat) for name, stat in zip(s_names, s_statuses) if stat]
             updates.extend(_updates)
 
         # get updates of unmanaged jobs (Aprun, mpirun, etc)
@@ -116,6 +131,80 @@ class WLMLauncher(Launcher):  # cov-wlm
 
         return updates
 
+    def _get_scheduled_step_update(self, step_ids):
+        """Get step updates for WLM managed jobs through the poll scheduler
+
+        Only steps that are due according to the poll scheduler are
+        queried through the WLM. The last update received is returned
+        for the others. Failed queries are retried after a backoff.
+
+        :param step_ids: list of job step ids
+        :type step_ids: list[str]
+        :return: list of updates, None for steps never queried
+        :rtype: list[StepInfo]
+        """
+        updates = {}
+        due = self.poll_scheduler.due(step_ids)
+        if len(due) > 0:
+            start = time.time()
+            try:
+                statuses = self._get_managed_step_update(due)
+                self.poll_scheduler.record_query(time.time() - start)
+                for step_id, status in zip(due, statuses):
+                    self.poll_scheduler.update(step_id, status)
+                    updates[step_id] = status
+            except LauncherError as e:
+                self.poll_scheduler.record_query(time.time() - start, failed=True)
+                # explicitly requested updates (e.g. on stop) must not fail silently
+                if self.poll_scheduler.pop_forced(due):
+                    raise
+                logger.debug(f"WLM status query failed, backing off: {e}")
+
+        for step_id in step_ids:
+            if step_id not in updates:
+                updates[step_id] = self.poll_scheduler.cached(step_id)
+        return [updates[step_id] for step_id in step_ids]
+
+    def _expedite_task(self, task_id):
+        """Query the WLM for a managed step once its launching process exits
+
+        :param task_id: id of the exited task
+        :type task_id: str
+        """
+        step_id = self.step_mapping.get_step_id(task_id)
+        if step_id is not None:
+            self.poll_scheduler.reset(step_id)
+
+    def forget_step(self, step_name):
+        """Stop tracking a step that has finished
+
+        :param step_name: name of the step
+        :type step_name: str
+        """
+        stepmap = self.step_mapping.remove(step_name)
+        if stepmap and stepmap.task_id:
+            self.task_manager.remove_task_history(stepmap.task_id)
+
+    def add_array_members(self, array_step, job_id):
+        """Track each task of a launched job array as its own step
+
+        The step of the job array itself is no longer tracked.
+
+        :param array_step: launched job array step
+        :type array_step: Step
+        :param job_id: id of the job array
+        :type job_id: str
+        :return: step name and step id of each member
+        :rtype: list[tuple[str, str]]
+        """
+        self.forget_step(array_step.name)
+        members = []
+        for index, step_name in enumerate(array_step.step_names):
+            step_id = array_step.get_array_step_id(job_id, index)
+            self.step_mapping.add(step_name, step_id, None, True)
+            members.append((step_name, step_id))
+        return members
+
     def _get_unmanaged_step_update(self, task_ids):
         """Get step updates for Popen managed jobs
 
@@ -133,3 +222,13 @@ class WLMLauncher(Launcher):  # cov-wlm
 
     def _get_managed_step_update(self, step_ids):
         pass
+
+    def _get_step_ids(self, steps):
+        """Get the ids of launched steps from the WLM by step name
+
+        :param steps: launched job steps
+        :type steps: list[Step]
+        :return: step ids of the steps found
+        :rtype: dict[str, str]
+        """
+        raise NotImplementedError
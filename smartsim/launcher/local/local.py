@@ -24,7 +24,7 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from ...error import LauncherError
+from ...error import LauncherError, SSUnsupportedError
 from ...settings import RunSettings
 from ...utils import get_logger
 from ..step import LocalStep
@@ -54,6 +54,13 @@ class LocalLauncher:
         step = LocalStep(name, cwd, step_settings)
         return step
 
+    def create_array_step(self, name, cwd, batch_settings):
+        """Job arrays require a workload manager
+
+        :raises SSUnsupportedError: always
+        """
+        raise SSUnsupportedError("Job arrays not supported for launcher local")
+
     def get_step_update(self, step_names):
         """Get status updates of each job step name provided
 
@@ -102,6 +109,16 @@ class LocalLauncher:
         self.step_mapping.add(step.name, task_id=task_id, managed=False)
         return task_id
 
+    def forget_step(self, step_name):
+        """Stop tracking a step that has finished
+
+        :param step_name: name of the step
+        :type step_name: str
+        """
+        stepmap = self.step_mapping.remove(step_name)
+        if stepmap and stepmap.task_id:
+            self.task_manager.remove_task_history(stepmap.task_id)
+
     def stop(self, step_name):
         """Stop a job step
 
@@ -24,19 +24,22 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import time
-
 import psutil
 
 from ...constants import STATUS_CANCELLED, STATUS_COMPLETED
-from ...error import LauncherError, SSConfigError
+from ...error import LauncherError, SSConfigError, SSUnsupportedError
 from ...settings import BsubBatchSettings, JsrunSettings, MpirunSettings
 from ...utils import get_logger
 from ..launcher import WLMLauncher
-from ..step import BsubBatchStep, JsrunStep, MpirunStep
+from ..step import BsubArrayStep, BsubBatchStep, JsrunStep, MpirunStep
 from ..stepInfo import LSFStepInfo
 from .lsfCommands import bjobs, bkill
-from .lsfParser import parse_bjobs_jobid, parse_bsub, parse_step_id_from_bjobs
+from .lsfParser import (
+    parse_bjobs_array_statuses,
+    parse_bjobs_statuses,
+    parse_bsub,
+    parse_step_ids_from_bjobs,
+)
 
 logger = get_logger(__name__)
 
@@ -84,6 +87,25 @@ class LSFLauncher(WLMLauncher):
         except SSConfigError as e:
             raise LauncherError("Job step creation failed: " + str(e)) from None
 
+    def create_array_step(self, name, cwd, batch_settings):
+        """Create a LSF job array step
+
+        Members are added to the step with ``add_to_batch``.
+
+        :param name: name of the entity list to be launched
+        :type name: str
+        :param cwd: path to launch dir
+        :type cwd: str
+        :param batch_settings: batch settings for each member
+        :type batch_settings: BsubBatchSettings
+        :raises SSUnsupportedError: if batch settings type isnt supported
+        :return: step instance
+        :rtype: BsubArrayStep
+        """
+        if not isinstance(batch_settings, BsubBatchSettings):
+            raise SSUnsupportedError("BatchSettings type not supported by LSF arrays")
+        return BsubArrayStep(name, cwd, batch_settings)
+
     def run(self, step):
         """Run a job step through LSF
 
@@ -99,6 +121,10 @@ class LSFLauncher(WLMLauncher):
         cmd_list = step.get_launch_cmd()
         step_id = None
         task_id = None
+
+        # limit the rate of submissions when steps are launched concurrently
+        self.submit_limiter.acquire()
+
         if isinstance(step, BsubBatchStep):
             # wait for batch step to submit successfully
             rc, out, err = self.task_manager.start_and_wait(cmd_list, step.cwd)
@@ -120,11 +146,9 @@ class LSFLauncher(WLMLauncher):
 
         # if batch submission did not successfully retrieve job ID
         if not step_id and step.managed:  # pragma: no cover
-            step_id = self._get_lsf_step_id(step)
+            step_id = self.step_id_resolver.resolve(step)
         self.step_mapping.add(step.name, step_id, task_id, step.managed)
 
-        time.sleep(5)
-
         return step_id
 
     def stop(self, step_name):
@@ -137,6 +161,7 @@ class LSFLauncher(WLMLauncher):
         """
         stepmap = self.step_mapping[step_name]
         if stepmap.managed:
+            self.poll_scheduler.reset(stepmap.step_id, force=True)
             qdel_rc, _, err = bkill([str(stepmap.step_id)])
             if qdel_rc != 0:
                 logger.warning(f"Unable to cancel job step {step_name}\n {err}")
@@ -153,25 +178,19 @@ class LSFLauncher(WLMLauncher):
     # otherwise, this is only reached in a very rare case where a batch
     # job is submitted but no message is receieved
     # We exclude this from coverage
-    def _get_lsf_step_id(self, step, interval=2, trials=5):  # pragma: no cover
-        """Get the step_id of a step from bjobs (rarely used)
+    def _get_step_ids(self, steps):  # pragma: no cover
+        """Get the step ids of launched steps from one bjobs query (rarely used)
+
+        Parses bjobs output by looking for the step names
 
-        Parses bjobs output by looking for the step name
+        :param steps: launched job steps
+        :type steps: list[Step]
+        :return: step ids of the steps found
+        :rtype: dict[str, str]
         """
-        time.sleep(interval)
-        step_id = "unassigned"
-        username = psutil.Process.username()
-        while trials > 0:
-            output, _ = bjobs(["-w", "-u", username])
-            step_id = parse_step_id_from_bjobs(output, step.name)
-            if step_id:
-                break
-            else:
-                time.sleep(interval)
-                trials -= 1
-        if not step_id:
-            raise LauncherError("Could not find id of launched job step")
-        return step_id
+        username = psutil.Process().username()
+        output, _ = bjobs(["-w", "-u", username])
+        return parse_step_ids_from_bjobs(output, [step.name for step in steps])
 
     # TODO: use jslist here if it is a JsrunStep
     def _get_managed_step_update(self, step_ids):
@@ -183,10 +202,20 @@ class LSFLauncher(WLMLauncher):
         :rtype: list[StepInfo]
         """
         updates = []
-        # Include recently finished jobs
-        bjobs_args = ["-a"] + step_ids
-        bjobs_out, _ = bjobs(bjobs_args)
-        stats = [parse_bjobs_jobid(bjobs_out, str(step_id)) for step_id in step_ids]
+        statuses = {}
+        job_ids = [step_id for step_id in step_ids if "[" not in str(step_id)]
+        array_ids = [step_id for step_id in step_ids if "[" in str(step_id)]
+        if job_ids:
+            # Include recently finished jobs
+            bjobs_args = ["-a"] + job_ids
+            bjobs_out, _ = bjobs(bjobs_args)
+            statuses.update(parse_bjobs_statuses(bjobs_out))
+        if array_ids:
+            # elements of an array share the job id in the default output
+            bjobs_args = ["-a", "-noheader", "-o", "jobid stat jobindex"]
+            bjobs_out, _ = bjobs(bjobs_args + array_ids)
+            statuses.update(parse_bjobs_array_statuses(bjobs_out))
+        stats = [statuses.get(str(step_id), "NOTFOUND") for step_id in step_ids]
         # create LSFStepInfo objects to return
 
         for stat, _ in zip(stats, step_ids):
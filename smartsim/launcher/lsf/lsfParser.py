@@ -82,14 +82,41 @@ def parse_bjobs_jobid(output, job_id):
     :return: status
     :rtype: str
     """
-    result = "NOTFOUND"
+    return parse_bjobs_statuses(output).get(job_id, "NOTFOUND")
+
+
+def parse_bjobs_statuses(output):
+    """Parse the output of the bjobs command once for all jobs
+
+    :param output: output of the bjobs command
+    :type output: str
+    :return: status keyed by exact job id
+    :rtype: dict[str, str]
+    """
+    statuses = {}
+    for line in output.split("\n"):
+        fields = line.split()
+        if len(fields) >= 3 and fields[0] not in statuses:
+            statuses[fields[0]] = fields[2]
+    return statuses
+
+
+def parse_bjobs_array_statuses(output):
+    """Parse the statuses of job array elements from bjobs
+
+    :param output: output of bjobs -noheader -o "jobid stat jobindex"
+    :type output: str
+    :return: status keyed by array element id e.g. 1234[5]
+    :rtype: dict[str, str]
+    """
+    statuses = {}
     for line in output.split("\n"):
-        if line.strip().startswith(job_id):
-            line = line.split()
-            stat = line[2]
-            result = stat
-            break
-    return result
+        fields = line.split()
+        if len(fields) >= 3:
+            element_id = f"{fields[0]}[{fields[2]}]"
+            if element_id not in statuses:
+                statuses[element_id] = fields[1]
+    return statuses
 
 
 def parse_bjobs_nodes(output):
@@ -123,13 +150,25 @@ def parse_step_id_from_bjobs(output, step_name):
     :return: the step_id
     :rtype: str
     """
-    step_id = None
+    return parse_step_ids_from_bjobs(output, [step_name]).get(step_name, "")
+
 
+def parse_step_ids_from_bjobs(output, step_names):
+    """Parse and return the ids of many steps from a bjobs -w command
+
+    :param output: output bjobs
+    :type output: str
+    :param step_names: names of the steps to query
+    :type step_names: list[str]
+    :return: step ids of the steps found by name
+    :rtype: dict[str, str]
+    """
+    step_names = set(step_names)
+    step_ids = {}
     for line in output.split("\n"):
         fields = line.split()
-        if len(fields) >= 7:
-            if fields[7] == step_name:
-                step_id = fields[0]
-                return step_id
-
-    return ""
+        if len(fields) >= 8:
+            name = fields[7]
+            if name in step_names and name not in step_ids:
+                step_ids[name] = fields[0]
+    return step_ids
@@ -24,17 +24,15 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import time
-
 from ...constants import STATUS_CANCELLED, STATUS_COMPLETED
-from ...error import LauncherError, SSConfigError
+from ...error import LauncherError, SSConfigError, SSUnsupportedError
 from ...settings import AprunSettings, MpirunSettings, QsubBatchSettings
 from ...utils import get_logger
 from ..launcher import WLMLauncher
-from ..step import AprunStep, MpirunStep, QsubBatchStep
+from ..step import AprunStep, MpirunStep, QsubArrayStep, QsubBatchStep
 from ..stepInfo import PBSStepInfo
 from .pbsCommands import qdel, qstat
-from .pbsParser import parse_qstat_jobid, parse_step_id_from_qstat
+from .pbsParser import parse_qstat_statuses, parse_step_ids_from_qstat
 
 logger = get_logger(__name__)
 
@@ -82,6 +80,27 @@ class PBSLauncher(WLMLauncher):
         except SSConfigError as e:
             raise LauncherError("Job step creation failed: " + str(e)) from None
 
+    def create_array_step(self, name, cwd, batch_settings):
+        """Create a PBSPro job array step
+
+        Members are added to the step with ``add_to_batch``.
+
+        :param name: name of the entity list to be launched
+        :type name: str
+        :param cwd: path to launch dir
+        :type cwd: str
+        :param batch_settings: batch settings for each member
+        :type batch_settings: QsubBatchSettings
+        :raises SSUnsupportedError: if batch settings type isnt supported
+        :return: step instance
+        :rtype: QsubArrayStep
+        """
+        if not isinstance(batch_settings, QsubBatchSettings):
+            raise SSUnsupportedError(
+                "BatchSettings type not supported by PBSPro arrays"
+            )
+        return QsubArrayStep(name, cwd, batch_settings)
+
     def run(self, step):
         """Run a job step through PBSPro
 
@@ -97,6 +116,10 @@ class PBSLauncher(WLMLauncher):
         cmd_list = step.get_launch_cmd()
         step_id = None
         task_id = None
+
+        # limit the rate of submissions when steps are launched concurrently
+        self.submit_limiter.acquire()
+
         if isinstance(step, QsubBatchStep):
             # wait for batch step to submit successfully
             rc, out, err = self.task_manager.start_and_wait(cmd_list, step.cwd)
@@ -116,7 +139,7 @@ class PBSLauncher(WLMLauncher):
 
         # if batch submission did not successfully retrieve job ID
         if not step_id and step.managed:
-            step_id = self._get_pbs_step_id(step)
+            step_id = self.step_id_resolver.resolve(step)
         self.step_mapping.add(step.name, step_id, task_id, step.managed)
 
         return step_id
@@ -131,6 +154,7 @@ class PBSLauncher(WLMLauncher):
         """
         stepmap = self.step_mapping[step_name]
         if stepmap.managed:
+            self.poll_scheduler.reset(stepmap.step_id, force=True)
             qdel_rc, _, err = qdel([str(stepmap.step_id)])
             if qdel_rc != 0:
                 logger.warning(f"Unable to cancel job step {step_name}\n {err}")
@@ -143,25 +167,19 @@ class PBSLauncher(WLMLauncher):
         step_info.status = STATUS_CANCELLED  # set status to cancelled instead of failed
         return step_info
 
-    def _get_pbs_step_id(self, step, interval=2, trials=5):
-        """Get the step_id of a step from qstat (rarely used)
+    def _get_step_ids(self, steps):
+        """Get the step ids of launched steps from one qstat query (rarely used)
 
-        Parses qstat JSON output by looking for the step name
+        Parses qstat JSON output by looking for the step names
         TODO: change this to use ``qstat -a -u user``
+
+        :param steps: launched job steps
+        :type steps: list[Step]
+        :return: step ids of the steps found
+        :rtype: dict[str, str]
         """
-        time.sleep(interval)
-        step_id = "unassigned"
-        while trials > 0:
-            output, _ = qstat(["-f", "-F", "json"])
-            step_id = parse_step_id_from_qstat(output, step.name)
-            if step_id:
-                break
-            else:
-                time.sleep(interval)
-                trials -= 1
-        if not step_id:
-            raise LauncherError("Could not find id of launched job step")
-        return step_id
+        output, _ = qstat(["-f", "-F", "json"])
+        return parse_step_ids_from_qstat(output, [step.name for step in steps])
 
     def _get_managed_step_update(self, step_ids):
         """Get step updates for WLM managed jobs
@@ -173,8 +191,15 @@ class PBSLauncher(WLMLauncher):
         """
         updates = []
 
-        qstat_out, _ = qstat(step_ids)
-        stats = [parse_qstat_jobid(qstat_out, str(step_id)) for step_id in step_ids]
+        qstat_args = list(step_ids)
+        # subjobs of job arrays are only listed with -t
+        if any("[" in str(step_id) for step_id in step_ids):
+            qstat_args = ["-t"] + qstat_args
+        qstat_out, _ = qstat(qstat_args)
+        statuses = parse_qstat_statuses(qstat_out)
+        stats = [
+            statuses.get(str(step_id).split(".")[0], "NOTFOUND") for step_id in step_ids
+        ]
         # create PBSStepInfo objects to return
 
         for stat, _ in zip(stats, step_ids):
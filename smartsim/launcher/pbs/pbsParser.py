@@ -71,14 +71,32 @@ def parse_qstat_jobid(output, job_id):
     :return: status
     :rtype: str
     """
-    result = "NOTFOUND"
+    return parse_qstat_statuses(output).get(_job_number(job_id), "NOTFOUND")
+
+
+def parse_qstat_statuses(output):
+    """Parse the output of the qstat command once for all jobs
+
+    Jobs are keyed by their sequence number (the job id up to
+    the server name) as qstat may truncate long job ids.
+
+    :param output: output of the qstat command
+    :type output: str
+    :return: status keyed by job sequence number
+    :rtype: dict[str, str]
+    """
+    statuses = {}
     for line in output.split("\n"):
-        if line.strip().startswith(job_id):
-            line = line.split()
-            stat = line[4]
-            result = stat
-            break
-    return result
+        fields = line.split()
+        if len(fields) >= 5:
+            job_number = _job_number(fields[0])
+            if job_number not in statuses:
+                statuses[job_number] = fields[4]
+    return statuses
+
+
+def _job_number(job_id):
+    return str(job_id).split(".")[0]
 
 
 def parse_qstat_nodes(output):
@@ -120,18 +138,31 @@ def parse_step_id_from_qstat(output, step_name):
     :return: the step_id
     :rtype: str
     """
-    step_id = None
+    return parse_step_ids_from_qstat(output, [step_name]).get(step_name, None)
+
+
+def parse_step_ids_from_qstat(output, step_names):
+    """Parse and return the ids of many steps from a qstat command
+
+    :param output: output qstat -f -F json
+    :type output: str
+    :param step_names: names of the steps to query
+    :type step_names: list[str]
+    :return: step ids of the steps found by name
+    :rtype: dict[str, str]
+    """
+    step_names = set(step_names)
+    step_ids = {}
     out_json = load_and_clean_json(output)
 
     if "Jobs" not in out_json:
-        return step_id
+        return step_ids
     jobs = out_json["Jobs"]
     for key, val in jobs.items():
-        if val["Job_Name"] == step_name:
-            step_id = key
-            return step_id
-
-    return step_id
+        name = val["Job_Name"]
+        if name in step_names and name not in step_ids:
+            step_ids[name] = key
+    return step_ids
 
 
 def load_and_clean_json(out):
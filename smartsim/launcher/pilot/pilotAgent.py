@@ -0,0 +1,214 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Pilot agent started by the PilotLauncher on each node
+
+The agent connects back to the launcher, starts the tasks it is
+sent and reports their exit. Messages in both directions are
+JSON objects, one per line.
+
+This module only uses the standard library so that it can be
+run as a script on compute nodes without importing SmartSim.
+
+    python pilotAgent.py <host>:<port>
+
+The token the agent registers with is read from SMARTSIM_PILOT_TOKEN.
+"""
+
+import json
+import os
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+# seconds between SIGTERM and SIGKILL of stopped tasks
+KILL_GRACE = 5
+# seconds between polls of tasks that can not be watched with a pidfd
+POLL_INTERVAL = 0.05
+
+
+class PilotAgent:
+    def __init__(self, address, token):
+        """Connect to the launcher and register this agent
+
+        :param address: host:port the launcher listens on
+        :type address: str
+        :param token: token the launcher expects agents to present
+        :type token: str
+        """
+        host, port = address.rsplit(":", 1)
+        self.sock = socket.create_connection((host, int(port)))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.tasks = {}  # task id: Popen
+        self.pidfds = {}  # task id: pidfd
+        self.deadlines = {}  # task id: time to kill a stopped task
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.sock, selectors.EVENT_READ)
+        self._buffer = b""
+        self.send(
+            {
+                "op": "register",
+                "token": token,
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+            }
+        )
+
+    def send(self, message):
+        self.sock.sendall(json.dumps(message).encode() + b"\n")
+
+    def run(self):
+        """Serve the launcher until it disconnects or asks for a shutdown"""
+        try:
+            while True:
+                polled = len(self.tasks) > len(self.pidfds)
+                timeout = POLL_INTERVAL if polled or self.deadlines else None
+                for key, _ in self.selector.select(timeout):
+                    if key.fileobj is self.sock:
+                        if not self._receive():
+                            return
+                    else:
+                        self._reap(key.data)
+                for task_id, proc in list(self.tasks.items()):
+                    if task_id not in self.pidfds and proc.poll() is not None:
+                        self._reap(task_id)
+                self._kill_overdue()
+        finally:
+            self._kill_all()
+
+    def _receive(self):
+        """Handle the messages sent by the launcher
+
+        :return: False if the agent should shut down
+        :rtype: bool
+        """
+        data = self.sock.recv(65536)
+        if not data:
+            return False
+        self._buffer += data
+        while b"\n" in self._buffer:
+            line, self._buffer = self._buffer.split(b"\n", 1)
+            message = json.loads(line)
+            op = message["op"]
+            if op == "start":
+                self._start(message)
+            elif op == "stop":
+                self._stop(message["id"])
+            elif op == "shutdown":
+                return False
+        return True
+
+    def _start(self, message):
+        task_id = message["id"]
+        env = os.environ.copy()
+        env.update(message["env"])
+        try:
+            with open(message["out"], "w") as out, open(message["err"], "w") as err:
+                proc = subprocess.Popen(
+                    message["cmd"],
+                    cwd=message["cwd"],
+                    env=env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=out,
+                    stderr=err,
+                    start_new_session=True,
+                )
+        except (OSError, ValueError) as e:
+            self.send({"op": "error", "id": task_id, "error": str(e)})
+            return
+        self.tasks[task_id] = proc
+        self._watch(task_id, proc)
+        self.send({"op": "started", "id": task_id, "pid": proc.pid})
+
+    def _watch(self, task_id, proc):
+        if not hasattr(os, "pidfd_open"):
+            return
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except OSError:
+            # unsupported by the kernel, the task is polled instead
+            return
+        self.pidfds[task_id] = pidfd
+        self.selector.register(pidfd, selectors.EVENT_READ, task_id)
+
+    def _reap(self, task_id):
+        proc = self.tasks.pop(task_id)
+        returncode = proc.wait()
+        pidfd = self.pidfds.pop(task_id, None)
+        if pidfd is not None:
+            self.selector.unregister(pidfd)
+            os.close(pidfd)
+        self.deadlines.pop(task_id, None)
+        self.send({"op": "exited", "id": task_id, "returncode": returncode})
+
+    def _stop(self, task_id):
+        if task_id in self.tasks and task_id not in self.deadlines:
+            self._signal(self.tasks[task_id], signal.SIGTERM)
+            self.deadlines[task_id] = time.monotonic() + KILL_GRACE
+
+    def _kill_overdue(self):
+        now = time.monotonic()
+        for task_id, deadline in list(self.deadlines.items()):
+            if deadline <= now:
+                self._signal(self.tasks[task_id], signal.SIGKILL)
+                del self.deadlines[task_id]
+
+    def _kill_all(self):
+        for proc in self.tasks.values():
+            self._signal(proc, signal.SIGKILL)
+        for proc in self.tasks.values():
+            proc.wait()
+        self.sock.close()
+
+    @staticmethod
+    def _signal(proc, signum):
+        # tasks lead their own session, signal all of their processes
+        try:
+            os.killpg(proc.pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+def _terminate(signum, frame):
+    raise SystemExit(128 + signum)
+
+
+def main(argv):
+    if len(argv) != 2:
+        sys.stderr.write(f"usage: {argv[0]} <host>:<port>\n")
+        return 2
+    # tasks inherit the environment of the agent, but not the token
+    token = os.environ.pop("SMARTSIM_PILOT_TOKEN", "")
+    signal.signal(signal.SIGTERM, _terminate)
+    PilotAgent(argv[1], token).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
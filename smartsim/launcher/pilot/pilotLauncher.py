@@ -0,0 +1,436 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hmac
+import json
+import os
+import secrets
+import socket
+import sys
+import time
+from itertools import count
+from subprocess import DEVNULL
+from threading import Event, RLock, Thread
+
+import psutil
+
+from ...config import CONFIG
+from ...constants import PILOT_AGENT_TIMEOUT, PILOT_START_TIMEOUT
+from ...error import LauncherError
+from ...utils import get_logger
+from ..local.local import LocalLauncher
+from ..stepInfo import UnmanagedStepInfo
+from . import pilotAgent
+
+logger = get_logger(__name__)
+
+
+class PilotLauncher(LocalLauncher):
+    """Launcher dispatching tasks to pilot agents
+
+    One agent is started on each node of the Slurm allocation
+    SmartSim runs in, or ``CONFIG.pilot_agents`` agents on the
+    local machine outside of an allocation. The agents start
+    tasks with fork/exec and report their exit back, so tasks
+    are launched without a call to the workload manager.
+
+    Agents are started on the first launch and exit with the
+    Python process that started them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._agents = []
+        self._tasks = {}  # task id: PilotTask
+        self._task_ids = count()
+        self._lock = RLock()
+
+    def run(self, step):
+        """Start a local step on the least loaded pilot agent
+
+        :param step: LocalStep instance to run
+        :type step: LocalStep
+        :raises LauncherError: if the agent fails to start the task
+        :return: id of the task
+        :rtype: str
+        """
+        self._lock.acquire()
+        try:
+            if not self._agents:
+                self._start_agents()
+            agent = min(self._agents, key=lambda agent: agent.num_tasks)
+            task_id = f"pilot-{next(self._task_ids)}"
+            task = PilotTask(agent)
+            self._tasks[task_id] = task
+            agent.num_tasks += 1
+        finally:
+            self._lock.release()
+
+        out, err = step.get_output_files()
+        env = step.run_settings.env_vars or {}
+        message = {
+            "op": "start",
+            "id": task_id,
+            "cmd": step.get_launch_cmd(),
+            "cwd": step.cwd,
+            "env": {name: str(value) for name, value in env.items()},
+            "out": out,
+            "err": err,
+        }
+        reply = agent.request(task_id, message)
+        if reply["op"] != "started":
+            self._lock.acquire()
+            try:
+                del self._tasks[task_id]
+                agent.num_tasks -= 1
+            finally:
+                self._lock.release()
+            msg = f"Pilot agent on {agent.host} failed to start {step.name}: "
+            raise LauncherError(msg + reply["error"])
+        self.step_mapping.add(step.name, task_id=task_id, managed=False)
+        return task_id
+
+    def get_step_update(self, step_names):
+        """Get status updates of each job step name provided
+
+        :param step_names: list of step_names
+        :type step_names: list[str]
+        :return: list of tuples for update
+        :rtype: list[(str, UnmanagedStepInfo)]
+        """
+        updates = []
+        s_names, s_ids = self.step_mapping.get_ids(step_names, managed=False)
+        for step_name, step_id in zip(s_names, s_ids):
+            task = self._tasks[step_id]
+            step_info = UnmanagedStepInfo(task.status, task.returncode)
+            updates.append((step_name, step_info))
+        return updates
+
+    def get_step_nodes(self, step_names):
+        """Return the hosts of the agents running each step
+
+        :param step_names: list of step_names
+        :type step_names: list[str]
+        :return: list of hosts for each step
+        :rtype: list[list[str]]
+        """
+        _, s_ids = self.step_mapping.get_ids(step_names, managed=False)
+        return [[self._tasks[step_id].agent.host] for step_id in s_ids]
+
+    def forget_step(self, step_name):
+        """Stop tracking a step that has finished
+
+        :param step_name: name of the step
+        :type step_name: str
+        """
+        stepmap = self.step_mapping.remove(step_name)
+        if stepmap and stepmap.task_id:
+            self._tasks.pop(stepmap.task_id, None)
+
+    def stop(self, step_name):
+        """Stop a job step
+
+        :param step_name: name of the step to be stopped
+        :type step_name: str
+        :return: a UnmanagedStepInfo instance
+        :rtype: UnmanagedStepInfo
+        """
+        task_id = self.step_mapping[step_name].task_id
+        task = self._tasks[task_id]
+        if task.returncode is None:
+            task.cancelled = True
+            task.agent.send({"op": "stop", "id": task_id})
+        return UnmanagedStepInfo("Cancelled", task.returncode)
+
+    def _start_agents(self):
+        """Start the pilot agents and wait for them to connect
+
+        :raises LauncherError: if the agents do not all connect
+                               within PILOT_AGENT_TIMEOUT seconds
+        """
+        if not self.task_manager.actively_monitoring:
+            self.task_manager.start()
+
+        token = secrets.token_hex(16)
+        env = os.environ.copy()
+        env["SMARTSIM_PILOT_TOKEN"] = token
+
+        # agents on other nodes connect through any interface
+        in_allocation = "SLURM_JOB_ID" in os.environ
+        host = socket.gethostname() if in_allocation else "127.0.0.1"
+        # socket.create_server requires Python 3.8
+        server = socket.socket()
+        bootstrap_ids = []
+        try:
+            server.bind(("" if in_allocation else host, 0))
+            server.listen()
+            address = f"{host}:{server.getsockname()[1]}"
+            agent_cmd = [sys.executable, pilotAgent.__file__, address]
+            if in_allocation:
+                num_agents = int(os.environ["SLURM_JOB_NUM_NODES"])
+                cmds = [self._get_srun_cmd(num_agents) + agent_cmd]
+            else:
+                num_agents = CONFIG.pilot_agents
+                cmds = [agent_cmd] * num_agents
+
+            for cmd in cmds:
+                task_id = self.task_manager.start_task(
+                    cmd, os.getcwd(), env=env, out=DEVNULL
+                )
+                bootstrap_ids.append(task_id)
+            self._register_agents(server, token, num_agents, bootstrap_ids)
+        except LauncherError:
+            # agents that did connect are shut down with their bootstrap
+            for agent in self._agents:
+                agent.send({"op": "shutdown"})
+            self._agents = []
+            for task_id in bootstrap_ids:
+                self.task_manager.remove_task(task_id)
+            raise
+        finally:
+            server.close()
+        hosts = ", ".join(agent.host for agent in self._agents)
+        logger.debug(f"Started {num_agents} pilot agents on {hosts}")
+
+    @staticmethod
+    def _get_srun_cmd(num_agents):
+        """Get the srun command starting one agent on each node
+
+        Each agent is given all of the CPUs and memory of its node
+        so that the tasks it starts are not confined to one core.
+        """
+        srun = ["srun", "--job-name", "smartsim-pilot"]
+        srun += ["--nodes", str(num_agents), "--ntasks", str(num_agents)]
+        srun += ["--ntasks-per-node", "1", "--mem", "0"]
+        if "SLURM_CPUS_ON_NODE" in os.environ:
+            srun += ["--cpus-per-task", os.environ["SLURM_CPUS_ON_NODE"]]
+        return srun
+
+    def _register_agents(self, server, token, num_agents, bootstrap_ids):
+        """Accept the connections of the agents
+
+        :param server: socket the agents connect to
+        :type server: socket.socket
+        :param token: token the agents were given
+        :type token: str
+        :param num_agents: number of agents to wait for
+        :type num_agents: int
+        :param bootstrap_ids: ids of the tasks starting the agents
+        :type bootstrap_ids: list[str]
+        :raises LauncherError: if an agent exits or times out
+        """
+        server.settimeout(1)
+        deadline = time.time() + PILOT_AGENT_TIMEOUT
+        while len(self._agents) < num_agents:
+            for task_id in bootstrap_ids:
+                _, rc, _, err = self.task_manager.get_task_update(task_id)
+                if rc is not None:
+                    msg = f"Pilot agent exited with returncode {rc} before connecting"
+                    raise LauncherError(msg + (f": {err}" if err else ""))
+            if time.time() > deadline:
+                msg = f"Only {len(self._agents)} of {num_agents} pilot agents "
+                msg += f"connected within {PILOT_AGENT_TIMEOUT} seconds"
+                raise LauncherError(msg)
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            conn.settimeout(PILOT_AGENT_TIMEOUT)
+            reader = conn.makefile("rb")
+            try:
+                message = json.loads(reader.readline())
+            except (OSError, ValueError):
+                message = {}
+            if not hmac.compare_digest(str(message.get("token", "")), token):
+                logger.warning("Rejected pilot agent connection with a wrong token")
+                reader.close()
+                conn.close()
+                continue
+            conn.settimeout(None)
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            agent = PilotAgentClient(conn, reader, message["host"])
+            self._agents.append(agent)
+            Thread(target=self._listen, args=(agent,), daemon=True).start()
+
+    def _listen(self, agent):
+        """Handle the messages sent by an agent until it disconnects
+
+        :param agent: agent to listen to
+        :type agent: PilotAgentClient
+        """
+        try:
+            for line in agent.reader:
+                message = json.loads(line)
+                if message["op"] == "exited":
+                    self._task_exited(message["id"], message["returncode"])
+                else:
+                    agent.reply(message["id"], message)
+        except OSError:
+            pass
+
+        logger.warning(f"Lost connection to pilot agent on {agent.host}")
+        agent.disconnect()
+        self._lock.acquire()
+        try:
+            lost = [
+                task_id
+                for task_id, task in self._tasks.items()
+                if task.agent is agent and task.returncode is None
+            ]
+        finally:
+            self._lock.release()
+        for task_id in lost:
+            self._task_exited(task_id, -1)
+
+    def _task_exited(self, task_id, returncode):
+        """Record the exit of a task and wake the job manager
+
+        :param task_id: id of the task
+        :type task_id: str
+        :param returncode: returncode of the task
+        :type returncode: int
+        """
+        self._lock.acquire()
+        try:
+            task = self._tasks.get(task_id)
+            if task is None or task.returncode is not None:
+                return
+            task.returncode = returncode
+            task.agent.num_tasks -= 1
+        finally:
+            self._lock.release()
+        self.task_manager._notify_exit(task_id)
+
+    def __str__(self):
+        return "pilot"
+
+
+class PilotTask:
+    def __init__(self, agent):
+        """A task started by a pilot agent
+
+        :param agent: agent running the task
+        :type agent: PilotAgentClient
+        """
+        self.agent = agent
+        self.returncode = None
+        self.cancelled = False
+
+    @property
+    def status(self):
+        if self.returncode is None:
+            return psutil.STATUS_RUNNING
+        if self.cancelled:
+            return "Cancelled"
+        return "Completed" if self.returncode == 0 else "Failed"
+
+
+class PilotAgentClient:
+    def __init__(self, sock, reader, host):
+        """Connection of the launcher to one pilot agent
+
+        :param sock: socket connected to the agent
+        :type sock: socket.socket
+        :param reader: file reading from the socket
+        :type reader: io.BufferedReader
+        :param host: host the agent runs on
+        :type host: str
+        """
+        self.sock = sock
+        self.reader = reader
+        self.host = host
+        self.num_tasks = 0
+        self.connected = True
+        self._lock = RLock()
+        self._replies = {}  # task id: [Event, reply]
+
+    def send(self, message):
+        """Send a message to the agent, if still connected
+
+        :param message: message to send
+        :type message: dict
+        """
+        self._lock.acquire()
+        try:
+            if self.connected:
+                self.sock.sendall(json.dumps(message).encode() + b"\n")
+        except OSError:
+            self.connected = False
+        finally:
+            self._lock.release()
+
+    def request(self, task_id, message):
+        """Send a message to the agent and wait for its reply
+
+        :param task_id: id of the task the message is about
+        :type task_id: str
+        :param message: message to send
+        :type message: dict
+        :return: reply of the agent
+        :rtype: dict
+        """
+        waiter = [Event(), None]
+        self._lock.acquire()
+        try:
+            self._replies[task_id] = waiter
+        finally:
+            self._lock.release()
+        self.send(message)
+        if not self.connected:
+            self.reply(task_id, {"op": "error", "error": "agent disconnected"})
+        if not waiter[0].wait(PILOT_START_TIMEOUT):
+            self.reply(task_id, {"op": "error", "error": "no reply from agent"})
+        return waiter[1]
+
+    def reply(self, task_id, message):
+        """Hand the reply of the agent to the waiting request
+
+        :param task_id: id of the task the reply is about
+        :type task_id: str
+        :param message: reply of the agent
+        :type message: dict
+        """
+        self._lock.acquire()
+        try:
+            waiter = self._replies.pop(task_id, None)
+        finally:
+            self._lock.release()
+        if waiter:
+            waiter[1] = message
+            waiter[0].set()
+
+    def disconnect(self):
+        """Mark the agent as disconnected and fail pending requests"""
+        self._lock.acquire()
+        try:
+            self.connected = False
+            pending = list(self._replies)
+        finally:
+            self._lock.release()
+        for task_id in pending:
+            self.reply(task_id, {"op": "error", "error": "agent disconnected"})
+        self.reader.close()
+        self.sock.close()
@@ -0,0 +1,259 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import time
+from threading import RLock
+
+from ..constants import (
+    STATUS_PAUSED,
+    TERMINAL_STATUSES,
+    WLM_POLL_BACKOFF,
+    WLM_POLL_MAX_INTERVAL,
+    WLM_POLL_MIN_INTERVAL,
+    WLM_SLOW_QUERY,
+)
+
+
+class PollScheduler:
+    """The PollScheduler decides which WLM managed steps are due
+    for a status query so that launchers do not have to query the
+    workload manager for every step on every JobManager tick.
+
+    Each step is polled quickly after launch and after every status
+    transition. While the status stays the same, the interval backs
+    off exponentially up to the JobManager interval for running steps
+    and up to ``max_interval`` for queued (paused) steps.
+
+    Failed or slow WLM queries put every step on hold for an
+    exponentially increasing amount of time. Steps reset with
+    ``force=True`` are due regardless of the hold.
+    """
+
+    def __init__(
+        self,
+        interval,
+        min_interval=WLM_POLL_MIN_INTERVAL,
+        max_interval=WLM_POLL_MAX_INTERVAL,
+        backoff=WLM_POLL_BACKOFF,
+        slow_query=WLM_SLOW_QUERY,
+    ):
+        """Initialize a PollScheduler
+
+        :param interval: max interval between queries of a running step
+        :type interval: float
+        :param min_interval: interval after launch or a status transition
+        :type min_interval: float, optional
+        :param max_interval: max interval between queries of a queued step
+        :type max_interval: float, optional
+        :param backoff: factor to grow intervals by
+        :type backoff: float, optional
+        :param slow_query: WLM query duration considered congested
+        :type slow_query: float, optional
+        """
+        self.interval = interval
+        self.min_interval = min(min_interval, interval)
+        self.max_interval = max(max_interval, interval)
+        self.backoff = backoff
+        self.slow_query = slow_query
+        self._steps = {}  # step_id : StepPoll
+        self._forced = set()  # step_ids to query regardless of hold
+        self._penalty = 0
+        self._hold_until = 0
+        self._lock = RLock()
+
+    def due(self, step_ids, now=None):
+        """Return the step ids that should be queried now
+
+        :param step_ids: ids of the steps being monitored
+        :type step_ids: list[str]
+        :param now: current time, defaults to time.time()
+        :type now: float, optional
+        :return: step ids that are due for a WLM query
+        :rtype: list[str]
+        """
+        now = time.time() if now is None else now
+        self._lock.acquire()
+        try:
+            held = now < self._hold_until
+            due = []
+            for step_id in step_ids:
+                if step_id in self._forced:
+                    due.append(step_id)
+                elif not held:
+                    step_poll = self._steps.get(step_id, None)
+                    if not step_poll or step_poll.next_poll <= now:
+                        due.append(step_id)
+            return due
+        finally:
+            self._lock.release()
+
+    def update(self, step_id, step_info, now=None):
+        """Record the result of a WLM query for a step
+
+        :param step_id: id of the step queried
+        :type step_id: str
+        :param step_info: update received for the step
+        :type step_info: StepInfo
+        :param now: current time, defaults to time.time()
+        :type now: float, optional
+        """
+        now = time.time() if now is None else now
+        self._lock.acquire()
+        try:
+            self._forced.discard(step_id)
+            status = step_info.status
+            # terminal steps are never queried again
+            if status in TERMINAL_STATUSES:
+                self._steps.pop(step_id, None)
+                return
+
+            step_poll = self._steps.get(step_id, None)
+            if not step_poll or step_poll.status != status:
+                interval = self.min_interval
+            else:
+                cap = self.max_interval if status == STATUS_PAUSED else self.interval
+                interval = min(step_poll.interval * self.backoff, cap)
+            self._steps[step_id] = StepPoll(status, interval, now + interval, step_info)
+        finally:
+            self._lock.release()
+
+    def record_query(self, duration, failed=False, now=None):
+        """Record the duration and outcome of a WLM query
+
+        Slow or failed queries hold all steps for an exponentially
+        increasing amount of time. A healthy query clears the hold.
+
+        :param duration: time the WLM query took in seconds
+        :type duration: float
+        :param failed: True if the WLM query failed
+        :type failed: bool, optional
+        :param now: current time, defaults to time.time()
+        :type now: float, optional
+        """
+        now = time.time() if now is None else now
+        self._lock.acquire()
+        try:
+            if failed or duration > self.slow_query:
+                penalty = max(self._penalty * self.backoff, self.min_interval)
+                self._penalty = min(penalty, self.max_interval)
+                self._hold_until = now + self._penalty
+            else:
+                self._penalty = 0
+                self._hold_until = 0
+        finally:
+            self._lock.release()
+
+    def reset(self, step_id, force=False):
+        """Make a step due for a query on the next update
+
+        :param step_id: id of the step
+        :type step_id: str
+        :param force: query even if WLM queries are on hold
+        :type force: bool, optional
+        """
+        self._lock.acquire()
+        try:
+            if step_id in self._steps:
+                self._steps[step_id].next_poll = 0
+            if force:
+                self._forced.add(step_id)
+        finally:
+            self._lock.release()
+
+    def pop_forced(self, step_ids):
+        """Clear forced queries for a set of steps
+
+        :param step_ids: ids of the steps
+        :type step_ids: list[str]
+        :return: True if any of the steps had a forced query
+        :rtype: bool
+        """
+        self._lock.acquire()
+        try:
+            forced = self._forced.intersection(step_ids)
+            self._forced.difference_update(forced)
+            return len(forced) > 0
+        finally:
+            self._lock.release()
+
+    def cached(self, step_id):
+        """Return the last update received for a step
+
+        :param step_id: id of the step
+        :type step_id: str
+        :return: last update or None if the step was never queried
+        :rtype: StepInfo
+        """
+        self._lock.acquire()
+        try:
+            if step_id in self._steps:
+                return self._steps[step_id].step_info
+            return None
+        finally:
+            self._lock.release()
+
+    def next_poll_delay(self, default, now=None):
+        """Return the number of seconds until the next step is due
+
+        :param default: delay returned if no step is scheduled
+        :type default: float
+        :param now: current time, defaults to time.time()
+        :type now: float, optional
+        :return: delay bounded by ``min_interval`` and ``default``
+        :rtype: float
+        """
+        now = time.time() if now is None else now
+        self._lock.acquire()
+        try:
+            if not self._steps:
+                return default
+            next_poll = min([step_poll.next_poll for step_poll in self._steps.values()])
+            next_poll = max(next_poll, self._hold_until)
+            return min(max(next_poll - now, self.min_interval), default)
+        finally:
+            self._lock.release()
+
+    def __len__(self):
+        return len(self._steps)
+
+
+class StepPoll:
+    def __init__(self, status, interval, next_poll, step_info):
+        """Polling state of a single WLM managed step
+
+        :param status: SmartSim status at the last query
+        :type status: str
+        :param interval: current polling interval
+        :type interval: float
+        :param next_poll: time at which the step is due again
+        :type next_poll: float
+        :param step_info: last update received
+        :type step_info: StepInfo
+        """
+        self.status = status
+        self.interval = interval
+        self.next_poll = next_poll
+        self.step_info = step_info
@@ -30,9 +30,14 @@ from ...error import LauncherError
 from ...utils import get_logger
 from ...utils.helpers import init_default
 from ..util.launcherUtil import ComputeNode, Partition
-from .slurmCommands import salloc, scancel, sinfo
+from .slurmCommands import salloc, scancel, sinfo, squeue
 from .slurmLauncher import SlurmLauncher
-from .slurmParser import parse_salloc, parse_salloc_error
+from .slurmParser import (
+    parse_salloc,
+    parse_salloc_error,
+    parse_sinfo_nodes,
+    parse_squeue_alloc,
+)
 
 logger = get_logger(__name__)
 
@@ -119,6 +124,37 @@ def release_allocation(alloc_id):
     logger.info(f"Successfully freed allocation {alloc_id}")
 
 
+def get_allocation_nodes(alloc_id):
+    """Get the CPUs and GPUs of each node of an allocation
+
+    The CPUs of the allocation are assumed to be spread evenly
+    over its nodes, so that nodes shared with other jobs only
+    count the CPUs given to the allocation.
+
+    :param alloc_id: allocation id
+    :type alloc_id: str
+    :raises LauncherError: if the nodes of the allocation are not found
+    :return: number of CPUs and GPUs keyed by hostname
+    :rtype: dict[str, tuple[int, int]]
+    """
+    output, _ = squeue(["--noheader", "--jobs", str(alloc_id), "--format=%N|%C"])
+    alloc = parse_squeue_alloc(output)
+    if not alloc:
+        raise LauncherError(f"Could not find the nodes of allocation {alloc_id}")
+    nodelist, alloc_cpus = alloc
+
+    sinfo_args = ["--noheader", "--Node", f"--nodes={nodelist}", "--format=%N|%c|%G"]
+    output, _ = sinfo(sinfo_args)
+    nodes = parse_sinfo_nodes(output)
+    if not nodes:
+        raise LauncherError(f"Could not find the nodes of allocation {alloc_id}")
+
+    cpus_per_node = alloc_cpus // len(nodes)
+    return {
+        host: (min(cpus, cpus_per_node), gpus) for host, (cpus, gpus) in nodes.items()
+    }
+
+
 def validate(nodes=1, ppn=1, partition=None):
     """Check that there are sufficient resources in the provided Slurm partitions.
 
@@ -81,6 +81,19 @@ def sinfo(args):
     return out, error
 
 
+def squeue(args):
+    """Calls slurm squeue with args
+
+    :param args: List of command arguments
+    :type args: List of str
+    :returns: Output and error of squeue
+    """
+    _squeue = _find_slurm_command("squeue")
+    cmd = [_squeue] + args
+    _, out, error = execute_cmd(cmd)
+    return out, error
+
+
 def scancel(args):
     """Calls slurm scancel with args.
 
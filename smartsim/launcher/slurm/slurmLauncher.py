@@ -24,7 +24,6 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import time
 from shutil import which
 
 from ...constants import STATUS_CANCELLED
@@ -32,10 +31,14 @@ from ...error import LauncherError, SSConfigError, SSUnsupportedError
 from ...settings import MpirunSettings, SbatchSettings, SrunSettings
 from ...utils import get_logger
 from ..launcher import WLMLauncher
-from ..step import MpirunStep, SbatchStep, SrunStep
+from ..step import MpirunStep, SbatchArrayStep, SbatchStep, SrunStep
 from ..stepInfo import SlurmStepInfo
 from .slurmCommands import sacct, scancel, sstat
-from .slurmParser import parse_sacct, parse_sstat_nodes, parse_step_id_from_sacct
+from .slurmParser import (
+    parse_sacct_statuses,
+    parse_sstat_nodes_by_id,
+    parse_step_ids_from_sacct,
+)
 
 logger = get_logger(__name__)
 
@@ -109,14 +112,32 @@ class SlurmLauncher(WLMLauncher):
             raise LauncherError("Failed to retrieve nodelist from stat")
 
         # parse node list for each step
-        node_lists = []
-        for step_id in step_ids:
-            node_lists.append(parse_sstat_nodes(output, step_id))
+        nodes = parse_sstat_nodes_by_id(output)
+        node_lists = [list(nodes.get(step_id, set())) for step_id in step_ids]
 
         if len(node_lists) < 1:
             raise LauncherError("Failed to retrieve nodelist from stat")
         return node_lists
 
+    def create_array_step(self, name, cwd, batch_settings):
+        """Create a Slurm job array step
+
+        Members are added to the step with ``add_to_batch``.
+
+        :param name: name of the entity list to be launched
+        :type name: str
+        :param cwd: path to launch dir
+        :type cwd: str
+        :param batch_settings: batch settings for each member
+        :type batch_settings: SbatchSettings
+        :raises SSUnsupportedError: if batch settings type isnt supported
+        :return: step instance
+        :rtype: SbatchArrayStep
+        """
+        if not isinstance(batch_settings, SbatchSettings):
+            raise SSUnsupportedError("BatchSettings type not supported by Slurm arrays")
+        return SbatchArrayStep(name, cwd, batch_settings)
+
     def run(self, step):
         """Run a job step through Slurm
 
@@ -134,6 +155,9 @@ class SlurmLauncher(WLMLauncher):
         step_id = None
         task_id = None
 
+        # limit the rate of submissions when steps are launched concurrently
+        self.submit_limiter.acquire()
+
         # Launch a batch step with Slurm
         if isinstance(step, SbatchStep):
             # wait for batch step to submit successfully
@@ -158,13 +182,9 @@ class SlurmLauncher(WLMLauncher):
                 )
 
         if not step_id and step.managed:
-            step_id = self._get_slurm_step_id(step)
+            step_id = self.step_id_resolver.resolve(step)
         self.step_mapping.add(step.name, step_id, task_id, step.managed)
 
-        # give slurm a rest
-        # TODO make this configurable
-        time.sleep(1)
-
         return step_id
 
     def stop(self, step_name):
@@ -177,6 +197,7 @@ class SlurmLauncher(WLMLauncher):
         """
         stepmap = self.step_mapping[step_name]
         if stepmap.managed:
+            self.poll_scheduler.reset(stepmap.step_id, force=True)
             scancel_rc, _, err = scancel([str(stepmap.step_id)])
             if scancel_rc != 0:
                 logger.warning(f"Unable to cancel job step {step_name}\n {err}")
@@ -189,30 +210,29 @@ class SlurmLauncher(WLMLauncher):
         step_info.status = STATUS_CANCELLED  # set status to cancelled instead of failed
         return step_info
 
-    def _get_slurm_step_id(self, step, interval=2, trials=5):
-        """Get the step_id of a step from sacct
+    def _get_step_ids(self, steps):
+        """Get the step ids of launched steps from one sacct query
 
-        Parses sacct output by looking for the step name
+        Parses sacct output by looking for the step names
         e.g. the following
 
         SmartSim|119225|
         extern|119225.extern|
         m1-119225.0|119225.0|
         m2-119225.1|119225.1|
+
+        :param steps: launched job steps
+        :type steps: list[Step]
+        :return: step ids of the steps found
+        :rtype: dict[str, str]
         """
-        time.sleep(interval)
-        step_id = "unassigned"
-        while trials > 0:
-            output, _ = sacct(["--noheader", "-p", "--format=jobname,jobid"])
-            step_id = parse_step_id_from_sacct(output, step.name)
-            if step_id:
-                break
-            else:
-                time.sleep(interval)
-                trials -= 1
-        if not step_id:
-            raise LauncherError("Could not find id of launched job step")
-        return step_id
+        sacct_args = ["--noheader", "-p", "--format=jobname,jobid"]
+        # only list the allocations the steps were launched in
+        allocs = set([getattr(step, "alloc", None) for step in steps])
+        if None not in allocs:
+            sacct_args += ["--jobs", ",".join(sorted(allocs))]
+        output, _ = sacct(sacct_args)
+        return parse_step_ids_from_sacct(output, [step.name for step in steps])
 
     def _get_managed_step_update(self, step_ids):
         """Get step updates for WLM managed jobs
@@ -225,7 +245,8 @@ class SlurmLauncher(WLMLauncher):
         step_str = _create_step_id_str(step_ids)
         sacct_out, _ = sacct(["--noheader", "-p", "-b", "--jobs", step_str])
         # (status, returncode)
-        stat_tuples = [parse_sacct(sacct_out, step_id) for step_id in step_ids]
+        statuses = parse_sacct_statuses(sacct_out)
+        stat_tuples = [statuses.get(step_id, ("PENDING", None)) for step_id in step_ids]
 
         # create SlurmStepInfo objects to return
         updates = []
@@ -76,15 +76,28 @@ def parse_sacct(output, job_id):
     :return: status and returncode
     :rtype: tuple
     """
-    result = ("PENDING", None)
+    return parse_sacct_statuses(output).get(job_id, ("PENDING", None))
+
+
+def parse_sacct_statuses(output):
+    """Parse the output of the sacct command once for all jobs
+
+    :param output: output of sacct --noheader -p -b
+    :type output: str
+    :return: (status, returncode) keyed by exact job or step id
+    :rtype: dict[str, tuple]
+    """
+    statuses = {}
     for line in output.split("\n"):
-        if line.strip().startswith(job_id):
-            line = line.split("|")
-            stat = line[1]
-            code = line[2].split(":")[0]
-            result = (stat, code)
-            break
-    return result
+        sacct_string = line.strip().split("|")
+        if len(sacct_string) < 3:
+            continue
+        job_id = sacct_string[0]
+        # first record of an id wins
+        if job_id not in statuses:
+            code = sacct_string[2].split(":")[0]
+            statuses[job_id] = (sacct_string[1], code)
+    return statuses
 
 
 def parse_sstat_nodes(output, job_id):
@@ -95,19 +108,90 @@ def parse_sstat_nodes(output, job_id):
 
     :param output: output of the sstat command
     :type output: str
+    :param job_id: allocation id or job step id
+    :type job_id: str
     :return: compute nodes of the allocation or job
     :rtype: list of str
     """
-    nodes = []
+    return list(parse_sstat_nodes_by_id(output).get(job_id, set()))
+
+
+def parse_sstat_nodes_by_id(output):
+    """Parse the output of the sstat command once for all jobs
+
+    The nodes of each step are also listed under the id
+    of the allocation the step belongs to.
+
+    :param output: output of sstat -i -n -p -a
+    :type output: str
+    :return: compute nodes keyed by exact allocation or step id
+    :rtype: dict[str, set[str]]
+    """
+    nodes = {}
     for line in output.split("\n"):
         sstat_string = line.split("|")
 
         # sometimes there are \n that we need to ignore
         if len(sstat_string) >= 2:
-            if sstat_string[0].startswith(job_id):
-                node = sstat_string[1]
-                nodes.append(node)
-    return list(set(nodes))
+            step_id = sstat_string[0]
+            node = sstat_string[1]
+            nodes.setdefault(step_id, set()).add(node)
+            alloc_id = step_id.split(".")[0]
+            if alloc_id != step_id:
+                nodes.setdefault(alloc_id, set()).add(node)
+    return nodes
+
+
+def parse_squeue_alloc(output):
+    """Parse the nodes and CPUs of an allocation from squeue
+
+    :param output: output of squeue --noheader --format=%N|%C
+    :type output: str
+    :return: compressed node list and number of CPUs, or None
+    :rtype: tuple[str, int]
+    """
+    for line in output.split("\n"):
+        squeue_string = line.strip().split("|")
+        if len(squeue_string) >= 2 and squeue_string[0]:
+            return squeue_string[0], int(squeue_string[1])
+    return None
+
+
+def parse_sinfo_nodes(output):
+    """Parse the CPUs and GPUs of each node listed by sinfo
+
+    Nodes in several partitions are listed once per partition.
+
+    :param output: output of sinfo --noheader --Node --format=%N|%c|%G
+    :type output: str
+    :return: number of CPUs and GPUs keyed by hostname
+    :rtype: dict[str, tuple[int, int]]
+    """
+    nodes = {}
+    for line in output.split("\n"):
+        sinfo_string = line.strip().split("|")
+        if len(sinfo_string) >= 3:
+            host, cpus, gres = sinfo_string[:3]
+            nodes[host] = (int(cpus), parse_gres_gpus(gres))
+    return nodes
+
+
+def parse_gres_gpus(gres):
+    """Parse the number of GPUs from a generic resource string
+
+    e.g. "gpu:4", "gpu:a100:4(S:0-1)" or "(null)"
+
+    :param gres: comma separated generic resources
+    :type gres: str
+    :return: number of GPUs
+    :rtype: int
+    """
+    gpus = 0
+    for resource in gres.split(","):
+        fields = resource.split("(")[0].split(":")
+        if fields[0] == "gpu" and len(fields) > 1 and fields[-1].isdigit():
+            gpus += int(fields[-1])
+    return gpus
 
 
 def parse_step_id_from_sacct(output, step_name):
@@ -121,11 +205,26 @@ def parse_step_id_from_sacct(output, step_name):
     :return: the step_id
     :rtype: str
     """
-    step_id = None
+    return parse_step_ids_from_sacct(output, [step_name]).get(step_name, None)
+
+
+def parse_step_ids_from_sacct(output, step_names):
+    """Parse and return the ids of many steps from a sacct command
+
+    :param output: output of sacct --noheader -p
+                   --format=jobname,jobid --job <alloc>
+    :type output: str
+    :param step_names: names of the steps to query
+    :type step_names: list[str]
+    :return: step ids of the steps found by name
+    :rtype: dict[str, str]
+    """
+    step_names = set(step_names)
+    step_ids = {}
     for line in output.split("\n"):
         sacct_string = line.split("|")
         if len(sacct_string) < 2:
             continue
-        if sacct_string[0] == step_name:
-            step_id = sacct_string[1]
-    return step_id
+        if sacct_string[0] in step_names:
+            step_ids[sacct_string[0]] = sacct_string[1]
+    return step_ids
@@ -1,7 +1,7 @@
 from .alpsStep import AprunStep
 from .cobaltStep import CobaltBatchStep
 from .localStep import LocalStep
-from .lsfStep import BsubBatchStep, JsrunStep
+from .lsfStep import BsubArrayStep, BsubBatchStep, JsrunStep
 from .mpirunStep import MpirunStep
-from .pbsStep import QsubBatchStep
-from .slurmStep import SbatchStep, SrunStep
+from .pbsStep import QsubArrayStep, QsubBatchStep
+from .slurmStep import SbatchArrayStep, SbatchStep, SrunStep
@@ -29,7 +29,7 @@ import time
 
 from ...error import SSConfigError
 from ...utils import get_logger
-from .step import Step
+from .step import Step, get_array_cmd, write_array_index
 
 logger = get_logger(__name__)
 
@@ -105,6 +105,86 @@ class BsubBatchStep(Step):
         return batch_script
 
 
+class BsubArrayStep(BsubBatchStep):
+    def __init__(self, name, cwd, batch_settings):
+        """Initialize a LSF job array step
+
+        Each member added to the step is launched as one element
+        of the array. The batch settings apply to every element.
+
+        :param name: name of the entity to launch
+        :type name: str
+        :param cwd: path to launch dir
+        :type cwd: str
+        :param batch_settings: batch settings for each array element
+        :type batch_settings: BatchSettings
+        """
+        super().__init__(name, cwd, batch_settings)
+        self.step_names = []
+
+    def add_to_batch(self, step):
+        """Add a job step as an element of this array
+
+        :param step: a job step instance e.g. JsrunStep
+        :type step: Step
+        """
+        launch_cmd = ["cd", step.cwd, ";"]
+        launch_cmd += step.get_launch_cmd()
+        self.step_cmds.append(launch_cmd)
+        self.step_names.append(step.name)
+        logger.debug(f"Added step command to job array for {step.name}")
+
+    @staticmethod
+    def get_array_step_id(job_id, index):
+        """Get the id of an element of the array
+
+        LSF array indices start at 1.
+
+        :param job_id: id of the array job
+        :type job_id: str
+        :param index: position of the member in the array
+        :type index: int
+        :return: step id of the array element
+        :rtype: str
+        """
+        return f"{job_id}[{index + 1}]"
+
+    def _write_script(self):
+        """Write the job array script and its index file
+
+        :return: batch script path after writing
+        :rtype: str
+        """
+        batch_script = self.get_step_file(ending=".sh")
+        index_file = self.get_step_file(ending=".array")
+        write_array_index(index_file, self.step_cmds)
+
+        output = self.get_step_file(ending="_%I.out")
+        error = self.get_step_file(ending="_%I.err")
+
+        self.batch_settings._format_alloc_flags()
+
+        opts = self.batch_settings.format_batch_args()
+
+        with open(batch_script, "w") as f:
+            f.write("#!/bin/bash\n\n")
+            if self.batch_settings.walltime:
+                f.write(f"#BSUB -W {self.batch_settings.walltime}\n")
+            if self.batch_settings.project:
+                f.write(f"#BSUB -P {self.batch_settings.project}\n")
+            f.write(f"#BSUB -J {self.name}[1-{len(self.step_cmds)}]\n")
+            f.write(f"#BSUB -o {output}\n")
+            f.write(f"#BSUB -e {error}\n")
+
+            # add additional bsub options
+            for opt in opts:
+                f.write(f"#BSUB {opt}\n")
+
+            f.write("\n")
+            f.write(get_array_cmd(index_file, "LSB_JOBINDEX", first_index=1))
+        return batch_script
+
+
 class JsrunStep(Step):
     def __init__(self, name, cwd, run_settings):
         """Initialize a LSF jsrun job step
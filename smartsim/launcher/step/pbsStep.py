@@ -24,8 +24,9 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+from ...error import SSConfigError
 from ...utils import get_logger
-from .step import Step
+from .step import Step, get_array_cmd, write_array_index
 
 logger = get_logger(__name__)
 
@@ -94,3 +95,83 @@ class QsubBatchStep(Step):
                     f.write("\n")
                     f.write("wait\n")
         return batch_script
+
+
+class QsubArrayStep(QsubBatchStep):
+    def __init__(self, name, cwd, batch_settings):
+        """Initialize a PBSPro job array step
+
+        Each member added to the step is launched as one subjob
+        of the array. The batch settings apply to every subjob.
+
+        :param name: name of the entity to launch
+        :type name: str
+        :param cwd: path to launch dir
+        :type cwd: str
+        :param batch_settings: batch settings for each subjob
+        :type batch_settings: BatchSettings
+        """
+        super().__init__(name, cwd, batch_settings)
+        self.step_names = []
+
+    def add_to_batch(self, step):
+        """Add a job step as a subjob of this array
+
+        :param step: a job step instance e.g. AprunStep
+        :type step: Step
+        """
+        launch_cmd = ["cd", step.cwd, ";"]
+        launch_cmd += step.get_launch_cmd()
+        self.step_cmds.append(launch_cmd)
+        self.step_names.append(step.name)
+        logger.debug(f"Added step command to job array for {step.name}")
+
+    @staticmethod
+    def get_array_step_id(job_id, index):
+        """Get the id of a subjob of the array
+
+        :param job_id: id of the array job e.g. 1234[].server
+        :type job_id: str
+        :param index: position of the member in the array
+        :type index: int
+        :return: step id of the subjob
+        :rtype: str
+        """
+        number, _, server = str(job_id).partition("[]")
+        return f"{number}[{index}]{server}"
+
+    def _write_script(self):
+        """Write the job array script and its index file
+
+        :raises SSConfigError: if the array has less than two members
+        :return: batch script path after writing
+        :rtype: str
+        """
+        # PBSPro rejects arrays with a single subjob
+        if len(self.step_cmds) < 2:
+            raise SSConfigError("PBSPro job arrays require at least two members")
+
+        batch_script = self.get_step_file(ending=".sh")
+        index_file = self.get_step_file(ending=".array")
+        write_array_index(index_file, self.step_cmds)
+
+        output = self.get_step_file(ending="_^array_index^.out")
+        error = self.get_step_file(ending="_^array_index^.err")
+        with open(batch_script, "w") as f:
+            f.write("#!/bin/bash\n\n")
+            f.write(f"#PBS -o {output}\n")
+            f.write(f"#PBS -e {error}\n")
+            f.write(f"#PBS -N {self.name}\n")
+            f.write(f"#PBS -J 0-{len(self.step_cmds) - 1}\n")
+            f.write("#PBS -V \n")
+
+            # add additional qsub options
+            for opt in self.batch_settings.format_batch_args():
+                f.write(f"#PBS {opt}\n")
+
+            for cmd in self.batch_settings._preamble:
+                f.write(f"{cmd}\n")
+
+            f.write("\n")
+            f.write(get_array_cmd(index_file, "PBS_ARRAY_INDEX"))
+        return batch_script
@@ -30,7 +30,7 @@ from itertools import product
 
 from ...error import SSConfigError
 from ...utils import get_logger
-from .step import Step
+from .step import Step, get_array_cmd, write_array_index
 
 logger = get_logger(__name__)
 
@@ -101,6 +101,76 @@ class SbatchStep(Step):
         return batch_script
 
 
+class SbatchArrayStep(SbatchStep):
+    def __init__(self, name, cwd, batch_settings):
+        """Initialize a Slurm job array step
+
+        Each member added to the step is launched as one task
+        of the array. The batch settings apply to every task.
+
+        :param name: name of the entity to launch
+        :type name: str
+        :param cwd: path to launch dir
+        :type cwd: str
+        :param batch_settings: batch settings for each array task
+        :type batch_settings: BatchSettings
+        """
+        super().__init__(name, cwd, batch_settings)
+        self.step_names = []
+
+    def add_to_batch(self, step):
+        """Add a job step as a task of this array
+
+        :param step: a job step instance e.g. SrunStep
+        :type step: Step
+        """
+        super().add_to_batch(step)
+        self.step_names.append(step.name)
+
+    @staticmethod
+    def get_array_step_id(job_id, index):
+        """Get the id of a task of the array
+
+        :param job_id: id of the array job
+        :type job_id: str
+        :param index: position of the member in the array
+        :type index: int
+        :return: step id of the array task
+        :rtype: str
+        """
+        return f"{job_id}_{index}"
+
+    def _write_script(self):
+        """Write the job array script and its index file
+
+        :return: batch script path after writing
+        :rtype: str
+        """
+        batch_script = self.get_step_file(ending=".sh")
+        index_file = self.get_step_file(ending=".array")
+        write_array_index(index_file, self.step_cmds)
+
+        output = self.get_step_file(ending="_%a.out")
+        error = self.get_step_file(ending="_%a.err")
+        with open(batch_script, "w") as f:
+            f.write("#!/bin/bash\n\n")
+            f.write(f"#SBATCH --output={output}\n")
+            f.write(f"#SBATCH --error={error}\n")
+            f.write(f"#SBATCH --job-name={self.name}\n")
+            f.write(f"#SBATCH --array=0-{len(self.step_cmds) - 1}\n")
+
+            # add additional sbatch options
+            for opt in self.batch_settings.format_batch_args():
+                f.write(f"#SBATCH {opt}\n")
+
+            for cmd in self.batch_settings._preamble:
+                f.write(f"{cmd}\n")
+
+            f.write("\n")
+            f.write(get_array_cmd(index_file, "SLURM_ARRAY_TASK_ID"))
+        return batch_script
+
+
 class SrunStep(Step):
     def __init__(self, name, cwd, run_settings):
         """Initialize a srun job step
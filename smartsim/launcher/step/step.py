@@ -55,3 +55,38 @@ class Step:
 
         Used for Batch scripts, mpmd scripts, etc"""
         return osp.join(self.cwd, self.entity_name + ending)
+
+
+def write_array_index(index_file, step_cmds):
+    """Write the launch command of each member of a job array
+
+    The command of the member at position ``i`` of the array is
+    written on line ``i + 1`` of the index file.
+
+    :param index_file: path of the index file
+    :type index_file: str
+    :param step_cmds: launch commands of the members
+    :type step_cmds: list[list[str]]
+    """
+    with open(index_file, "w") as f:
+        for cmd in step_cmds:
+            f.write(f"{' '.join(cmd)}\n")
+
+
+def get_array_cmd(index_file, index_var, first_index=0):
+    """Get the command run by each task of a job array
+
+    The task reads the command of its member from the index
+    file based on the array index set by the workload manager.
+
+    :param index_file: path of the index file
+    :type index_file: str
+    :param index_var: environment variable holding the array index
+    :type index_var: str
+    :param first_index: array index of the first member, defaults to 0
+    :type first_index: int, optional
+    :return: command for the batch script
+    :rtype: str
+    """
+    line = f"$(({index_var} + {1 - first_index}))"
+    return f'eval "$(sed -n "{line}p" {index_file})"\n'
@@ -0,0 +1,125 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Condition
+
+from ..error import LauncherError
+
+
+class StepIdResolver:
+    """Resolve the ids of launched job steps in bulk
+
+    Launchers that cannot glean the id of a step from its
+    submission look it up by step name in the WLM. Steps launched
+    concurrently register with ``resolve``. One caller waits for
+    the WLM to register the steps and then looks up all steps that
+    are pending at once, while the other callers wait for the result.
+    Steps that are not found are looked up again every ``interval``
+    seconds, up to ``trials`` times.
+    """
+
+    def __init__(self, query, interval=2, trials=5):
+        """Initialize a StepIdResolver
+
+        :param query: function that returns the ids of a list of
+                      steps as a dict of step name to step id
+        :type query: callable
+        :param interval: seconds to wait before each lookup
+        :type interval: float, optional
+        :param trials: max number of lookups per step
+        :type trials: int, optional
+        """
+        self._query = query
+        self.interval = interval
+        self.trials = trials
+        self._pending = {}  # step name : [step, trials left]
+        self._resolved = {}  # step name : step id or None
+        self._querying = False
+        self._cond = Condition()
+
+    def resolve(self, step):
+        """Get the id of a launched step from the WLM
+
+        :param step: launched job step
+        :type step: Step
+        :raises LauncherError: if the id of the step is not found
+        :return: step id
+        :rtype: str
+        """
+        self._cond.acquire()
+        try:
+            self._pending[step.name] = [step, self.trials]
+            try:
+                while step.name not in self._resolved:
+                    if self._querying:
+                        self._cond.wait()
+                    else:
+                        self._query_pending()
+            except Exception:
+                self._pending.pop(step.name, None)
+                raise
+            step_id = self._resolved.pop(step.name)
+        finally:
+            self._cond.release()
+
+        if not step_id:
+            raise LauncherError("Could not find id of launched job step")
+        return step_id
+
+    def _query_pending(self):
+        """Look up the ids of all pending steps at once
+
+        Must be called with the lock held. The lock is released
+        while waiting and while the WLM is queried.
+        """
+        self._querying = True
+        try:
+            # nobody notifies while we query, so this only lets
+            # steps launched in the meantime join the lookup
+            self._cond.wait(self.interval)
+            steps = [step for step, _ in self._pending.values()]
+
+            self._cond.release()
+            try:
+                step_ids = self._query(steps)
+            finally:
+                self._cond.acquire()
+
+            for step in steps:
+                entry = self._pending.get(step.name, None)
+                if not entry:
+                    continue
+                if step.name in step_ids:
+                    self._resolved[step.name] = step_ids[step.name]
+                    del self._pending[step.name]
+                else:
+                    entry[1] -= 1
+                    if entry[1] <= 0:
+                        self._resolved[step.name] = None
+                        del self._pending[step.name]
+        finally:
+            self._querying = False
+            self._cond.notify_all()
@@ -25,44 +25,105 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from collections import namedtuple
+from threading import RLock
 
 StepMap = namedtuple("StepMap", ["step_id", "task_id", "managed"])
 
 
 class StepMapping:
+    """Mapping of launched step names to their WLM step ids and task ids
+
+    Secondary indexes from step id and task id to the step name are
+    kept so that reverse lookups cost O(1) per requested id. Entries of
+    finished steps should be removed with ``remove`` so the mapping
+    doesn't grow over the course of long experiments.
+    """
+
     def __init__(self):
         # step_name : wlm_id, pid, wlm_managed?
         self.mapping = {}
+        self._step_id_names = {}  # step_id : step_name
+        self._task_id_names = {}  # task_id : step_name
+        self._lock = RLock()
 
     def __getitem__(self, step_name):
         return self.mapping[step_name]
 
     def __setitem__(self, step_name, step_map):
-        self.mapping[step_name] = step_map
+        self.add(step_name, *step_map)
+
+    def __len__(self):
+        return len(self.mapping)
 
     def add(self, step_name, step_id=None, task_id=None, managed=True):
-        self.mapping[step_name] = StepMap(step_id, task_id, managed)
+        self._lock.acquire()
+        try:
+            self.remove(step_name)
+            self.mapping[step_name] = StepMap(step_id, task_id, managed)
+            if step_id is not None:
+                self._step_id_names[step_id] = step_name
+            if task_id is not None:
+                self._task_id_names[task_id] = step_name
+        finally:
+            self._lock.release()
+
+    def remove(self, step_name):
+        """Remove a step and its index entries
+
+        :param step_name: name of the step to remove
+        :type step_name: str
+        :return: the removed entry or None if not found
+        :rtype: StepMap
+        """
+        self._lock.acquire()
+        try:
+            stepmap = self.mapping.pop(step_name, None)
+            if stepmap:
+                if self._step_id_names.get(stepmap.step_id, None) == step_name:
+                    del self._step_id_names[stepmap.step_id]
+                if self._task_id_names.get(stepmap.task_id, None) == step_name:
+                    del self._task_id_names[stepmap.task_id]
+            return stepmap
+        finally:
+            self._lock.release()
 
     def get_task_id(self, step_id):
         """Get the task id from the step id"""
-        task_id = None
-        for stepmap in self.mapping.values():
-            if stepmap.step_id == step_id:
-                task_id = stepmap.task_id
-                break
-        return task_id
+        self._lock.acquire()
+        try:
+            step_name = self._step_id_names.get(step_id, None)
+            if step_name is None:
+                return None
+            return self.mapping[step_name].task_id
+        finally:
+            self._lock.release()
+
+    def get_step_id(self, task_id):
+        """Get the step id of a managed step from its task id"""
+        self._lock.acquire()
+        try:
+            step_name = self._task_id_names.get(task_id, None)
+            if step_name is None:
+                return None
+            return self.mapping[step_name].step_id
+        finally:
+            self._lock.release()
 
     def get_ids(self, step_names, managed=True):
         ids = []
         names = []
-        for name in step_names:
-            if name in self.mapping:
-                stepmap = self.mapping[name]
-                # do we want task(unmanaged) or step(managed) id?
-                if managed and stepmap.managed:
-                    names.append(name)
-                    ids.append(stepmap.step_id)
-                elif not managed and not stepmap.managed:
-                    names.append(name)
-                    ids.append(stepmap.task_id)
+        self._lock.acquire()
+        try:
+            for name in step_names:
+                if name in self.mapping:
+                    stepmap = self.mapping[name]
+                    # do we want task(unmanaged) or step(managed) id?
+                    if managed and stepmap.managed:
+                        names.append(name)
+                        ids.append(stepmap.step_id)
+                    elif not managed and not stepmap.managed:
+                        names.append(name)
+                        ids.append(stepmap.task_id)
+        finally:
+            self._lock.release()
         return names, ids
@@ -25,13 +25,15 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import os
+import selectors
 import time
+from collections import deque
 from subprocess import PIPE
 from threading import RLock, Thread
 
 import psutil
 
-from ..constants import TM_INTERVAL
+from ..constants import TM_INTERVAL, TM_OUTPUT_BUFFER_SIZE
 from ..error import LauncherError
 from ..utils import get_logger
 from .util.shell import execute_async_cmd, execute_cmd
@@ -50,9 +52,17 @@ class TaskManager:
     the asyncronous shell interface. Each task is a wrapper
     around the Popen/Process instance.
 
-    The Task Managers polls processes on smartsim.constants.TM_INTERVAL
-    and detects job failure and completion. Upon termination, the
-    task returncode, output, and error are added to the task history.
+    Where the platform supports it (Linux 5.3+ with Python 3.9+),
+    the exit of each owned process is watched through a pidfd so
+    that termination is detected as soon as it happens. All other
+    processes are polled on smartsim.constants.TM_INTERVAL. Upon
+    termination, the task returncode, output, and error are added
+    to the task history.
+
+    Output of tasks started with PIPE is read by the monitor thread
+    as it is produced so that tasks never block on a full pipe. Only
+    the last smartsim.constants.TM_OUTPUT_BUFFER_SIZE bytes of each
+    stream are kept.
 
     When a launcher uses the task manager to start a task, the task
     is either managed (by a WLM) or unmanaged (meaning not managed by
@@ -64,17 +74,29 @@ class TaskManager:
         """Initialize a task manager thread."""
         self.actively_monitoring = False
         self.task_history = dict()
-        self.tasks = []
+        self.tasks = dict()  # task_id : Task
+        self._polled = set()  # ids of tasks without a pidfd
+        self._selector = selectors.DefaultSelector()
         self._lock = RLock()
+        self._exit_callbacks = []
 
     def start(self):
         """Start the task manager thread
 
         The TaskManager is run as a daemon thread meaning
-        that it will die when the main thread dies.
+        that it will die when the main thread dies. Calling
+        start while the thread is running is a no-op so that
+        concurrent launches start a single thread.
         """
-        monitor = Thread(name="TaskManager", daemon=True, target=self.run)
-        monitor.start()
+        self._lock.acquire()
+        try:
+            if self.actively_monitoring:
+                return
+            self.actively_monitoring = True
+            monitor = Thread(name="TaskManager", daemon=True, target=self.run)
+            monitor.start()
+        finally:
+            self._lock.release()
 
     def run(self):
         """Start monitoring Tasks"""
@@ -85,20 +107,139 @@ class TaskManager:
 
         self.actively_monitoring = True
         while self.actively_monitoring:
-            time.sleep(TM_INTERVAL)
-
-            for task in self.tasks:
+            for task_id in self._wait_for_exits(TM_INTERVAL):
+                task = self.tasks.get(task_id, None)
+                if task is None:
+                    continue  # removed by another thread
                 returncode = task.check_status()  # poll and set returncode
                 # has to be != None because returncode can be 0
                 if returncode is not None:
                     output, error = task.get_io()
-                    self.add_task_history(task.pid, returncode, output, error)
-                    self.remove_task(task.pid)
+                    self.add_task_history(task_id, returncode, output, error)
+                    self.remove_task(task_id)
+                    self._notify_exit(task_id)
+
+            self._lock.acquire()
+            try:
+                if len(self) == 0:
+                    self.actively_monitoring = False
+                    if verbose_tm:
+                        logger.debug("Sleeping, no tasks to monitor")
+            finally:
+                self._lock.release()
+
+    def _wait_for_exits(self, timeout):
+        """Wait for tasks to exit while reading their output
+
+        Returns the ids of tasks whose pidfd signaled an exit
+        within the timeout, plus all tasks that can only be polled.
+
+        :param timeout: max number of seconds to wait
+        :type timeout: float
+        :return: ids of tasks to check the status of
+        :rtype: list[str]
+        """
+        deadline = time.time() + timeout
+        exited = []
+        while not exited:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            if not self._selector.get_map():
+                time.sleep(remaining)
+                break
+            for key, _ in self._selector.select(remaining):
+                task_id, buffer = key.data
+                if buffer is None:
+                    exited.append(task_id)
+                else:
+                    self._read_output(task_id, buffer)
+
+        self._lock.acquire()
+        try:
+            exited.extend(self._polled)
+        finally:
+            self._lock.release()
+        return exited
+
+    def _read_output(self, task_id, buffer):
+        """Read the available output of a task into its buffer
+
+        :param task_id: id of the task
+        :type task_id: str
+        :param buffer: buffer of the output stream that is ready
+        :type buffer: OutputBuffer
+        """
+        self._lock.acquire()
+        try:
+            # task may have been removed since the select
+            if task_id in self.tasks:
+                buffer.read()
+                if buffer.eof:
+                    self._unregister(buffer.fd)
+        finally:
+            self._lock.release()
 
-            if len(self) == 0:
-                self.actively_monitoring = False
-                if verbose_tm:
-                    logger.debug("Sleeping, no tasks to monitor")
+    def _watch(self, task):
+        """Watch a task for exit through a pidfd or by polling
+        and start reading the output of its pipes
+
+        :param task: task to watch
+        :type task: Task
+        """
+        for buffer in task.buffers:
+            self._selector.register(buffer.fd, selectors.EVENT_READ, (task.pid, buffer))
+        pidfd = task.open_pidfd()
+        if pidfd is None:
+            self._polled.add(task.pid)
+        else:
+            self._selector.register(pidfd, selectors.EVENT_READ, (task.pid, None))
+
+    def _unwatch(self, task):
+        """Stop watching a task for exit and close its pipes
+
+        :param task: task to stop watching
+        :type task: Task
+        """
+        self._polled.discard(task.pid)
+        if task.pidfd is not None:
+            self._selector.unregister(task.pidfd)
+            task.close_pidfd()
+        for buffer in task.buffers:
+            self._unregister(buffer.fd)
+            buffer.close()
+
+    def _unregister(self, fd):
+        if fd in self._selector.get_map():
+            self._selector.unregister(fd)
+
+    def on_task_exit(self, callback):
+        """Register a function to be called when a task exits
+
+        Callbacks are called from the TaskManager thread with the
+        id of the exited task once its returncode, output and error
+        have been recorded in the task history.
+
+        :param callback: function taking a task id
+        :type callback: callable
+        """
+        self._lock.acquire()
+        try:
+            self._exit_callbacks.append(callback)
+        finally:
+            self._lock.release()
+
+    def _notify_exit(self, task_id):
+        """Call all registered exit callbacks for a task
+
+        :param task_id: id of the exited task
+        :type task_id: str
+        """
+        for callback in self._exit_callbacks:
+            try:
+                callback(task_id)
+            except Exception as e:
+                logger.debug(f"Task exit callback failed for {task_id}: {e}")
 
     def start_task(self, cmd_list, cwd, env=None, out=PIPE, err=PIPE):
         """Start a task managed by the TaskManager
@@ -125,8 +266,11 @@ class TaskManager:
             task = Task(proc)
             if verbose_tm:
                 logger.debug(f"Starting Task {task.pid}")
-            self.tasks.append(task)
+            self.tasks[task.pid] = task
+            self._watch(task)
             self.task_history[task.pid] = (None, None, None)
+            # restart monitoring if the thread exited since the launcher checked
+            self.start()
             return task.pid
 
         finally:
@@ -167,7 +311,8 @@ class TaskManager:
         try:
             process = psutil.Process(pid=task_id)
             task = Task(process)
-            self.tasks.append(task)
+            self.tasks[task.pid] = task
+            self._watch(task)
             self.task_history[task.pid] = (None, None, None)
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             raise LauncherError(f"Process provided {task_id} does not exist") from None
@@ -190,7 +335,8 @@ class TaskManager:
                 returncode = task.check_status()
                 out, err = task.get_io()
                 self.add_task_history(task_id, returncode, out, err)
-            self.tasks.remove(task)
+            del self.tasks[task_id]
+            self._unwatch(task)
         except psutil.NoSuchProcess:
             logger.debug("Failed to kill a task during removal")
         except KeyError:
@@ -245,13 +391,23 @@ class TaskManager:
         """
         self.task_history[task_id] = (returncode, out, err)
 
+    def remove_task_history(self, task_id):
+        """Remove the history of a task that is no longer monitored
+
+        :param task_id: id of the task
+        :type task_id: str
+        """
+        self._lock.acquire()
+        try:
+            if task_id not in self.tasks:
+                self.task_history.pop(task_id, None)
+        finally:
+            self._lock.release()
+
     def __getitem__(self, task_id):
         self._lock.acquire()
         try:
-            for task in self.tasks:
-                if task.pid == task_id:
-                    return task
-            raise KeyError
+            return self.tasks[task_id]
         finally:
             self._lock.release()
 
@@ -272,6 +428,14 @@ class Task:
         """
         self.process = process
         self.pid = str(self.process.pid)
+        self.pidfd = None
+        self.out_buffer = None
+        self.err_buffer = None
+        if self.owned:
+            if process.stdout is not None:
+                self.out_buffer = OutputBuffer(process.stdout)
+            if process.stderr is not None:
+                self.err_buffer = OutputBuffer(process.stderr)
 
     def check_status(self):
         """Ping the job and return the returncode if finished
@@ -285,6 +449,28 @@ class Task:
         # have to rely on .kill() to stop.
         return self.returncode
 
+    def open_pidfd(self):
+        """Open a pidfd that becomes readable when the process exits
+
+        :return: file descriptor or None if pidfds are not supported
+        :rtype: int
+        """
+        # only owned processes can be reaped with poll()
+        if not self.owned or not hasattr(os, "pidfd_open"):
+            return None
+        try:
+            self.pidfd = os.pidfd_open(self.process.pid)
+        except OSError:
+            # unsupported by the kernel or process already reaped
+            self.pidfd = None
+        return self.pidfd
+
+    def close_pidfd(self):
+        """Close the pidfd of this task if open"""
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+            self.pidfd = None
+
     def get_io(self):
         """Get the IO from the subprocess
 
@@ -294,11 +480,15 @@ class Task:
         # Process class does not implement communicate
         if not self.owned:
             return None, None
-        output, error = self.process.communicate()
-        if output:
-            output = output.decode("utf-8")
-        if error:
-            error = error.decode("utf-8")
+        # read whatever is left in the pipes without waiting on
+        # children of the task that may still hold them open
+        output, error = None, None
+        if self.out_buffer is not None:
+            self.out_buffer.read()
+            output = self.out_buffer.getvalue()
+        if self.err_buffer is not None:
+            self.err_buffer.read()
+            error = self.err_buffer.getvalue()
         return output, error
 
     def kill(self, timeout=10):
@@ -348,6 +538,10 @@ class Task:
     def wait(self):
         self.process.wait()
 
+    @property
+    def buffers(self):
+        return [b for b in (self.out_buffer, self.err_buffer) if b is not None]
+
     @property
     def returncode(self):
         if self.owned:
@@ -369,3 +563,84 @@ class Task:
         if isinstance(self.process, psutil.Popen):
             return True
         return False
+
+
+class OutputBuffer:
+    """Bounded buffer holding the tail of a task output stream
+
+    Reads from the stream never block and at most ``max_size``
+    bytes are kept. Older output is discarded first.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, stream, max_size=TM_OUTPUT_BUFFER_SIZE):
+        """Initialize an output buffer
+
+        :param stream: pipe of the task to read from
+        :type stream: io.BufferedReader
+        :param max_size: max number of bytes to keep
+        :type max_size: int, optional
+        """
+        self.stream = stream
+        self.fd = stream.fileno()
+        self.max_size = max_size
+        self.eof = False
+        self.discarded = 0  # number of bytes dropped from the buffer
+        self._chunks = deque()
+        self._size = 0
+        os.set_blocking(self.fd, False)
+
+    def read(self):
+        """Read the output currently available in the stream
+
+        :return: True if the end of the stream was reached
+        :rtype: bool
+        """
+        # bounded so a task writing faster than we read can't stall us
+        for _ in range(self.max_size // self.chunk_size + 2):
+            if self.eof:
+                break
+            try:
+                data = os.read(self.fd, self.chunk_size)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                data = b""  # stream was closed
+            if not data:
+                self.eof = True
+            else:
+                self._append(data)
+        return self.eof
+
+    def _append(self, data):
+        self._chunks.append(data)
+        self._size += len(data)
+        while self._size > self.max_size:
+            excess = self._size - self.max_size
+            head = self._chunks[0]
+            if len(head) <= excess:
+                self._chunks.popleft()
+                dropped = len(head)
+            else:
+                self._chunks[0] = head[excess:]
+                dropped = excess
+            self._size -= dropped
+            self.discarded += dropped
+
+    def getvalue(self):
+        """Return the buffered output
+
+        :return: decoded output
+        :rtype: str
+        """
+        # a truncated buffer may start in the middle of a character
+        return b"".join(self._chunks).decode("utf-8", errors="replace")
+
+    def close(self):
+        """Close the stream being read"""
+        self.eof = True
+        self.stream.close()
+
+    def __len__(self):
+        return self._size
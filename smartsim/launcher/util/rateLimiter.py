@@ -0,0 +1,78 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import time
+from threading import Lock
+
+
+class RateLimiter:
+    """Token bucket limiting the rate of requests to a workload manager
+
+    Up to ``burst`` requests are allowed back to back after which
+    callers of ``acquire`` are blocked so that no more than ``rate``
+    requests per second are made on average. The limiter is thread
+    safe so that it can be shared by concurrent launches.
+    """
+
+    def __init__(self, rate, burst=None):
+        """Initialize a RateLimiter
+
+        :param rate: number of requests allowed per second,
+                     values <= 0 disable the limit
+        :type rate: float
+        :param burst: number of requests allowed at once,
+                      defaults to max(rate, 1)
+        :type burst: int, optional
+        """
+        self.rate = rate
+        self.burst = burst if burst else max(rate, 1)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        """Block until a request is allowed
+
+        :return: number of seconds spent waiting
+        :rtype: float
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._lock.acquire()
+        try:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= 1
+            # a negative balance is the debt this caller has to wait out
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        finally:
+            self._lock.release()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
@@ -24,6 +24,8 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import copy
+from collections import ChainMap
 from pprint import pformat
 
 from ..error import SSConfigError
@@ -33,6 +35,13 @@ from ..utils.helpers import expand_exe_path, init_default
 logger = get_logger(__name__)
 
 
+class _SharedDict(ChainMap):
+    """Overlay on a dictionary of shared settings, shown as a dict"""
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
 class RunSettings:
     def __init__(
         self, exe, exe_args=None, run_command="", run_args=None, env_vars=None
@@ -111,6 +120,32 @@ class RunSettings:
                 raise TypeError("Executable arguments should be a list of str")
             self.exe_args.append(arg)
 
+    def _share(self):
+        """Create settings that share the data of these settings
+
+        Used for the members of an ``Ensemble``. The dictionaries of
+        the new settings, e.g. run arguments and environment variables,
+        are overlays on the dictionaries of these settings. Values set
+        on the new settings are only stored in the overlay, and values
+        that are not set are looked up in these settings when a step
+        is created. Lists are copied shallowly, so these settings
+        should not be changed once shared: changes to their
+        dictionaries would be seen by the new settings, but not
+        changes to their lists.
+
+        :return: settings sharing the data of these settings
+        :rtype: RunSettings
+        """
+        shared = copy.copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, ChainMap):
+                setattr(shared, name, _SharedDict({}, *value.maps))
+            elif isinstance(value, dict):
+                setattr(shared, name, _SharedDict({}, value))
+            elif isinstance(value, list):
+                setattr(shared, name, list(value))
+        return shared
+
     def _set_exe_args(self, exe_args):
         if exe_args:
             if isinstance(exe_args, str):
@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+import pytest
+import stub_wlm
+
+
+class Timer:
+    """Wrap a function to record the wall and CPU time of each call
+
+    CPU time is that of the whole benchmark process, including
+    the SmartSim threads working on behalf of the call.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.wall = []
+        self.cpu = []
+
+    def __call__(self, *args, **kwargs):
+        start, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            self.wall.append(time.perf_counter() - start)
+            self.cpu.append(time.process_time() - start_cpu)
+
+    @property
+    def mean_wall(self):
+        return sum(self.wall) / len(self.wall)
+
+    @property
+    def mean_cpu(self):
+        return sum(self.cpu) / len(self.cpu)
+
+
+@pytest.fixture
+def timer():
+    """Wrap benchmarked functions to report their CPU use"""
+    return Timer
+
+
+@pytest.fixture
+def num_jobs():
+    """Number of jobs simulated by each benchmark"""
+    return int(os.environ.get("SMARTSIM_BENCH_JOBS", 1000))
+
+
+@pytest.fixture
+def fake_wlm(tmp_path, monkeypatch):
+    """Put stub WLM commands first on the PATH
+
+    Submission rate limiting is disabled so that the
+    benchmarks measure SmartSim rather than the limiter.
+
+    :return: directory holding the state of the stub WLM
+    """
+    bin_dir = tmp_path / "bin"
+    state_dir = tmp_path / "wlm"
+    bin_dir.mkdir()
+    state_dir.mkdir()
+
+    script = os.path.abspath(stub_wlm.__file__)
+    for command in stub_wlm.COMMANDS:
+        wrapper = bin_dir / command
+        wrapper.write_text(
+            f'#!/bin/sh\nexec "{sys.executable}" -S "{script}" {command} "$@"\n'
+        )
+        wrapper.chmod(0o755)
+
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_WLM_STATE", str(state_dir))
+    monkeypatch.setenv("SMARTSIM_WLM_SUBMIT_RATE", "0")
+    return state_dir
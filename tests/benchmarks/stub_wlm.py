@@ -0,0 +1,218 @@
+"""Stub workload manager commands for the launch benchmarks
+
+The Slurm, PBSPro and LSF commands used by the SmartSim launchers
+are emulated by calling this script with the name of the command
+as the first argument, e.g. ``python stub_wlm.py sbatch job.sh``.
+
+Jobs are recorded in the directory named by ``FAKE_WLM_STATE`` and
+move from queued, to running, to completed based on the time since
+they were submitted. The timings are set through the environment
+
+    FAKE_WLM_LATENCY     seconds each command takes to respond
+    FAKE_WLM_QUEUE_TIME  seconds a job is queued before it runs
+    FAKE_WLM_RUN_TIME    seconds a job runs before it completes
+
+All of which default to 0.
+"""
+
+import fcntl
+import os
+import sys
+import time
+
+COMMANDS = [
+    "sbatch",
+    "sacct",
+    "scancel",
+    "srun",
+    "qsub",
+    "qstat",
+    "qdel",
+    "bsub",
+    "bjobs",
+    "bkill",
+]
+
+QUEUED, RUNNING, COMPLETED, CANCELLED = range(4)
+
+SLURM_STATES = ["PENDING", "RUNNING", "COMPLETED", "CANCELLED"]
+# qstat does not list finished jobs without -x
+PBS_STATES = ["Q", "R", None, None]
+LSF_STATES = ["PEND", "RUN", "DONE", "EXIT"]
+
+
+def _get_time(name):
+    return float(os.environ.get(name, 0))
+
+
+def _state_file(name):
+    return os.path.join(os.environ["FAKE_WLM_STATE"], name)
+
+
+def submit(names, submitted=None):
+    """Record new jobs with the stub WLM
+
+    :param names: names of the jobs
+    :type names: list[str]
+    :param submitted: submission time, defaults to now
+    :type submitted: float, optional
+    :return: ids of the new jobs
+    :rtype: list[str]
+    """
+    if submitted is None:
+        submitted = time.time()
+    with open(_state_file("lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(_state_file("counter")) as f:
+                last_id = int(f.read())
+        except FileNotFoundError:
+            last_id = 0
+        job_ids = [str(last_id + i + 1) for i in range(len(names))]
+        with open(_state_file("counter"), "w") as f:
+            f.write(str(last_id + len(names)))
+        with open(_state_file("jobs"), "a") as f:
+            for job_id, name in zip(job_ids, names):
+                f.write(f"{job_id} {name} {submitted}\n")
+    return job_ids
+
+
+def cancel(job_ids):
+    """Cancel jobs recorded with the stub WLM
+
+    :param job_ids: ids of the jobs
+    :type job_ids: list[str]
+    """
+    with open(_state_file("lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        with open(_state_file("cancelled"), "a") as f:
+            for job_id in job_ids:
+                f.write(f"{job_id}\n")
+
+
+def get_jobs(job_ids=None):
+    """Get the name and state of jobs recorded with the stub WLM
+
+    :param job_ids: ids of the jobs, defaults to all jobs
+    :type job_ids: list[str], optional
+    :return: (job id, name, state) of the jobs found
+    :rtype: list[tuple]
+    """
+    queue_time = _get_time("FAKE_WLM_QUEUE_TIME")
+    run_time = _get_time("FAKE_WLM_RUN_TIME")
+    now = time.time()
+
+    cancelled = set()
+    if os.path.exists(_state_file("cancelled")):
+        with open(_state_file("cancelled")) as f:
+            cancelled = set(f.read().split())
+
+    wanted = set(job_ids) if job_ids is not None else None
+    jobs = []
+    if not os.path.exists(_state_file("jobs")):
+        return jobs
+    with open(_state_file("jobs")) as f:
+        for line in f:
+            job_id, name, submitted = line.split()
+            if wanted is not None and job_id not in wanted:
+                continue
+            elapsed = now - float(submitted)
+            if job_id in cancelled:
+                state = CANCELLED
+            elif elapsed < queue_time:
+                state = QUEUED
+            elif elapsed < queue_time + run_time:
+                state = RUNNING
+            else:
+                state = COMPLETED
+            jobs.append((job_id, name, state))
+    return jobs
+
+
+def format_sacct(jobs):
+    """Format jobs as the output of ``sacct --noheader -p -b``"""
+    lines = []
+    for job_id, _, state in jobs:
+        status = SLURM_STATES[state]
+        lines.append(f"{job_id}|{status}|0:0|")
+        lines.append(f"{job_id}.batch|{status}|0:0|")
+    return "\n".join(lines) + "\n"
+
+
+def format_sacct_names(jobs):
+    """Format jobs as the output of ``sacct --format=jobname,jobid``"""
+    lines = [f"{name}|{job_id}|" for job_id, name, _ in jobs]
+    return "\n".join(lines) + "\n"
+
+
+def format_qstat(jobs):
+    """Format jobs as the output of ``qstat``"""
+    lines = [
+        "Job id            Name             User              Time Use S Queue",
+        "----------------  ---------------- ----------------  -------- - -----",
+    ]
+    for job_id, name, state in jobs:
+        status = PBS_STATES[state]
+        if status:
+            job = f"{job_id}.pbs"
+            lines.append(f"{job:<17} {name[:16]:<16} user  00:00:00 {status} workq")
+    return "\n".join(lines) + "\n"
+
+
+def format_bjobs(jobs):
+    """Format jobs as the output of ``bjobs -a``"""
+    lines = ["JOBID   USER    STAT  QUEUE      FROM_HOST   JOB_NAME"]
+    for job_id, name, state in jobs:
+        status = LSF_STATES[state]
+        lines.append(f"{job_id:<7} user    {status:<5} normal     login1  {name}")
+    return "\n".join(lines) + "\n"
+
+
+def _get_job_name(args):
+    for arg in args:
+        if arg.startswith("--job-name="):
+            return arg.split("=", 1)[1]
+    if "--job-name" in args:
+        return args[args.index("--job-name") + 1]
+    # batch jobs are named after their script
+    return os.path.splitext(os.path.basename(args[-1]))[0]
+
+
+def main(command, args):
+    time.sleep(_get_time("FAKE_WLM_LATENCY"))
+
+    if command == "sbatch":
+        print(submit([_get_job_name(args)])[0])
+    elif command == "qsub":
+        print(submit([_get_job_name(args)])[0] + ".pbs")
+    elif command == "bsub":
+        job_id = submit([_get_job_name(args)])[0]
+        print(f"Job <{job_id}> is submitted to queue <normal>.")
+    elif command == "srun":
+        submit([_get_job_name(args)])
+        time.sleep(_get_time("FAKE_WLM_QUEUE_TIME") + _get_time("FAKE_WLM_RUN_TIME"))
+    elif command == "sacct":
+        job_ids = None
+        if "--jobs" in args:
+            job_ids = args[args.index("--jobs") + 1].split(",")
+        jobs = get_jobs(job_ids)
+        if "--format=jobname,jobid" in args:
+            sys.stdout.write(format_sacct_names(jobs))
+        else:
+            sys.stdout.write(format_sacct(jobs))
+    elif command == "qstat":
+        job_ids = [arg.split(".")[0] for arg in args if not arg.startswith("-")]
+        sys.stdout.write(format_qstat(get_jobs(job_ids or None)))
+    elif command == "bjobs":
+        job_ids = [arg for arg in args if not arg.startswith("-")]
+        sys.stdout.write(format_bjobs(get_jobs(job_ids or None)))
+    elif command in ("scancel", "qdel", "bkill"):
+        cancel([arg.split(".")[0] for arg in args if not arg.startswith("-")])
+    else:
+        sys.stderr.write(f"{command}: not supported by the stub WLM\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1], sys.argv[2:]))
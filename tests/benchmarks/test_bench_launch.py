@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from smartsim import Experiment
+from smartsim.settings import (
+    AprunSettings,
+    BsubBatchSettings,
+    JsrunSettings,
+    QsubBatchSettings,
+    SbatchSettings,
+    SrunSettings,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+
+def get_settings(launcher):
+    """Run and batch settings of a batch job for each launcher"""
+    if launcher == "slurm":
+        return SrunSettings("echo"), SbatchSettings(nodes=1, time="01:00:00")
+    if launcher == "pbs":
+        return AprunSettings("echo"), QsubBatchSettings(nodes=1, time="01:00:00")
+    return JsrunSettings("echo"), BsubBatchSettings(nodes=1, time="01:00")
+
+
+def wait_for_completion(exp, entities, timeout=120):
+    """Let the job manager of a previous round finish its work"""
+    # batch ensembles are tracked as one job, not by member
+    job_manager = exp._control._jobs
+    start = time.time()
+    while not all(job_manager.is_finished(entity) for entity in entities):
+        assert time.time() - start < timeout
+        time.sleep(0.1)
+
+
+@pytest.mark.parametrize("launcher", ["slurm", "pbs", "lsf"])
+def test_batch_launch_rate(
+    benchmark, timer, fake_wlm, monkeypatch, num_jobs, launcher, tmp_path
+):
+    """Submission of many batch jobs through Experiment.start
+
+    Each job is an ensemble of one model launched as a batch.
+    """
+    # jobs launched after a tick are first polled on the next one
+    monkeypatch.setenv("SMARTSIM_JM_INTERVAL", "1")
+    rounds = []
+
+    def create_batches():
+        if rounds:
+            wait_for_completion(*rounds[-1])
+        path = tmp_path / f"round_{len(rounds)}"
+        path.mkdir()
+        exp = Experiment(f"bench-{launcher}", exp_path=str(path), launcher=launcher)
+        batches = []
+        for i in range(num_jobs):
+            run_settings, batch_settings = get_settings(launcher)
+            batch = exp.create_ensemble(
+                f"batch_{i}",
+                batch_settings=batch_settings,
+                run_settings=run_settings,
+                replicas=1,
+            )
+            batch.set_path(str(path))
+            batches.append(batch)
+        rounds.append((exp, batches))
+        return (exp, batches), {}
+
+    def launch(exp, batches):
+        exp.start(*batches, block=False)
+
+    start = timer(launch)
+    benchmark.pedantic(start, setup=create_batches, rounds=3)
+    benchmark.extra_info["launch_rate"] = num_jobs / start.mean_wall
+    benchmark.extra_info["cpu_per_launch"] = start.mean_cpu / num_jobs
+
+    wait_for_completion(*rounds[-1])
@@ -0,0 +1,109 @@
+import time
+from subprocess import DEVNULL
+from threading import Event, RLock
+
+import pytest
+import stub_wlm
+
+from smartsim.control.jobmanager import JobManager
+from smartsim.entity import Model
+from smartsim.launcher import LSFLauncher, PBSLauncher, SlurmLauncher
+from smartsim.launcher.taskManager import TaskManager
+from smartsim.settings import RunSettings
+
+pytest.importorskip("pytest_benchmark")
+
+LAUNCHERS = {"slurm": SlurmLauncher, "pbs": PBSLauncher, "lsf": LSFLauncher}
+
+
+def add_jobs(jm, num_jobs):
+    """Add managed jobs that stay running or queued in the stub WLM
+
+    :return: ids of the jobs
+    :rtype: list[str]
+    """
+    names = [f"model_{i}" for i in range(num_jobs)]
+    half = num_jobs // 2
+    now = time.time()
+    job_ids = stub_wlm.submit(names[:half], submitted=now - 120)
+    job_ids += stub_wlm.submit(names[half:], submitted=now)
+    for name, job_id in zip(names, job_ids):
+        jm._launcher.step_mapping.add(name, job_id, None, True)
+        jm.add_job(name, job_id, Model(name, {}, "./", RunSettings("python")))
+    return job_ids
+
+
+@pytest.fixture
+def job_manager(fake_wlm, monkeypatch, request):
+    monkeypatch.setenv("FAKE_WLM_QUEUE_TIME", "60")
+    monkeypatch.setenv("FAKE_WLM_RUN_TIME", "3600")
+    jm = JobManager(RLock())
+    jm.set_launcher(LAUNCHERS[request.param]())
+    return jm
+
+
+@pytest.mark.parametrize("job_manager", LAUNCHERS, indirect=True)
+def test_check_jobs_tick(benchmark, timer, job_manager, num_jobs):
+    """Status update of all jobs through one WLM query"""
+    job_ids = add_jobs(job_manager, num_jobs)
+    scheduler = job_manager._launcher.poll_scheduler
+
+    def make_due():
+        for job_id in job_ids:
+            scheduler.reset(job_id, force=True)
+
+    tick = timer(job_manager.check_jobs)
+    benchmark.pedantic(tick, setup=make_due, rounds=5)
+    benchmark.extra_info["cpu_per_tick"] = tick.mean_cpu
+    benchmark.extra_info["jobs_per_second"] = num_jobs / tick.mean_wall
+
+    statuses = [job.status for job in job_manager.jobs.values()]
+    assert len(statuses) == num_jobs
+    assert len(set(statuses)) == 2  # running and queued
+
+
+@pytest.mark.parametrize("job_manager", ["slurm"], indirect=True)
+def test_check_jobs_idle_tick(benchmark, timer, job_manager, num_jobs):
+    """Tick of the job manager when no job is due for a query"""
+    add_jobs(job_manager, num_jobs)
+    job_manager.check_jobs()
+
+    tick = timer(job_manager.check_jobs)
+    benchmark(tick)
+    benchmark.extra_info["cpu_per_tick"] = tick.mean_cpu
+
+
+def test_task_exits(benchmark, timer, num_jobs, tmp_path):
+    """Detection of the exit of local tasks by the TaskManager
+
+    Each task is a real process, so fewer are started than
+    there are jobs in the other benchmarks.
+    """
+    num_tasks = max(num_jobs // 20, 1)
+    latencies = []
+
+    def run_tasks():
+        task_manager = TaskManager()
+        started = {}
+        exited = {}
+        done = Event()
+
+        def on_exit(task_id):
+            exited[task_id] = time.perf_counter()
+            if len(exited) == num_tasks:
+                done.set()
+
+        task_manager.on_task_exit(on_exit)
+        for _ in range(num_tasks):
+            task_id = task_manager.start_task(
+                ["true"], str(tmp_path), out=DEVNULL, err=DEVNULL
+            )
+            started.setdefault(task_id, time.perf_counter())
+        assert done.wait(60)
+        for task_id, exit_time in exited.items():
+            latencies.append(max(exit_time - started[task_id], 0))
+
+    run = timer(run_tasks)
+    benchmark.pedantic(run, rounds=3)
+    benchmark.extra_info["cpu_per_task"] = run.mean_cpu / num_tasks
+    benchmark.extra_info["exit_latency"] = sum(latencies) / len(latencies)
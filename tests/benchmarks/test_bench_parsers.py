@@ -0,0 +1,44 @@
+import pytest
+import stub_wlm
+
+from smartsim.launcher.lsf.lsfParser import parse_bjobs_statuses
+from smartsim.launcher.pbs.pbsParser import parse_qstat_statuses
+from smartsim.launcher.slurm.slurmParser import (
+    parse_sacct_statuses,
+    parse_step_ids_from_sacct,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+
+def get_jobs(num_jobs):
+    """Jobs spread over the queued, running and completed states"""
+    return [(str(job_id), f"model_{job_id}", job_id % 3) for job_id in range(num_jobs)]
+
+
+def test_parse_sacct_statuses(benchmark, num_jobs):
+    output = stub_wlm.format_sacct(get_jobs(num_jobs))
+    statuses = benchmark(parse_sacct_statuses, output)
+    assert len(statuses) == 2 * num_jobs
+
+
+def test_parse_step_ids_from_sacct(benchmark, num_jobs):
+    jobs = get_jobs(num_jobs)
+    output = stub_wlm.format_sacct_names(jobs)
+    names = [name for _, name, _ in jobs]
+    step_ids = benchmark(parse_step_ids_from_sacct, output, names)
+    assert len(step_ids) == num_jobs
+
+
+def test_parse_qstat_statuses(benchmark, num_jobs):
+    output = stub_wlm.format_qstat(get_jobs(num_jobs))
+    statuses = benchmark(parse_qstat_statuses, output)
+    # completed jobs are not listed by qstat
+    assert statuses["0"] == "Q" and statuses["1"] == "R"
+    assert "2" not in statuses
+
+
+def test_parse_bjobs_statuses(benchmark, num_jobs):
+    output = stub_wlm.format_bjobs(get_jobs(num_jobs))
+    statuses = benchmark(parse_bjobs_statuses, output)
+    assert [statuses[str(job_id)] for job_id in range(3)] == ["PEND", "RUN", "DONE"]
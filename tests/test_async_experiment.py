@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from smartsim import Experiment, constants
+from smartsim.error import SmartSimError
+from smartsim.settings import RunSettings
+
+
+def make_model(exp, fileutils, test_dir, name, time=0):
+    script = fileutils.get_test_conf_path("sleep.py")
+    settings = RunSettings("python", f"{script} --time={time}")
+    return exp.create_model(name, path=test_dir, run_settings=settings)
+
+
+def test_start_async(fileutils):
+    exp_name = "test_start_async"
+    exp = Experiment(exp_name, launcher="local")
+    test_dir = fileutils.make_test_dir(exp_name)
+    model = make_model(exp, fileutils, test_dir, "m1")
+
+    asyncio.run(exp.start_async(model))
+    assert exp.get_status(model)[0] == constants.STATUS_COMPLETED
+
+
+def test_wait(fileutils):
+    exp_name = "test_async_wait"
+    exp = Experiment(exp_name, launcher="local")
+    test_dir = fileutils.make_test_dir(exp_name)
+    models = [make_model(exp, fileutils, test_dir, f"m{i}", time=1) for i in range(2)]
+
+    async def run():
+        await exp.start_async(*models, block=False)
+        assert not any(exp.finished(model) for model in models)
+        return await exp.wait(*models)
+
+    statuses = asyncio.run(run())
+    assert statuses == [constants.STATUS_COMPLETED] * 2
+
+    # finished jobs are returned without waiting
+    statuses = asyncio.run(exp.wait(*models))
+    assert statuses == [constants.STATUS_COMPLETED] * 2
+
+
+def test_stop_async(fileutils):
+    exp_name = "test_stop_async"
+    exp = Experiment(exp_name, launcher="local")
+    test_dir = fileutils.make_test_dir(exp_name)
+    model = make_model(exp, fileutils, test_dir, "m1", time=10)
+
+    async def run():
+        await exp.start_async(model, block=False)
+        waiter = asyncio.ensure_future(exp.wait(model))
+        await exp.stop_async(model)
+        return await asyncio.wait_for(waiter, 10)
+
+    assert asyncio.run(run()) == [constants.STATUS_CANCELLED]
+
+
+def test_status_stream(fileutils):
+    exp_name = "test_status_stream"
+    exp = Experiment(exp_name, launcher="local")
+    test_dir = fileutils.make_test_dir(exp_name)
+    script = fileutils.get_test_conf_path("sleep.py")
+    settings = RunSettings("python", f"{script} --time=1")
+    ensemble = exp.create_ensemble("stream", run_settings=settings, replicas=2)
+    ensemble.set_path(test_dir)
+
+    async def run():
+        updates = []
+        await exp.start_async(ensemble, block=False)
+        async for update in exp.status_stream(ensemble):
+            updates.append(update)
+        return updates
+
+    updates = asyncio.run(run())
+    final = {u.entity.name: u.status for u in updates}
+    assert final == {
+        "stream_0": constants.STATUS_COMPLETED,
+        "stream_1": constants.STATUS_COMPLETED,
+    }
+    for update in updates:
+        assert update.old_status != update.status
+        if update.status == constants.STATUS_COMPLETED:
+            assert update.returncode == 0
+
+
+def test_wait_not_launched():
+    exp = Experiment("test_async_not_launched", launcher="local")
+    model = exp.create_model("m1", path="./", run_settings=RunSettings("echo"))
+    with pytest.raises(SmartSimError):
+        asyncio.run(exp.wait(model))
@@ -74,3 +74,32 @@ def test_launcher_log_interval_attributes():
     ):  # set environ key-val pairs back to their original state
         if environ_vals[i]:
             os.environ[environ_keys[i]] = environ_vals[i]
+
+
+def test_launch_workers(monkeypatch):
+    config = Config()
+    monkeypatch.setenv("SMARTSIM_LAUNCH_WORKERS", "4")
+    assert config.launch_workers == 4
+    monkeypatch.setenv("SMARTSIM_LAUNCH_WORKERS", "0")
+    with pytest.raises(SSConfigError):
+        config.launch_workers
+
+
+def test_pilot_agents(monkeypatch):
+    config = Config()
+    monkeypatch.setenv("SMARTSIM_PILOT_AGENTS", "2")
+    assert config.pilot_agents == 2
+    for num_agents in ("0", "-1"):
+        monkeypatch.setenv("SMARTSIM_PILOT_AGENTS", num_agents)
+        with pytest.raises(SSConfigError):
+            config.pilot_agents
+
+
+def test_gen_workers(monkeypatch):
+    config = Config()
+    monkeypatch.setenv("SMARTSIM_GEN_WORKERS", "1")
+    assert config.gen_workers == 1
+    for num_workers in ("0", "-4"):
+        monkeypatch.setenv("SMARTSIM_GEN_WORKERS", num_workers)
+        with pytest.raises(SSConfigError):
+            config.gen_workers
@@ -3,8 +3,12 @@ import pytest
 from smartsim.control import Controller, Manifest
 from smartsim.database import Orchestrator, PBSOrchestrator
 from smartsim.entity import Ensemble, Model
-from smartsim.error import SmartSimError, SSConfigError, SSUnsupportedError
-from smartsim.error.errors import SSConfigError, SSUnsupportedError
+from smartsim.error import (
+    LauncherError,
+    SmartSimError,
+    SSConfigError,
+    SSUnsupportedError,
+)
 from smartsim.settings import RunSettings, SbatchSettings
 
 
@@ -80,3 +84,20 @@ def test_bad_orc_checkpoint():
     cont = Controller(launcher="local")
     with pytest.raises(FileNotFoundError):
         cont.reload_saved_db(checkpoint)
+
+
+def test_concurrent_launch_error():
+    """A failed step aborts the launch and names the entity"""
+    cont = Controller(launcher="local")
+    rs = RunSettings("python")
+    models = [Model(f"model_{i}", {}, "./", rs) for i in range(4)]
+
+    def fail_model_2(step):
+        if step.name.startswith("model_2"):
+            raise LauncherError("failed to launch")
+        return step.name
+
+    cont._launcher.run = fail_model_2
+    job_steps = [(cont._create_job_step(model), model) for model in models]
+    with pytest.raises(SmartSimError, match="model_2"):
+        cont._launch_steps(job_steps)
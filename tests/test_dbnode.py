@@ -1,8 +1,17 @@
+import json
+import socket
+import subprocess
+import sys
+from threading import Thread
+
 import pytest
 
 from smartsim import Experiment
 from smartsim.database import Orchestrator
+from smartsim.entity import DBNode
+from smartsim.entity.dbnode import ping_shard
 from smartsim.error.errors import SmartSimError
+from smartsim.settings import RunSettings
 
 
 def test_parse_db_host_error():
@@ -40,3 +49,59 @@ def test_set_host():
     orc = Orchestrator()
     orc.entities[0].set_host("host")
     assert orc.entities[0]._host == "host"
+
+
+def _fake_shard():
+    """Listen on a free port and answer a single PING"""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            conn.recv(1024)
+            conn.sendall(b"+PONG\r\n")
+        server.close()
+
+    Thread(target=serve, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def test_ping_shard():
+    port = _fake_shard()
+    assert ping_shard("127.0.0.1", port)
+
+    # nothing listens on the port anymore
+    assert not ping_shard("127.0.0.1", port, timeout=0.1)
+
+
+def test_dbnode_ready_once_address_known(fileutils):
+    test_dir = fileutils.make_test_dir("test_dbnode_ready")
+    port = _fake_shard()
+    dbnode = DBNode("orchestrator_0", test_dir, RunSettings("python"), [port])
+    assert not dbnode.is_ready()
+
+    with open(f"{test_dir}/orchestrator_0-{port}.endpoint.json", "w") as f:
+        json.dump({"ip": "127.0.0.1", "port": port}, f)
+    assert dbnode.is_ready()
+    assert dbnode.host == "127.0.0.1"
+
+
+def test_redis_starter_writes_endpoint(fileutils):
+    test_dir = fileutils.make_test_dir("test_redis_starter_endpoint")
+    orc = Orchestrator
+    start_script = orc._find_redis_start_script()
+    endpoint_arg = orc._get_endpoint_arg("orchestrator_0", 6780)
+    cmd = [sys.executable, start_script, endpoint_arg, "+command"]
+    cmd += [sys.executable, "-c", "pass", "--port", "6780"]
+    subprocess.run(cmd, cwd=test_dir, check=True, capture_output=True)
+
+    dbnode = DBNode("orchestrator_0", test_dir, RunSettings("python"), [6780])
+    endpoint = dbnode._read_endpoint(dbnode._get_endpoint_files()[0])
+    assert endpoint["port"] == 6780
+    assert endpoint["pid"] > 0
+    assert dbnode.host == endpoint["ip"]
+
+    dbnode.remove_stale_dbnode_files()
+    assert dbnode._read_endpoint(dbnode._get_endpoint_files()[0]) is None
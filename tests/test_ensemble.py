@@ -176,3 +176,108 @@ def test_ensemble_type():
     ens_settings = RunSettings("python")
     ensemble = exp.create_ensemble("name", replicas=4, run_settings=ens_settings)
     assert ensemble.type == "Ensemble"
+
+
+# ----- Test lazy ensembles  ----------------------------------------
+
+
+def test_lazy_all_perm():
+    """Members of a large lazy ensemble are only created on access"""
+    params = {"a": list(range(100)), "b": list(range(100)), "c": list(range(1000))}
+    ensemble = Ensemble("lazy", params, run_settings=rs, lazy=True)
+    assert len(ensemble) == 10 ** 7
+    assert ensemble.entities.created == []
+
+    model = ensemble.entities[1234567]
+    assert model.name == "lazy_1234567"
+    assert model.params == {"a": 12, "b": 34, "c": 567}
+    assert ensemble.entities[-1].params == {"a": 99, "b": 99, "c": 999}
+    assert ensemble.entities.created == [model, ensemble.entities[-1]]
+    assert model is ensemble.entities[1234567]
+
+
+def test_lazy_matches_eager():
+    params = {"h": [5, 6, 7], "g": [7, 8]}
+    for strategy in ("all_perm", "step"):
+        eager = Ensemble("ens", params, run_settings=rs, perm_strat=strategy)
+        lazy = Ensemble("ens", params, run_settings=rs, perm_strat=strategy, lazy=True)
+        assert [m.params for m in eager] == [m.params for m in lazy]
+
+
+def test_lazy_random():
+    params = {"h": list(range(1000)), "g": list(range(1000))}
+    ensemble = Ensemble(
+        "random", params, run_settings=rs, perm_strat="random", n_models=50, lazy=True
+    )
+    assert len(ensemble) == 50
+    assigned = set((m.params["h"], m.params["g"]) for m in ensemble)
+    assert len(assigned) == 50
+
+
+def test_lazy_member_updates():
+    ensemble = Ensemble("lazy", {"h": [5, 6, 7]}, run_settings=rs, lazy=True)
+    first = ensemble.entities[0]
+    ensemble.set_path("/new/path")
+    ensemble.register_incoming_entity(Model("producer", {}, "./", rs))
+
+    for model in ensemble:
+        assert model.path == "/new/path"
+        assert model.incoming_entities[0].name == "producer"
+    assert first is ensemble.entities[0]
+
+    with pytest.raises(EntityExistsError):
+        ensemble.add_model(Model("lazy_2", {}, "./", rs))
+    ensemble.add_model(Model("lazy_3", {}, "./", rs))
+    assert len(ensemble) == 4
+    assert ensemble.entities[3].name == "lazy_3"
+
+
+def test_members_share_run_settings():
+    settings = RunSettings("python", exe_args="sleep.py", env_vars={"A": "1"})
+    ensemble = Ensemble("shared", {"h": [5, 6]}, run_settings=settings)
+    first, second = ensemble.models
+
+    first.run_settings.update_env({"B": "2"})
+    first.run_settings.add_exe_args("--time=1")
+    first.run_settings.run_args["np"] = 2
+
+    assert dict(first.run_settings.env_vars) == {"A": "1", "B": "2"}
+    assert dict(second.run_settings.env_vars) == {"A": "1"}
+    assert settings.env_vars == {"A": "1"}
+    assert second.run_settings.exe_args == ["sleep.py"]
+    assert first.run_settings.format_run_args() == ["np", "2"]
+    assert second.run_settings.format_run_args() == []
+    assert type(first.run_settings) is RunSettings
+
+
+def test_caller_run_settings_changes_do_not_reach_members():
+    settings = RunSettings("python", exe_args="sleep.py", env_vars={"A": "1"})
+    ensemble = Ensemble("snapshot", {}, run_settings=settings, replicas=2)
+    member = ensemble.models[0]
+
+    # reuse the settings for another ensemble after changing them
+    settings.update_env({"A": "2"})
+    settings.add_exe_args("--time=1")
+    settings.run_args["np"] = 4
+    Ensemble("next", {}, run_settings=settings, replicas=2)
+
+    assert dict(member.run_settings.env_vars) == {"A": "1"}
+    assert member.run_settings.exe_args == ["sleep.py"]
+    assert member.run_settings.format_run_args() == []
+    assert ensemble.models[1].run_settings.format_run_args() == []
+
+
+def test_ensemble_run_settings_changes_do_not_reach_members():
+    settings = RunSettings("python", exe_args="a.py", env_vars={"A": "1"})
+    ensemble = Ensemble("frozen", {}, run_settings=settings, replicas=2)
+    assert ensemble.run_settings is settings
+    member = ensemble.models[0]
+
+    ensemble.run_settings.run_args["np"] = 8
+    ensemble.run_settings.update_env({"A": "2"})
+    ensemble.run_settings.add_exe_args("--time=1")
+
+    assert member.run_settings.format_run_args() == []
+    assert dict(member.run_settings.env_vars) == {"A": "1"}
+    assert member.run_settings.exe_args == ["a.py"]
+    assert repr(member.run_settings.env_vars) == "{'A': '1'}"
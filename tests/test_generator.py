@@ -1,3 +1,5 @@
+import os
+import time
 from os import path as osp
 
 import numpy as np
@@ -6,6 +8,7 @@ import pytest
 from smartsim import Experiment
 from smartsim.database import Orchestrator
 from smartsim.generation import Generator
+from smartsim.generation.generator import copy_file, copy_tree
 from smartsim.settings import RunSettings
 
 rs = RunSettings("python", exe_args="sleep.py")
@@ -133,3 +136,95 @@ def test_dir_files(fileutils):
         assert osp.isdir(model_path)
         assert osp.isdir(osp.join(model_path, "test_dir_1"))
         assert osp.isfile(osp.join(model_path, "test.py"))
+
+
+def test_copy_file(fileutils):
+    test_dir = fileutils.make_test_dir("gen_copy_file_test")
+    src = fileutils.get_test_conf_path("in.atm")
+    dst = osp.join(test_dir, "in.atm")
+    copy_file(src, dst)
+    with open(src, "rb") as fsrc, open(dst, "rb") as fdst:
+        assert fsrc.read() == fdst.read()
+
+
+def test_copy_tree_merges_directories(fileutils):
+    test_dir = fileutils.make_test_dir("gen_copy_tree_test")
+    src = osp.join(test_dir, "src")
+    dst = osp.join(test_dir, "dst")
+    os.makedirs(osp.join(src, "sub"))
+    os.makedirs(osp.join(dst, "sub"))
+    with open(osp.join(src, "sub", "run.sh"), "w") as f:
+        f.write("echo new")
+    os.chmod(osp.join(src, "sub", "run.sh"), 0o755)
+    with open(osp.join(dst, "sub", "run.sh"), "w") as f:
+        f.write("echo old")
+    with open(osp.join(dst, "keep.txt"), "w") as f:
+        f.write("keep")
+
+    copy_tree(src, dst)
+    with open(osp.join(dst, "sub", "run.sh")) as f:
+        assert f.read() == "echo new"
+    assert os.access(osp.join(dst, "sub", "run.sh"), os.X_OK)
+    assert osp.isfile(osp.join(dst, "keep.txt"))
+
+
+def test_serial_generation(fileutils, monkeypatch):
+    monkeypatch.setenv("SMARTSIM_GEN_WORKERS", "1")
+    test_dir = fileutils.make_test_dir("gen_serial_test")
+    exp = Experiment("gen-test-serial", test_dir, launcher="local")
+
+    params = {"THERMO": [10, 20, 30], "STEPS": [10, 20, 30]}
+    ensemble = exp.create_ensemble("test", params=params, run_settings=rs)
+    config = fileutils.get_test_conf_path("in.atm")
+    ensemble.attach_generator_files(to_configure=config)
+    exp.generate(ensemble)
+
+    for i in range(9):
+        assert osp.isfile(osp.join(test_dir, "test/test_" + str(i), "in.atm"))
+
+
+def test_incremental_generation(fileutils):
+    test_dir = fileutils.make_test_dir("gen_incremental_test")
+    exp = Experiment("gen-test-incremental", test_dir, launcher="local")
+
+    config = fileutils.get_test_conf_path("in.atm")
+    script = fileutils.get_test_conf_path("sleep.py")
+    models = []
+    for i in range(2):
+        model = exp.create_model(f"model_{i}", params={"THERMO": 10}, run_settings=rs)
+        model.attach_generator_files(to_copy=script, to_configure=config)
+        models.append(model)
+    exp.generate(*models, incremental=True)
+
+    def mtimes(model):
+        return [
+            os.stat(osp.join(model.path, filename)).st_mtime_ns
+            for filename in ("sleep.py", "in.atm")
+        ]
+
+    before = [mtimes(model) for model in models]
+    time.sleep(0.01)
+    models[1].params["THERMO"] = 20
+    exp.generate(*models, incremental=True)
+
+    # untouched model is skipped, only the tagged file of the other is written
+    assert mtimes(models[0]) == before[0]
+    copied, tagged = mtimes(models[1])
+    assert copied == before[1][0]
+    assert tagged > before[1][1]
+    with open(osp.join(models[1].path, "in.atm")) as f:
+        assert "20" in f.read()
+
+
+def test_incremental_generation_removes_stale_members(fileutils):
+    test_dir = fileutils.make_test_dir("gen_incremental_stale_test")
+    exp = Experiment("gen-test-incremental-stale", test_dir, launcher="local")
+
+    ensemble = exp.create_ensemble("ens", params={"THERMO": [10, 20]}, run_settings=rs)
+    exp.generate(ensemble, incremental=True)
+    assert osp.isdir(osp.join(test_dir, "ens", "ens_1"))
+
+    ensemble = exp.create_ensemble("ens", params={"THERMO": [10]}, run_settings=rs)
+    exp.generate(ensemble, incremental=True)
+    assert osp.isdir(osp.join(test_dir, "ens", "ens_0"))
+    assert not osp.isdir(osp.join(test_dir, "ens", "ens_1"))
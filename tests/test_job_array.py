@@ -0,0 +1,125 @@
+import os
+import subprocess
+
+import pytest
+
+from smartsim import Experiment
+from smartsim.entity import Ensemble
+from smartsim.error import SmartSimError, SSConfigError, SSUnsupportedError
+from smartsim.launcher import LocalLauncher
+from smartsim.launcher.step import (
+    BsubArrayStep,
+    LocalStep,
+    QsubArrayStep,
+    SbatchArrayStep,
+)
+from smartsim.settings import (
+    BsubBatchSettings,
+    QsubBatchSettings,
+    RunSettings,
+    SbatchSettings,
+    SrunSettings,
+)
+
+
+def run_array_task(script, index_var, index):
+    """Run the command a job array task would run for an index"""
+    with open(script) as f:
+        array_cmd = f.read().splitlines()[-1]
+    env = dict(os.environ, **{index_var: str(index)})
+    out = subprocess.run(
+        ["bash", "-c", array_cmd], env=env, capture_output=True, text=True
+    )
+    return out.stdout.strip()
+
+
+@pytest.mark.parametrize(
+    "step_type, batch_settings, index_var, first_index",
+    [
+        (SbatchArrayStep, SbatchSettings(), "SLURM_ARRAY_TASK_ID", 0),
+        (QsubArrayStep, QsubBatchSettings(nodes=1), "PBS_ARRAY_INDEX", 0),
+        (BsubArrayStep, BsubBatchSettings(), "LSB_JOBINDEX", 1),
+    ],
+)
+def test_array_task_runs_member(
+    fileutils, step_type, batch_settings, index_var, first_index
+):
+    test_dir = fileutils.make_test_dir(f"test-{step_type.__name__}")
+    array_step = step_type("ensemble", test_dir, batch_settings)
+    for i in range(3):
+        member_dir = os.path.join(test_dir, f"member_{i}")
+        os.mkdir(member_dir)
+        member = LocalStep(f"member_{i}", member_dir, RunSettings("pwd"))
+        array_step.add_to_batch(member)
+
+    script = array_step.get_launch_cmd()[-1]
+    with open(array_step.get_step_file(ending=".array")) as f:
+        assert len(f.readlines()) == 3
+
+    # each task changes to the directory of its member
+    output = run_array_task(script, index_var, first_index + 2)
+    assert output == os.path.join(test_dir, "member_2")
+
+
+def test_array_step_ids():
+    assert SbatchArrayStep.get_array_step_id("1234", 5) == "1234_5"
+    assert QsubArrayStep.get_array_step_id("1234[].pbs01", 5) == "1234[5].pbs01"
+    assert BsubArrayStep.get_array_step_id("1234", 5) == "1234[6]"
+
+
+def test_pbs_array_needs_two_members(fileutils):
+    test_dir = fileutils.make_test_dir("test-pbs-array-size")
+    array_step = QsubArrayStep("ensemble", test_dir, QsubBatchSettings(nodes=1))
+    array_step.add_to_batch(LocalStep("member", test_dir, RunSettings("pwd")))
+    with pytest.raises(SSConfigError):
+        array_step.get_launch_cmd()
+
+
+def test_array_needs_batch_settings():
+    with pytest.raises(SmartSimError):
+        Ensemble(
+            "ensemble", {}, run_settings=RunSettings("pwd"), replicas=2, array=True
+        )
+
+
+def test_local_launcher_has_no_arrays():
+    with pytest.raises(SSUnsupportedError):
+        LocalLauncher().create_array_step("ensemble", "./", SbatchSettings())
+
+
+def test_array_members_tracked_per_task(fileutils, monkeypatch):
+    exp_name = "test-array-members"
+    exp = Experiment(exp_name, launcher="slurm")
+    test_dir = fileutils.make_test_dir(exp_name)
+    ensemble = exp.create_ensemble(
+        "ensemble",
+        batch_settings=SbatchSettings(),
+        run_settings=SrunSettings("pwd"),
+        replicas=3,
+        array=True,
+    )
+    ensemble.set_path(test_dir)
+
+    controller = exp._control
+    launcher = controller._launcher
+    launched = []
+
+    def run(step):
+        step.get_launch_cmd()
+        launched.append(step)
+        launcher.step_mapping.add(step.name, "1234", None, True)
+        return "1234"
+
+    monkeypatch.setattr(launcher, "run", run)
+    array_step = controller._create_array_job_step(ensemble)
+    controller._launch_step(array_step, ensemble)
+
+    # one submission for all members
+    assert launched == [array_step]
+    assert array_step.name not in launcher.step_mapping.mapping
+    step_ids = [
+        launcher.step_mapping[controller._jobs[model.name].name].step_id
+        for model in ensemble
+    ]
+    assert step_ids == ["1234_0", "1234_1", "1234_2"]
+    assert len(controller.get_entity_list_status(ensemble)) == 3
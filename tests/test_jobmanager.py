@@ -0,0 +1,248 @@
+import time
+from threading import Event, RLock, Thread
+
+import pytest
+
+from smartsim import Experiment, constants
+from smartsim.control import jobmanager
+from smartsim.control.job import Job
+from smartsim.control.jobmanager import JobManager
+from smartsim.entity import DBNode, Model
+from smartsim.launcher import LocalLauncher
+from smartsim.settings import RunSettings
+
+
+def test_notify_wakes_thread_sleep():
+    jm = JobManager(RLock())
+    jm.set_launcher(LocalLauncher())
+
+    sleeper = Thread(target=jm._thread_sleep)
+    start = time.time()
+    sleeper.start()
+    jm.notify()
+    sleeper.join()
+    assert time.time() - start < constants.LOCAL_JM_INTERVAL
+
+
+def test_task_exit_notifies_job_manager():
+    launcher = LocalLauncher()
+    jm = JobManager(RLock())
+    jm.set_launcher(launcher)
+    assert jm.notify in launcher.task_manager._exit_callbacks
+
+    launcher.task_manager._notify_exit("1234")
+    assert jm._wakeup.is_set()
+
+
+def test_block_returns_on_completion(fileutils):
+    exp_name = "test-jm-block-on-completion"
+    exp = Experiment(exp_name, launcher="local")
+    test_dir = fileutils.make_test_dir(exp_name)
+
+    script = fileutils.get_test_conf_path("sleep.py")
+    settings = RunSettings("python", f"{script} --time=0")
+    model = exp.create_model("m1", path=test_dir, run_settings=settings)
+
+    # blocking start used to poll on a fixed five second interval
+    start = time.time()
+    exp.start(model, block=True)
+    assert time.time() - start < 5
+    assert exp.get_status(model)[0] == constants.STATUS_COMPLETED
+
+
+def test_completed_steps_are_forgotten(fileutils):
+    exp_name = "test-jm-forget-completed-steps"
+    exp = Experiment(exp_name, launcher="local")
+    test_dir = fileutils.make_test_dir(exp_name)
+
+    script = fileutils.get_test_conf_path("sleep.py")
+    settings = RunSettings("python", f"{script} --time=0")
+    model = exp.create_model("m1", path=test_dir, run_settings=settings)
+
+    exp.start(model, block=True)
+    launcher = exp._control._launcher
+    assert len(launcher.step_mapping) == 0
+    assert len(launcher.task_manager.task_history) == 0
+    assert exp.get_status(model)[0] == constants.STATUS_COMPLETED
+
+
+class SlowLauncher(LocalLauncher):
+    def __init__(self):
+        super().__init__()
+        self.querying = Event()
+        self.release = Event()
+
+    def get_step_update(self, step_names):
+        self.querying.set()
+        self.release.wait(10)
+        return []
+
+
+def test_status_not_blocked_by_launcher_query():
+    launcher = SlowLauncher()
+    jm = JobManager(RLock())
+    jm.set_launcher(launcher)
+    model = Model("m1", {}, "./", RunSettings("python"))
+    jm.add_job("m1-step", "1234", model)
+
+    checker = Thread(target=jm.check_jobs)
+    checker.start()
+    assert launcher.querying.wait(10)
+
+    start = time.time()
+    assert jm.get_status(model) == constants.STATUS_NEW
+    assert not jm.is_finished(model)
+    assert time.time() - start < 1
+
+    launcher.release.set()
+    checker.join()
+
+
+def test_db_addresses_resolved_once(monkeypatch):
+    lookups = []
+
+    def resolve_hosts(hosts):
+        lookups.append(list(hosts))
+        return {host: "127.0.0.1" for host in hosts}
+
+    monkeypatch.setattr(jobmanager, "resolve_hosts", resolve_hosts)
+    jm = JobManager(RLock())
+    jm.set_launcher(LocalLauncher())
+    dbnode = DBNode("db_0", "./", RunSettings("python"), [6379, 6380])
+    jm.add_job("db_0-step", "1234", dbnode)
+    jm.db_jobs["db_0"].hosts = ["localhost"]
+
+    for _ in range(3):
+        assert jm.get_db_host_addresses() == ["127.0.0.1:6379", "127.0.0.1:6380"]
+    assert lookups == [["localhost"]]
+
+    jm.move_to_completed(jm.db_jobs["db_0"])
+    assert jm.get_db_host_addresses() == []
+
+
+def test_status_listeners(fileutils):
+    exp_name = "test-jm-status-listeners"
+    exp = Experiment(exp_name, launcher="local")
+    test_dir = fileutils.make_test_dir(exp_name)
+
+    changes = []
+
+    def listener(job, old_status):
+        changes.append((job.ename, old_status, job.status))
+
+    def failing_listener(job, old_status):
+        raise ValueError("listener errors are logged")
+
+    jm = exp._control._jobs
+    jm.add_status_listener(failing_listener)
+    jm.add_status_listener(listener)
+
+    script = fileutils.get_test_conf_path("sleep.py")
+    settings = RunSettings("python", f"{script} --time=0")
+    model = exp.create_model("m1", path=test_dir, run_settings=settings)
+    exp.start(model, block=True)
+
+    # listeners are called once the job is already marked completed
+    start = time.time()
+    while changes[-1][2] != constants.STATUS_COMPLETED:
+        assert time.time() - start < 5
+        time.sleep(0.01)
+    assert changes[0] == ("m1", None, constants.STATUS_NEW)
+    assert len(set(changes)) == len(changes)
+
+    jm.remove_status_listener(listener)
+    exp.start(model, block=True)
+    time.sleep(0.1)
+    assert changes[-1][2] == constants.STATUS_COMPLETED
+    assert changes.count(changes[0]) == 1
+
+
+def test_on_status_change_targets():
+    jm = JobManager(RLock())
+    jm.set_launcher(LocalLauncher())
+    settings = RunSettings("python")
+    sim = Model("sim_0", {}, "./", settings)
+    other = Model("analysis", {}, "./", settings)
+
+    by_entity, by_pattern, completed = [], [], []
+    jm.on_status_change(sim, by_entity.append)
+    subscription = jm.on_status_change("sim_*", by_pattern.append)
+    jm.on_status_change("*", completed.append, statuses=[constants.STATUS_COMPLETED])
+
+    jm.add_job("sim_0", "1", sim)
+    jm.add_job("analysis", "2", other)
+    assert [update.entity.name for update in by_entity] == ["sim_0"]
+    assert [update.entity.name for update in by_pattern] == ["sim_0"]
+    assert by_entity[0].old_status is None
+    assert by_entity[0].status == constants.STATUS_NEW
+    assert completed == []
+
+    jm.remove_status_listener(subscription)
+    job = jm["sim_0"]
+    job.set_status(constants.STATUS_COMPLETED, "", 0, output=None, error=None)
+    jm.move_to_completed(job)
+    assert len(by_pattern) == 1
+    assert by_entity[-1].old_status == constants.STATUS_NEW
+    assert by_entity[-1].status == constants.STATUS_COMPLETED
+    assert [(u.entity.name, u.returncode) for u in completed] == [("sim_0", 0)]
+
+
+def test_on_status_change_wrong_type():
+    jm = JobManager(RLock())
+    with pytest.raises(TypeError):
+        jm.on_status_change(1234, print)
+
+
+def test_chain_on_completion(fileutils):
+    exp_name = "test-jm-chain-on-completion"
+    exp = Experiment(exp_name, launcher="local")
+    test_dir = fileutils.make_test_dir(exp_name)
+
+    script = fileutils.get_test_conf_path("sleep.py")
+    settings = RunSettings("python", f"{script} --time=0")
+    producer = exp.create_model("producer", path=test_dir, run_settings=settings)
+    analysis = exp.create_model("analysis", path=test_dir, run_settings=settings)
+    analyzed = Event()
+
+    def analyze(update):
+        exp.start(analysis, block=False)
+
+    exp.on_status_change(producer, analyze, statuses=[constants.STATUS_COMPLETED])
+    exp.on_status_change(
+        analysis, lambda update: analyzed.set(), statuses=[constants.STATUS_COMPLETED]
+    )
+    exp.start(producer, block=False)
+    assert analyzed.wait(30)
+    assert exp.get_status(producer, analysis) == [constants.STATUS_COMPLETED] * 2
+
+
+def test_wait_for_completion_does_not_miss_completions():
+    jm = JobManager(RLock())
+    jm.set_launcher(LocalLauncher())
+    model = Model("m1", {}, "./", RunSettings("python"))
+    jm.add_job("m1", "1", model)
+    assert not jm.wait_for_completion(0)
+
+    # the job completes before anyone waits on it
+    job = jm["m1"]
+    job.set_status(constants.STATUS_COMPLETED, "", 0)
+    jm.move_to_completed(job)
+    start = time.time()
+    assert jm.wait_for_completion(10)
+    assert time.time() - start < 1
+
+
+def test_db_addresses_not_cached_without_db(monkeypatch):
+    monkeypatch.setattr(
+        jobmanager, "resolve_hosts", lambda hosts: {host: "127.0.0.1" for host in hosts}
+    )
+    jm = JobManager(RLock())
+    jm.set_launcher(LocalLauncher())
+    assert jm.get_db_host_addresses() == []
+
+    # e.g. reconnecting to an orchestrator after launching models
+    dbnode = DBNode("db_0", "./", RunSettings("python"), [6379])
+    job = Job("db_0-step", "1234", dbnode)
+    job.hosts = ["localhost"]
+    jm.add_db_job(job)
+    assert jm.get_db_host_addresses() == ["127.0.0.1:6379"]
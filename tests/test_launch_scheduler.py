@@ -0,0 +1,284 @@
+import time
+
+import pytest
+
+from smartsim import Experiment, constants
+from smartsim.control import controller
+from smartsim.control.controller import Controller
+from smartsim.control.manifest import Manifest
+from smartsim.control.scheduler import LaunchScheduler
+from smartsim.entity import Ensemble, Model
+from smartsim.error import SSConfigError, SSUnsupportedError
+from smartsim.settings import RunSettings, SrunSettings
+
+
+def make_model(name, tasks=1, cpus=1, gpus=0):
+    settings = SrunSettings("echo", alloc="1234")
+    settings.set_tasks(tasks)
+    settings.set_cpus_per_task(cpus)
+    if gpus:
+        settings.run_args["gres"] = f"gpu:{gpus}"
+    return Model(name, {}, "./", settings)
+
+
+def make_scheduler(nodes):
+    scheduler = LaunchScheduler()
+    scheduler.set_nodes("1234", nodes)
+    return scheduler
+
+
+def get_names(placements):
+    return [entity.name for entity, _ in placements]
+
+
+def test_get_request():
+    assert LaunchScheduler.get_request(make_model("m", 2, 3).run_settings) == (6, 0)
+    settings = SrunSettings("echo", run_args={"n": 4, "gpus": "v100:2"})
+    assert LaunchScheduler.get_request(settings) == (4, 2)
+
+    settings.set_nodes(2)
+    with pytest.raises(SSConfigError):
+        LaunchScheduler.get_request(settings)
+
+
+def test_first_fit_and_backfill():
+    scheduler = make_scheduler({"n1": (4, 0), "n2": (2, 0)})
+    large = [make_model(f"large_{i}", cpus=3) for i in range(2)]
+    small = [make_model(f"small_{i}") for i in range(4)]
+    scheduler.add(large + small, pack=True)
+
+    # the second large model does not fit, small ones fill the gaps
+    placements = [(e.name, host) for e, host in scheduler.place()]
+    assert placements == [
+        ("large_0", "n1"),
+        ("small_0", "n1"),
+        ("small_1", "n2"),
+        ("small_2", "n2"),
+    ]
+    assert scheduler.place() == []
+    assert scheduler.queued == 2
+
+    # freeing one core is not enough for the large model
+    assert scheduler.release("small_0")
+    placements = [(e.name, host) for e, host in scheduler.place()]
+    assert placements == [("small_3", "n1")]
+
+    assert scheduler.release("large_0")
+    placements = [(e.name, host) for e, host in scheduler.place()]
+    assert placements == [("large_1", "n1")]
+    assert not scheduler.release("large_0")
+
+
+def test_gpus():
+    scheduler = make_scheduler({"cpu": (8, 0), "gpu": (8, 2)})
+    models = [make_model(f"m{i}", gpus=1) for i in range(3)]
+    scheduler.check(models)
+    scheduler.add(models, pack=True)
+    assert [host for _, host in scheduler.place()] == ["gpu", "gpu"]
+
+    with pytest.raises(SSConfigError):
+        scheduler.check([make_model("too_many_gpus", gpus=4)])
+
+
+def test_remove_queued():
+    scheduler = make_scheduler({"n1": (1, 0)})
+    scheduler.add([make_model("m0"), make_model("m1")], pack=True)
+    scheduler.place()
+    assert not scheduler.remove("m0")
+    assert scheduler.remove("m1")
+    assert scheduler.queued == 0
+
+
+def test_max_concurrency_and_priority():
+    scheduler = LaunchScheduler()
+    models = [make_model(f"m{i}") for i in range(5)]
+    scheduler.add(models, max_concurrency=2, priority=lambda m: -int(m.name[1:]))
+
+    placements = scheduler.place()
+    assert placements == [(models[4], None), (models[3], None)]
+    assert scheduler.place() == []
+
+    scheduler.release("m4")
+    assert get_names(scheduler.place()) == ["m2"]
+
+    # groups of other calls have their own limit
+    others = [make_model(f"other_{i}") for i in range(2)]
+    scheduler.add(others, max_concurrency=1)
+    assert get_names(scheduler.place()) == ["other_0"]
+    assert scheduler.queued == 3
+
+
+def test_max_concurrency_with_packing():
+    scheduler = make_scheduler({"n1": (8, 0)})
+    scheduler.add([make_model(f"m{i}") for i in range(4)], max_concurrency=3, pack=True)
+    assert get_names(scheduler.place()) == ["m0", "m1", "m2"]
+    scheduler.release("m1")
+    assert get_names(scheduler.place()) == ["m3"]
+
+
+def test_pack_requires_srun(monkeypatch):
+    monkeypatch.setattr(controller, "get_allocation_nodes", lambda alloc: {})
+    control = Controller(launcher="slurm")
+    model = Model("m", {}, "./", RunSettings("echo"))
+    with pytest.raises(SSUnsupportedError):
+        control.start(Manifest(model), block=False, pack=True)
+
+
+def test_controller_packs_models(monkeypatch, fileutils):
+    test_dir = fileutils.make_test_dir("test_controller_packs_models")
+    monkeypatch.setattr(
+        controller, "get_allocation_nodes", lambda alloc: {"n1": (2, 0)}
+    )
+    control = Controller(launcher="slurm")
+    launched = []
+
+    def run(step):
+        launched.append(step.get_launch_cmd())
+        return str(len(launched))
+
+    monkeypatch.setattr(control._launcher, "run", run)
+    monkeypatch.setattr(control._jobs, "start", lambda: None)
+
+    settings = SrunSettings("echo", alloc="1234")
+    ensemble = Ensemble("packed", {}, run_settings=settings, replicas=3)
+    ensemble.set_path(test_dir)
+    control.start(Manifest(ensemble), block=False, pack=True)
+
+    def wait_for_launches(num_launches):
+        start = time.time()
+        while len(launched) < num_launches:
+            assert time.time() - start < 10
+            time.sleep(0.01)
+
+    wait_for_launches(2)
+    assert all("--nodelist=n1" in cmd and "--exclusive" in cmd for cmd in launched)
+    # placements do not change the run settings of the ensemble
+    assert not any("nodelist" in arg for arg in settings.format_run_args())
+    statuses = control.get_entity_list_status(ensemble)
+    assert statuses.count(constants.STATUS_NEW) == 3
+
+    # the queued member is launched once a running one completes
+    job = control._jobs["packed_0"]
+    job.set_status(constants.STATUS_COMPLETED, "COMPLETED", 0)
+    control._jobs.move_to_completed(job)
+    wait_for_launches(3)
+    assert control._jobs["packed_2"].jid == "3"
+
+
+def test_throttled_local_launch(fileutils):
+    exp_name = "test_throttled_local_launch"
+    test_dir = fileutils.make_test_dir(exp_name)
+    exp = Experiment(exp_name, launcher="local")
+    control = exp._control
+    running_at_launch = []
+    run = control._launcher.run
+
+    def counting_run(step):
+        jobs = control._jobs.jobs.values()
+        running_at_launch.append(len([job for job in jobs if not job.pending]))
+        return run(step)
+
+    control._launcher.run = counting_run
+
+    script = fileutils.get_test_conf_path("sleep.py")
+    settings = RunSettings("python", f"{script} --time=1")
+    ensemble = exp.create_ensemble("throttled", run_settings=settings, replicas=4)
+    ensemble.set_path(test_dir)
+
+    exp.start(ensemble, block=True, max_concurrency=2)
+    statuses = exp.get_status(ensemble)
+    assert all([stat == constants.STATUS_COMPLETED for stat in statuses])
+    assert len(running_at_launch) == 4
+    assert max(running_at_launch) < 2
+
+
+def test_throttled_launch_settings_error():
+    """Errors in the settings of queued entities reach the caller"""
+    exp = Experiment("test_throttled_settings_error", launcher="slurm")
+    model = exp.create_model("m1", path="./", run_settings=RunSettings("echo"))
+    with pytest.raises(SSUnsupportedError):
+        exp.start(model, block=True, max_concurrency=1)
+    assert not exp._control._scheduler.queued
+
+
+def test_throttled_launch_failure(fileutils):
+    """A failed launch fails its job without stopping the dispatcher"""
+    exp_name = "test_throttled_launch_failure"
+    test_dir = fileutils.make_test_dir(exp_name)
+    exp = Experiment(exp_name, launcher="local")
+    control = exp._control
+    run = control._launcher.run
+
+    def failing_run(step):
+        if step.name.startswith("failing_0"):
+            raise OSError("no such file")
+        return run(step)
+
+    control._launcher.run = failing_run
+
+    script = fileutils.get_test_conf_path("sleep.py")
+    settings = RunSettings("python", f"{script} --time=0")
+    ensemble = exp.create_ensemble("failing", run_settings=settings, replicas=3)
+    ensemble.set_path(test_dir)
+
+    exp.start(ensemble, block=True, max_concurrency=1)
+    statuses = exp.get_status(ensemble)
+    assert statuses[0] == constants.STATUS_FAILED
+    assert statuses[1:] == [constants.STATUS_COMPLETED] * 2
+
+    # the dispatcher is started again for later launches
+    model = ensemble.entities[1]
+    exp.start(model, block=True, max_concurrency=1)
+    assert exp.get_status(model) == [constants.STATUS_COMPLETED]
+
+
+def test_dispatcher_exit_is_recorded(monkeypatch):
+    control = Controller(launcher="local")
+    model = Model("m1", {}, "./", RunSettings("echo"))
+    assert control._scheduler.add([model], max_concurrency=1)
+
+    def fail():
+        raise RuntimeError("dispatcher failed")
+
+    monkeypatch.setattr(control._scheduler, "wait_for_placements", fail)
+    with pytest.raises(RuntimeError):
+        control._dispatch()
+    # the next group of entities starts a new dispatcher
+    assert control._scheduler.add([Model("m2", {}, "./", RunSettings("echo"))])
+
+
+def test_stop_entity_being_launched(fileutils):
+    """Entities stopped after the dispatcher took them are not run"""
+    test_dir = fileutils.make_test_dir("test_stop_entity_being_launched")
+    script = fileutils.get_test_conf_path("sleep.py")
+    control = Controller(launcher="local")
+    launcher = control._launcher
+    run = launcher.run
+    models = [
+        Model(f"m{i}", {}, test_dir, RunSettings("python", f"{script} --time=10"))
+        for i in range(2)
+    ]
+    launched = []
+
+    def stopping_run(step):
+        # stopped by the user while the step is being launched
+        control.stop_entity(models[1])
+        launched.append(step.name)
+        return run(step)
+
+    launcher.run = stopping_run
+    for model in models:
+        steps = control._prepare_queue([model], False, 1)
+        # queued entities already taken by the dispatcher
+        control._queued_steps.update(steps)
+        control._jobs.add_pending_job(model)
+
+    control.stop_entity(models[0])
+    assert control.get_entity_status(models[0]) == constants.STATUS_NEW
+    control._launch_queued(models[0], None)
+    assert control.get_entity_status(models[0]) == constants.STATUS_CANCELLED
+
+    control._launch_queued(models[1], None)
+    assert len(launched) == 1
+    assert control.get_entity_status(models[1]) == constants.STATUS_CANCELLED
+    assert not control._stopped_queued
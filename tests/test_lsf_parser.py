@@ -59,3 +59,10 @@ def test_parse_bjobs_jobid():
     )
     parsed_id = lsfParser.parse_step_id_from_bjobs(output, step_name="SmartSim")
     assert parsed_id == "1234567"
+
+
+def test_parse_bjobs_array_statuses():
+    """Parse statuses of array elements from bjobs called with -o"""
+    output = "1234 RUN 1\n1234 PEND 2\n1235 DONE 0\n"
+    statuses = lsfParser.parse_bjobs_array_statuses(output)
+    assert statuses == {"1234[1]": "RUN", "1234[2]": "PEND", "1235[0]": "DONE"}
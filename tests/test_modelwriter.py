@@ -117,4 +117,33 @@ def test_mw_error_1():
 def test_mw_error_2():
     writer = ModelWriter()
     with pytest.raises(ParameterWriterError):
-        writer._write_changes("[not/a/path]")
+        writer._write_changes("[not/a/path]", "")
+
+
+def test_multiple_tags_per_line(fileutils):
+    test_dir = fileutils.make_test_dir("multi_tag_modelwriter_test")
+    tagged_file = path.join(test_dir, "input.txt")
+    with open(tagged_file, "w") as f:
+        f.write("a = ;A; b = ;B;\nc = ;C;\n")
+
+    writer = ModelWriter()
+    for i in range(2):
+        dst = path.join(test_dir, f"input_{i}.txt")
+        writer.write_tagged_file(tagged_file, dst, {"A": i, "B": "x"})
+        with open(dst) as f:
+            assert f.read() == f"a = {i} b = x\nc = C\n"
+    assert len(writer._templates) == 1
+
+
+def test_anchored_custom_regex(fileutils):
+    test_dir = fileutils.make_test_dir("anchored_modelwriter_test")
+    tagged_file = path.join(test_dir, "input.txt")
+    with open(tagged_file, "w") as f:
+        f.write("x = 1\n;a;\n;b;\n")
+
+    writer = ModelWriter()
+    writer.set_tag(";", r"(^;.+;$)")
+    dst = path.join(test_dir, "configured.txt")
+    writer.write_tagged_file(tagged_file, dst, {"a": "A", "b": "B"})
+    with open(dst) as f:
+        assert f.read() == "x = 1\nA\nB\n"
@@ -7,6 +7,12 @@ from smartsim.database import (
     PBSOrchestrator,
     SlurmOrchestrator,
 )
+from smartsim.database.orchestrator import (
+    CLUSTER_SLOTS,
+    _get_slot_ranges,
+    _wait_for_cluster,
+    resolve_hosts,
+)
 from smartsim.error import SmartSimError
 
 
@@ -150,3 +156,32 @@ def test_set_batch_arg():
     assert orc2.batch_settings.batch_args["account"] == "ACCOUNT"
     orc2.set_batch_arg("outputprefix", "new_output/")
     assert "outputprefix" not in orc2.batch_settings.batch_args
+
+
+@pytest.mark.parametrize("num_shards", [1, 3, 64])
+def test_slot_ranges_cover_all_slots(num_shards):
+    ranges = _get_slot_ranges(num_shards)
+    assert len(ranges) == num_shards
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == CLUSTER_SLOTS - 1
+    for (_, last), (first, _) in zip(ranges, ranges[1:]):
+        assert first == last + 1
+
+
+class FakeShard:
+    def __init__(self, state):
+        self.state = state
+
+    def execute_command(self, *args):
+        return {"cluster_state": self.state, "cluster_known_nodes": "2"}
+
+
+def test_wait_for_cluster():
+    _wait_for_cluster([FakeShard("ok"), FakeShard("ok")], timeout=1)
+    with pytest.raises(SmartSimError):
+        _wait_for_cluster([FakeShard("ok"), FakeShard("fail")], timeout=0.5)
+
+
+def test_resolve_hosts():
+    ips = resolve_hosts(["localhost", "localhost", "127.0.0.1"])
+    assert ips == {"localhost": "127.0.0.1", "127.0.0.1": "127.0.0.1"}
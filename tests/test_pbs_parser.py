@@ -41,3 +41,16 @@ def test_parse_qstat_status():
     status = "R"
     parsed_status = pbsParser.parse_qstat_jobid(output, "1289903.sdb")
     assert status == parsed_status
+
+
+def test_parse_qstat_statuses():
+    output = (
+        "Job id            Name             User              Time Use S Queue\n"
+        "----------------  ---------------- ----------------  -------- - -----\n"
+        "12345.sdb         jobname          username          00:00:00 Q queue\n"
+        "1234.sdb          jobname          username          00:00:00 R queue\n"
+    )
+    statuses = pbsParser.parse_qstat_statuses(output)
+    assert statuses["1234"] == "R"
+    assert pbsParser.parse_qstat_jobid(output, "1234.sdb") == "R"
+    assert pbsParser.parse_qstat_jobid(output, "123.sdb") == "NOTFOUND"
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+from smartsim import Experiment, constants
+from smartsim.error import LauncherError
+from smartsim.launcher import PilotLauncher
+from smartsim.launcher.step import LocalStep
+from smartsim.settings import RunSettings
+
+"""
+Test the launch of entities through pilot agents on the local machine
+"""
+
+
+@pytest.fixture
+def pilot_agents(monkeypatch):
+    monkeypatch.delenv("SLURM_JOB_ID", raising=False)
+    monkeypatch.setenv("SMARTSIM_PILOT_AGENTS", "3")
+
+
+def wait_for_exit(launcher, task_id, timeout=10):
+    task = launcher._tasks[task_id]
+    start = time.time()
+    while task.returncode is None:
+        assert time.time() - start < timeout
+        time.sleep(0.05)
+    return task.returncode
+
+
+def run_python(launcher, path, name, code):
+    settings = RunSettings("python", ["-c", code], env_vars={"PILOT_TEST": "set"})
+    step = LocalStep(name, path, settings)
+    returncode = wait_for_exit(launcher, launcher.run(step))
+    out, _ = step.get_output_files()
+    with open(out) as f:
+        return returncode, f.read().strip()
+
+
+def test_models(fileutils, pilot_agents):
+    exp_name = "test-models-pilot-launch"
+    exp = Experiment(exp_name, launcher="pilot")
+    test_dir = fileutils.make_test_dir(exp_name)
+
+    script = fileutils.get_test_conf_path("sleep.py")
+    settings = RunSettings("python", f"{script} --time=1")
+    models = [
+        exp.create_model(f"m{i}", path=test_dir, run_settings=settings)
+        for i in range(6)
+    ]
+
+    exp.start(*models, block=True)
+    statuses = exp.get_status(*models)
+    assert all([stat == constants.STATUS_COMPLETED for stat in statuses])
+
+    launcher = exp._control._launcher
+    assert len(launcher._agents) == 3
+    assert all(agent.num_tasks == 0 for agent in launcher._agents)
+
+
+def test_failed_and_stopped_models(fileutils, pilot_agents):
+    exp_name = "test-failed-pilot-launch"
+    exp = Experiment(exp_name, launcher="pilot")
+    test_dir = fileutils.make_test_dir(exp_name)
+
+    script = fileutils.get_test_conf_path("sleep.py")
+    fail = RunSettings("python", ["-c", "import sys; sys.exit(3)"])
+    sleep = RunSettings("python", f"{script} --time=30")
+    failing = exp.create_model("failing", path=test_dir, run_settings=fail)
+    sleeping = exp.create_model("sleeping", path=test_dir, run_settings=sleep)
+
+    exp.start(failing, sleeping, block=False)
+    start = time.time()
+    while not exp.finished(failing):
+        assert time.time() - start < 10
+        time.sleep(0.1)
+    exp.stop(sleeping)
+
+    assert exp.get_status(failing)[0] == constants.STATUS_FAILED
+    assert exp.get_status(sleeping)[0] == constants.STATUS_CANCELLED
+
+
+def test_task_environment(fileutils, pilot_agents):
+    test_dir = fileutils.make_test_dir("test-pilot-environment")
+    launcher = PilotLauncher()
+
+    code = "import os; print(os.environ['PILOT_TEST'])"
+    assert run_python(launcher, test_dir, "env", code) == (0, "set")
+
+    # the token of the agents is not passed on to their tasks
+    code = "import os; print('SMARTSIM_PILOT_TOKEN' in os.environ)"
+    assert run_python(launcher, test_dir, "token", code) == (0, "False")
+
+
+def test_bad_executable(fileutils, pilot_agents):
+    test_dir = fileutils.make_test_dir("test-pilot-bad-exe")
+    settings = RunSettings("python")
+    settings.exe = ["/not/an/executable"]
+    step = LocalStep("bad", test_dir, settings)
+
+    launcher = PilotLauncher()
+    with pytest.raises(LauncherError):
+        launcher.run(step)
+    assert launcher._tasks == {}
+    assert all(agent.num_tasks == 0 for agent in launcher._agents)
+
+
+def test_agent_start_failure(pilot_agents, monkeypatch):
+    # agents fail to start when python can not be found
+    monkeypatch.setattr("sys.executable", "/not/a/python")
+    launcher = PilotLauncher()
+    with pytest.raises(LauncherError):
+        launcher._start_agents()
+    assert launcher._agents == []
@@ -0,0 +1,118 @@
+import pytest
+
+from smartsim.error import LauncherError
+from smartsim.launcher.launcher import WLMLauncher
+from smartsim.launcher.pollScheduler import PollScheduler
+from smartsim.launcher.stepInfo import SlurmStepInfo
+
+
+def test_new_steps_are_due():
+    scheduler = PollScheduler(15, min_interval=2, max_interval=120)
+    assert scheduler.due(["1", "2"], now=0) == ["1", "2"]
+
+
+def test_queued_step_backs_off():
+    scheduler = PollScheduler(15, min_interval=2, max_interval=120)
+    intervals = []
+    now = 0
+    for _ in range(8):
+        scheduler.update("1", SlurmStepInfo("PENDING"), now=now)
+        step_poll = scheduler._steps["1"]
+        intervals.append(step_poll.interval)
+        now = step_poll.next_poll
+    assert intervals == [2, 4, 8, 16, 32, 64, 120, 120]
+    assert scheduler.due(["1"], now=now - 1) == []
+    assert scheduler.due(["1"], now=now) == ["1"]
+
+
+def test_running_step_capped_at_interval():
+    scheduler = PollScheduler(15, min_interval=2, max_interval=120)
+    for _ in range(5):
+        scheduler.update("1", SlurmStepInfo("RUNNING"), now=0)
+    assert scheduler._steps["1"].interval == 15
+
+
+def test_transition_polls_fast():
+    scheduler = PollScheduler(15, min_interval=2, max_interval=120)
+    for _ in range(5):
+        scheduler.update("1", SlurmStepInfo("PENDING"), now=0)
+    scheduler.update("1", SlurmStepInfo("RUNNING"), now=0)
+    assert scheduler._steps["1"].interval == 2
+
+
+def test_terminal_step_evicted():
+    scheduler = PollScheduler(15)
+    scheduler.update("1", SlurmStepInfo("RUNNING"), now=0)
+    scheduler.update("1", SlurmStepInfo("COMPLETED"), now=0)
+    assert len(scheduler) == 0
+
+
+def test_failed_query_holds_steps():
+    scheduler = PollScheduler(15, min_interval=2, max_interval=120)
+    scheduler.record_query(1, failed=True, now=0)
+    assert scheduler.due(["1"], now=1) == []
+    assert scheduler.due(["1"], now=2) == ["1"]
+
+    scheduler.record_query(1, failed=True, now=2)
+    assert scheduler.due(["1"], now=5) == []
+    # slow queries also back off
+    scheduler.record_query(30, now=6)
+    assert scheduler.due(["1"], now=13) == []
+
+    scheduler.record_query(1, now=20)
+    assert scheduler.due(["1"], now=20) == ["1"]
+
+
+def test_forced_reset_ignores_hold():
+    scheduler = PollScheduler(15)
+    scheduler.update("1", SlurmStepInfo("RUNNING"), now=0)
+    scheduler.record_query(1, failed=True, now=0)
+    scheduler.reset("1", force=True)
+    assert scheduler.due(["1", "2"], now=0) == ["1"]
+
+
+def test_next_poll_delay():
+    scheduler = PollScheduler(15, min_interval=2, max_interval=120)
+    assert scheduler.next_poll_delay(15, now=0) == 15
+    scheduler.update("1", SlurmStepInfo("RUNNING"), now=0)
+    assert scheduler.next_poll_delay(15, now=0) == 2
+
+
+class FakeWLMLauncher(WLMLauncher):
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = statuses
+        self.queried = []
+
+    def _get_managed_step_update(self, step_ids):
+        self.queried.append(list(step_ids))
+        if isinstance(self.statuses, Exception):
+            raise self.statuses
+        return [SlurmStepInfo(self.statuses[step_id]) for step_id in step_ids]
+
+
+def test_launcher_only_queries_due_steps():
+    launcher = FakeWLMLauncher({"1": "RUNNING", "2": "PENDING"})
+    launcher.step_mapping.add("step-1", "1", None, True)
+    launcher.step_mapping.add("step-2", "2", None, True)
+
+    updates = launcher.get_step_update(["step-1", "step-2"])
+    assert [info.launcher_status for _, info in updates] == ["RUNNING", "PENDING"]
+
+    # neither step is due again, cached updates are returned
+    updates = launcher.get_step_update(["step-1", "step-2"])
+    assert len(launcher.queried) == 1
+    assert [info.launcher_status for _, info in updates] == ["RUNNING", "PENDING"]
+
+
+def test_launcher_backs_off_on_error():
+    launcher = FakeWLMLauncher(LauncherError("sacct failed"))
+    launcher.step_mapping.add("step-1", "1", None, True)
+
+    assert launcher.get_step_update(["step-1"]) == []
+    assert launcher.get_step_update(["step-1"]) == []
+    assert len(launcher.queried) == 1
+
+    launcher.poll_scheduler.reset("1", force=True)
+    with pytest.raises(LauncherError):
+        launcher.get_step_update(["step-1"])
@@ -0,0 +1,25 @@
+import time
+
+from smartsim.launcher.util.rateLimiter import RateLimiter
+
+
+def test_burst_is_not_limited():
+    limiter = RateLimiter(10, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.1
+
+
+def test_rate_is_limited():
+    limiter = RateLimiter(20, burst=1)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    # first request is free, the other four wait 1/20th of a second each
+    assert time.monotonic() - start >= 0.19
+
+
+def test_no_limit():
+    limiter = RateLimiter(0)
+    assert sum(limiter.acquire() for _ in range(100)) == 0
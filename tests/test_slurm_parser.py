@@ -192,6 +192,20 @@ def test_parse_sacct_step_id_2():
     assert step_id == parsed_step_id
 
 
+def test_parse_sacct_step_ids():
+    output = (
+        "SmartSim|119225|\n"
+        "extern|119225.extern|\n"
+        "m1-119225.0|119225.0|\n"
+        "m2-119225.1|119225.1|\n"
+        "m3-119225.2|119225.2|"
+    )
+    parsed_step_ids = slurmParser.parse_step_ids_from_sacct(
+        output, ["m1-119225.0", "m3-119225.2", "m4-119225.3"]
+    )
+    assert parsed_step_ids == {"m1-119225.0": "119225.0", "m3-119225.2": "119225.2"}
+
+
 def test_parse_sacct_status():
     """test retrieval of status and exitcode
     PrologFlags=Alloc,Contain
@@ -210,3 +224,33 @@ def test_parse_sacct_status_1():
     status = ("FAILED", "1")
     parsed_status = slurmParser.parse_sacct(output, "22999.0")
     assert status == parsed_status
+
+
+def test_parse_sacct_exact_id():
+    """A job id must not match the records of a longer job id"""
+    output = "12345|RUNNING|0:0|\n" "1234|COMPLETED|0:0|\n"
+    assert slurmParser.parse_sacct(output, "1234") == ("COMPLETED", "0")
+    assert slurmParser.parse_sacct(output, "123") == ("PENDING", None)
+
+
+def test_parse_sstat_nodes_exact_id():
+    output = "1234.0|nid00001|1|\n" "12345.0|nid00002|2|\n"
+    assert slurmParser.parse_sstat_nodes(output, "1234") == ["nid00001"]
+    assert slurmParser.parse_sstat_nodes(output, "12345.0") == ["nid00002"]
+
+
+def test_parse_squeue_alloc():
+    output = "nid[00001-00004]|256|\n"
+    assert slurmParser.parse_squeue_alloc(output) == ("nid[00001-00004]", 256)
+    assert slurmParser.parse_squeue_alloc("") is None
+
+
+def test_parse_sinfo_nodes():
+    output = (
+        "nid00001|64|gpu:a100:4(S:0-1)\n"
+        "nid00002|64|(null)\n"
+        "nid00002|64|(null)\n"
+        "nid00003|32|gpu:2,craynetwork:4\n"
+    )
+    nodes = slurmParser.parse_sinfo_nodes(output)
+    assert nodes == {"nid00001": (64, 4), "nid00002": (64, 0), "nid00003": (32, 2)}
@@ -0,0 +1,48 @@
+from threading import Thread
+
+import pytest
+
+from smartsim.error import LauncherError
+from smartsim.launcher.stepIdResolver import StepIdResolver
+
+
+class FakeStep:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_concurrent_steps_resolved_in_one_query():
+    queries = []
+
+    def query(steps):
+        queries.append([step.name for step in steps])
+        return {step.name: f"id-{step.name}" for step in steps}
+
+    resolver = StepIdResolver(query, interval=0.2)
+    results = {}
+
+    def resolve(name):
+        results[name] = resolver.resolve(FakeStep(name))
+
+    threads = [Thread(target=resolve, args=(f"s{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {f"s{i}": f"id-s{i}" for i in range(8)}
+    assert len(queries) == 1
+
+
+def test_missing_step_retried_then_fails():
+    queries = []
+
+    def query(steps):
+        queries.append([step.name for step in steps])
+        return {}
+
+    resolver = StepIdResolver(query, interval=0, trials=3)
+    with pytest.raises(LauncherError):
+        resolver.resolve(FakeStep("missing"))
+    assert len(queries) == 3
+    assert not resolver._pending
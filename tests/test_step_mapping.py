@@ -0,0 +1,28 @@
+from smartsim.launcher.stepMapping import StepMapping
+
+
+def test_reverse_lookups():
+    mapping = StepMapping()
+    mapping.add("step-1", "100.0", "4321", True)
+    mapping.add("step-2", None, "4322", False)
+
+    assert mapping.get_task_id("100.0") == "4321"
+    assert mapping.get_task_id("100.1") is None
+    assert mapping.get_step_id("4321") == "100.0"
+    assert mapping.get_step_id("4322") is None
+
+    names = ["step-1", "step-2"]
+    assert mapping.get_ids(names, managed=True) == (["step-1"], ["100.0"])
+    assert mapping.get_ids(names, managed=False) == (["step-2"], ["4322"])
+
+
+def test_remove_evicts_indexes():
+    mapping = StepMapping()
+    mapping.add("step-1", "100.0", "4321", True)
+
+    stepmap = mapping.remove("step-1")
+    assert stepmap.step_id == "100.0"
+    assert len(mapping) == 0
+    assert mapping.get_task_id("100.0") is None
+    assert mapping.get_step_id("4321") is None
+    assert mapping.remove("step-1") is None
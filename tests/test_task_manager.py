@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+from smartsim import constants
+from smartsim.launcher.taskManager import OutputBuffer, TaskManager
+
+
+def test_task_lookup_and_removal():
+    tm = TaskManager()
+    task_ids = [
+        tm.start_task([sys.executable, "-c", "import time; time.sleep(10)"], ".")
+        for _ in range(3)
+    ]
+    assert tm[task_ids[1]].pid == task_ids[1]
+
+    tm.remove_task(task_ids[1])
+    assert len(tm) == 2
+    assert task_ids[1] not in tm.tasks
+    for task_id in task_ids:
+        tm.remove_task(task_id)
+    assert len(tm) == 0
+    assert not tm._selector.get_map()
+
+
+def test_task_exit_detected():
+    tm = TaskManager()
+    exited = []
+    tm.on_task_exit(exited.append)
+
+    task_id = tm.start_task([sys.executable, "-c", "print('done')"], ".")
+    start = time.time()
+    tm.start()
+    while not exited and time.time() - start < 10:
+        time.sleep(0.1)
+
+    assert exited == [task_id]
+    status, returncode, out, _ = tm.get_task_update(task_id)
+    assert (status, returncode) == ("Completed", 0)
+    assert out.strip() == "done"
+    assert len(tm) == 0
+
+
+def test_chatty_task_does_not_block():
+    tm = TaskManager()
+    # writes well past the pipe buffer size and the output buffer size
+    script = "import sys; sys.stdout.write('x' * 4 * 1024 * 1024 + 'end')"
+    task_id = tm.start_task([sys.executable, "-c", script], ".")
+    tm.start()
+
+    start = time.time()
+    while task_id in tm.tasks and time.time() - start < 20:
+        time.sleep(0.1)
+
+    _, returncode, out, _ = tm.get_task_update(task_id)
+    assert returncode == 0
+    assert out.endswith("end")
+    assert len(out) == constants.TM_OUTPUT_BUFFER_SIZE
+
+
+def test_output_buffer_keeps_tail():
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb") as stream:
+        buffer = OutputBuffer(stream, max_size=8)
+        os.write(write_fd, b"0123456789abcdef")
+        os.close(write_fd)
+        assert buffer.read()
+        assert buffer.getvalue() == "89abcdef"
+        assert buffer.discarded == 8